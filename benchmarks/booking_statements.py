@@ -0,0 +1,82 @@
+"""SQL statements and commits per booking submission, checked against a budget.
+
+    python benchmarks/booking_statements.py
+    python benchmarks/booking_statements.py --max-statements 5
+
+Submits a booking for a new client and one for a returning client through
+POST /api/bookings, counting the statements and commits each issues on the
+request's connection. Exits non-zero when a booking takes more than one
+commit or more statements than the budget, so it can gate CI. Runs against a
+throwaway SQLite file unless DATABASE_URL is set (use a scratch database).
+Rate limiting is switched off so only the admission path is measured.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Conflict check (resource + occupancy), client upsert, booking insert
+DEFAULT_MAX_STATEMENTS = 5
+
+def measure(app, payload, headers=None):
+    """(statements, commits) issued while serving one booking submission"""
+    from sqlalchemy import event
+    from src.models.user import db
+
+    statements, commits = [], []
+    with app.app_context():
+        engine = db.engine
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    event.listen(engine, 'commit', on_commit)
+    try:
+        response = app.test_client().post('/api/bookings', json=payload, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+        event.remove(engine, 'commit', on_commit)
+    if response.status_code != 201:
+        raise RuntimeError(f'booking failed ({response.status_code}): {response.get_data(as_text=True)}')
+    return statements, len(commits)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-statements', type=int, default=DEFAULT_MAX_STATEMENTS)
+    parser.add_argument('--verbose', action='store_true', help='print every statement')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.gettempdir(), 'wave-house-statements.db')}")
+    os.environ['RATE_LIMIT_ENABLED'] = 'false'
+    sys.path.insert(0, ROOT)
+    from src.main import app
+
+    day = (date.today() + timedelta(days=60)).isoformat()
+    email = f'statements-{os.getpid()}@example.com'
+    cases = [
+        ('new client', {'service_type': 'studio-access', 'date': day, 'time': '10:00 AM', 'duration': '2',
+                        'name': 'Benchmark', 'email': email}),
+        ('returning client', {'service_type': 'studio-access', 'date': day, 'time': '2:00 PM', 'duration': '2',
+                              'name': 'Benchmark', 'email': email.upper()}),
+    ]
+
+    failed = False
+    for label, payload in cases:
+        statements, commits = measure(app, payload)
+        ok = len(statements) <= args.max_statements and commits == 1
+        failed |= not ok
+        print(f"{label:<17} {len(statements):>2} statements  {commits} commit(s)  {'ok' if ok else 'OVER BUDGET'}")
+        if args.verbose or not ok:
+            for statement in statements:
+                print(f"    {' '.join(statement.split())[:120]}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Requests per second against a local gunicorn for several worker setups.
+
+    python benchmarks/throughput.py
+    python benchmarks/throughput.py --configs sync:1 sync:4 gthread:2 gevent:2 \
+        --path /api/availability --concurrency 50 --seconds 10
+
+Each config is WORKER_CLASS:WORKERS. The server runs with the repo's
+gunicorn.conf.py against DATABASE_URL (a throwaway SQLite file when unset),
+so results reflect the real app and settings. Run it on the dyno size you
+deploy to; absolute numbers from a laptop are not comparable.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server did not start: {url}')
+
+def hammer(url, concurrency, seconds):
+    """Keep ``concurrency`` clients busy for ``seconds``; returns (ok, errors, p95 latency)"""
+    deadline = time.monotonic() + seconds
+
+    def client():
+        ok, errors, latencies = 0, 0, []
+        while time.monotonic() < deadline:
+            started = time.monotonic()
+            try:
+                urllib.request.urlopen(url, timeout=30).read()
+                ok += 1
+            except OSError:
+                errors += 1
+            latencies.append(time.monotonic() - started)
+        return ok, errors, latencies
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: client(), range(concurrency)))
+
+    latencies = sorted(latency for _, _, client_latencies in results for latency in client_latencies)
+    p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return sum(r[0] for r in results), sum(r[1] for r in results), p95
+
+def run_config(worker_class, workers, args):
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers), GUNICORN_WORKER_CLASS=worker_class)
+    if 'DATABASE_URL' not in env:
+        env['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'wave-house-bench.db')}"
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--chdir', 'src', 'main:app',
+         '--access-logfile', '/dev/null'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        url = f'http://127.0.0.1:{port}{args.path}'
+        wait_for(url)
+        ok, errors, p95 = hammer(url, args.concurrency, args.seconds)
+    finally:
+        server.terminate()
+        server.wait()
+    return ok / args.seconds, errors, p95
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configs', nargs='+', default=['sync:1', 'sync:2', 'sync:4', 'gthread:1', 'gthread:2', 'gthread:4'])
+    parser.add_argument('--path', default='/api/availability/next?duration=4')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--seconds', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'config':<12} {'req/s':>8} {'errors':>7} {'p95 ms':>8}")
+    for config in args.configs:
+        worker_class, workers = config.split(':')
+        rps, errors, p95 = run_config(worker_class, int(workers), args)
+        print(f"{config:<12} {rps:>8.1f} {errors:>7} {p95 * 1000:>8.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,8 @@ import { Badge } from './components/ui/badge'
 import { Separator } from './components/ui/separator'
 import { MapPin, Clock, Users, Mic, Volume2, Headphones, Music, Star, Phone, Mail, Instagram, Twitter, X, Trash2, Shield } from 'lucide-react'
 import BookingModal from './components/BookingModal'
+import { createSubmission } from './lib/api'
+import { availabilityToTimes, subscribeAvailability } from './lib/availability'
 import studioHero from './assets/studio-hero.jpg'
 import controlRoom from './assets/control-room.jpg'
 import microphone from './assets/microphone.jpg'
@@ -17,6 +19,23 @@ function App() {
   const [activeSection, setActiveSection] = useState('home')
   const [isBookingModalOpen, setIsBookingModalOpen] = useState(false)
   const [preSelectedService, setPreSelectedService] = useState(null)
+  // One submitter per booking form, keyed by service; each sends the same
+  // Idempotency-Key until reset, so double clicks and retries can't book twice
+  const [submitters] = useState(() => ({
+    'studio-access': createSubmission('/api/bookings'),
+    'engineer-request': createSubmission('/api/engineer-request'),
+    'mixing': createSubmission('/api/mixing-request'),
+  }))
+  
+  // Unavailable times per date for the booking calendar, in the
+  // { 'YYYY-MM-DD': ['10:00 PM', ...] } shape, decoded from the bitmask format
+  const [unavailableTimes, setUnavailableTimes] = useState({})
+
+  // Kept live from the availability stream (or by polling) while the modal is open
+  useEffect(() => {
+    if (!isBookingModalOpen) return undefined
+    return subscribeAvailability(null, (unavailable) => setUnavailableTimes(availabilityToTimes(unavailable)))
+  }, [isBookingModalOpen])
   
   // Admin functionality
   const [isAdminModalOpen, setIsAdminModalOpen] = useState(false)
@@ -36,6 +55,8 @@ function App() {
   }
 
   const openBookingModal = (serviceId = null) => {
+    // Opening the modal starts a new form submission
+    Object.values(submitters).forEach((submit) => submit.reset())
     setPreSelectedService(serviceId)
     setIsBookingModalOpen(true)
   }
@@ -720,6 +741,8 @@ function App() {
         isOpen={isBookingModalOpen} 
         onClose={closeBookingModal} 
         preSelectedService={preSelectedService}
+        submitters={submitters}
+        unavailableTimes={unavailableTimes}
       />
 
       {/* Admin Modal */}
@@ -0,0 +1,33 @@
+// POST helpers for booking and request forms.
+//
+// A form submission gets one Idempotency-Key for its lifetime, so a double
+// click or a retry after a dropped connection replays the server's first
+// response instead of creating a second booking and sending a second email.
+
+const newIdempotencyKey = () =>
+  (window.crypto && window.crypto.randomUUID)
+    ? window.crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+
+// Returns a function that POSTs JSON, reusing one key until reset() is called
+// (call it after a successful submission or when the form is edited).
+export const createSubmission = (url) => {
+  let idempotencyKey = newIdempotencyKey()
+
+  const submit = async (body) => {
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Idempotency-Key': idempotencyKey,
+      },
+      body: JSON.stringify(body),
+    })
+    return { response, data: await response.json() }
+  }
+
+  submit.reset = () => {
+    idempotencyKey = newIdempotencyKey()
+  }
+  return submit
+}
@@ -0,0 +1,107 @@
+// Client for GET /api/availability in the compact bitmask format.
+//
+// Each day comes back as a base64 bitset over the slot grid: bit i of the
+// little-endian bytes is set when slot i (i * slotMinutes after midnight) is
+// unavailable. Decoding here keeps the payload an order of magnitude smaller
+// than the list-of-"10:00 PM"-strings format.
+
+const formatTime = (minutes) => {
+  const hours = Math.floor(minutes / 60)
+  const mins = (minutes % 60).toString().padStart(2, '0')
+  const period = hours < 12 ? 'AM' : 'PM'
+  const displayHour = hours % 12 === 0 ? 12 : hours % 12
+  return `${displayHour}:${mins} ${period}`
+}
+
+const decodeDay = (encoded, slotMinutes) => {
+  const bytes = atob(encoded)
+  const minutes = []
+  for (let byteIndex = 0; byteIndex < bytes.length; byteIndex++) {
+    const byte = bytes.charCodeAt(byteIndex)
+    for (let bit = 0; bit < 8; bit++) {
+      if (byte & (1 << bit)) {
+        minutes.push((byteIndex * 8 + bit) * slotMinutes)
+      }
+    }
+  }
+  return minutes
+}
+
+// { format: 'bitmask', slot_minutes, days: { 'YYYY-MM-DD': base64 } }
+//   -> { 'YYYY-MM-DD': Set of unavailable minutes since midnight }
+export const decodeAvailability = (payload) => {
+  const unavailable = {}
+  for (const [date, encoded] of Object.entries(payload.days)) {
+    unavailable[date] = new Set(decodeDay(encoded, payload.slot_minutes))
+  }
+  return unavailable
+}
+
+// Same shape as the legacy format: { 'YYYY-MM-DD': ['10:00 PM', ...] }
+export const availabilityToTimes = (unavailable) => {
+  const times = {}
+  for (const [date, minutes] of Object.entries(unavailable)) {
+    times[date] = Array.from(minutes).sort((a, b) => a - b).map(formatTime)
+  }
+  return times
+}
+
+export const fetchAvailability = async (resource = null) => {
+  const params = new URLSearchParams({ format: 'bitmask' })
+  if (resource) params.set('resource', resource)
+  const response = await fetch(`/api/availability?${params}`)
+  if (!response.ok) {
+    throw new Error(`Availability request failed: ${response.status}`)
+  }
+  return decodeAvailability(await response.json())
+}
+
+export const isSlotUnavailable = (unavailable, date, minutes) =>
+  Boolean(unavailable[date] && unavailable[date].has(minutes))
+
+// Refetch interval when the server doesn't stream (non-gevent workers, or
+// its stream limit is reached); matches the server's snapshot cache TTL
+const POLL_INTERVAL_MS = 30000
+
+// Keep a decoded availability map current from /api/availability/stream,
+// polling /api/availability if the server declines to stream. `onChange`
+// receives the full map after the initial fetch and after every change;
+// returns a function that stops updates.
+export const subscribeAvailability = (resource, onChange) => {
+  let unavailable = {}
+  const refetch = () =>
+    fetchAvailability(resource)
+      .then((fresh) => {
+        unavailable = fresh
+        onChange(unavailable)
+      })
+      .catch((error) => console.error('Error loading availability:', error))
+
+  const params = new URLSearchParams()
+  if (resource) params.set('resource', resource)
+  const source = new EventSource(`/api/availability/stream?${params}`)
+
+  // (Re)connecting may have missed changes, so start from a full snapshot
+  source.addEventListener('open', refetch)
+  source.addEventListener('reset', refetch)
+  source.addEventListener('availability', (event) => {
+    const changed = decodeAvailability(JSON.parse(event.data))
+    unavailable = { ...unavailable, ...changed }
+    onChange(unavailable)
+  })
+
+  // A 204/503 answer closes the EventSource for good (plain network errors
+  // leave it reconnecting); switch to polling
+  let poller = null
+  source.addEventListener('error', () => {
+    if (source.readyState === EventSource.CLOSED && !poller) {
+      refetch()
+      poller = setInterval(refetch, POLL_INTERVAL_MS)
+    }
+  })
+
+  return () => {
+    source.close()
+    if (poller) clearInterval(poller)
+  }
+}
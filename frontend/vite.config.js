@@ -10,6 +10,11 @@ export default defineConfig({
       "@": path.resolve(__dirname, "./src"),
     },
   },
+  build: {
+    // Flask serves this directory (src/routes/frontend.py); hashed files land in build/assets
+    outDir: 'build',
+    assetsDir: 'assets',
+  },
   server: {
     host: '0.0.0.0',
     port: 3000,
@@ -0,0 +1,87 @@
+"""Gunicorn settings, driven by environment variables.
+
+    gunicorn -c gunicorn.conf.py --chdir src main:app
+
+GUNICORN_WORKER_CLASS picks the concurrency model:
+
+- ``gthread`` (default): threads per worker; requests waiting on Postgres or
+  SMTP release the GIL, so one worker serves several at once.
+- ``gevent``: cooperative greenlets. The standard library is monkey-patched by
+  this config and psycopg2 is made cooperative with psycogreen; needs the
+  gevent and psycogreen packages.
+- ``sync``: one request per worker, the old behaviour.
+
+Live availability (/api/availability/stream) needs both GUNICORN_WORKER_CLASS=
+gevent and, with more than one worker, AVAILABILITY_BROKER_URL=redis://...
+so every worker hears every change. Without them the stream answers 204 and
+the booking calendar polls /api/availability every 30 seconds instead.
+
+Other knobs: WEB_CONCURRENCY (workers; default from CPU cores),
+GUNICORN_PRELOAD, GUNICORN_MAX_REQUESTS, GUNICORN_MAX_REQUESTS_JITTER,
+GUNICORN_TIMEOUT, GUNICORN_GRACEFUL_TIMEOUT and GUNICORN_KEEPALIVE.
+"""
+import multiprocessing
+import os
+
+def env_flag(name, default):
+    return os.environ.get(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+if worker_class == 'gevent':
+    # Patch before the app is preloaded so every module gets cooperative
+    # sockets and locks. psycopg2 is a C extension that would block the whole
+    # process on I/O unless it is given gevent's wait callback.
+    from gevent import monkey
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+
+# Sync workers serve one request each, so they need more processes per core;
+# threaded and gevent workers overlap I/O within a process.
+cores = multiprocessing.cpu_count()
+default_workers = cores * 2 + 1 if worker_class == 'sync' else max(cores, 2)
+workers = int(os.environ.get('WEB_CONCURRENCY', default_workers))
+
+# gthread: threads per worker
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# gevent: concurrent greenlets per worker
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# Import the app once in the master: schema upgrades run once, workers start
+# faster and share memory copy-on-write. Fork-sensitive state is reset below.
+preload_app = env_flag('GUNICORN_PRELOAD', True)
+
+# Recycle workers to contain slow memory growth; jitter keeps them from all
+# restarting at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Admin pages over long date ranges can take a while. With sync workers this is
+# a per-request limit, so keep AVAILABILITY_STREAM_SECONDS below it.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+accesslog = '-'
+
+def reset_db_pool(app, close):
+    """Drop pooled connections; close=False leaves the parent's sockets alone"""
+    from src.models.user import db
+
+    with app.app_context():
+        db.engine.dispose(close=close)
+
+def when_ready(server):
+    if preload_app:
+        # Connections opened while importing the app must not be shared with workers
+        reset_db_pool(server.app.wsgi(), close=True)
+
+def post_fork(server, worker):
+    if preload_app:
+        # A forked pool would share the master's sockets between processes;
+        # give each worker its own
+        reset_db_pool(server.app.wsgi(), close=False)
@@ -10,5 +10,8 @@ npm install --prefix frontend
 echo "=== Building React production app ==="
 npm run build --prefix frontend
 
+echo "=== Precompressing static files ==="
+python -m src.utils.precompress frontend/build
+
 echo "=== Build completed successfully ==="
 
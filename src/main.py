@@ -1,13 +1,21 @@
 import os
 import sys
+import tempfile
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory, render_template
+from flask import Flask, send_from_directory, render_template, request, jsonify
+from jinja2 import FileSystemBytecodeCache
 from flask_cors import CORS
 from src.models.user import db
 from src.models.booking import Booking, BlockedSlot
 from src.models.client import Client
+from src.models.analytics import DailyRollup, MonthlyRollup
+from src.models.resource import Resource
+from src.models.idempotency import IdempotencyKey
+from src.models.archive import ArchivedBooking, ArchivedBlockedSlot
+from src.models.job import ScheduledJob
+from src.models.schema import upgrade_schema
 from src.routes.user import user_bp
 from src.routes.booking import booking_bp
 from src.routes.admin import admin_bp
@@ -15,6 +23,12 @@ from src.routes.payment import payment_bp
 from src.routes.verification import verification_bp
 from src.routes.simple_booking import simple_booking_bp
 from src.routes.direct_admin import direct_admin_bp
+from src.routes.analytics import analytics_bp
+from src.routes.resource import resource_bp
+from src.routes.assets import assets_bp
+from src.routes.frontend import frontend_bp
+from src.utils.routes import check_duplicate_routes
+from src.utils.compression import init_compression
 
 # Import database initialization
 import psycopg2
@@ -40,19 +54,31 @@ def initialize_database():
     except Exception as e:
         print(f"Database initialization error: {e}")
 
-# Configure Flask to serve React build files
-app = Flask(__name__, 
-    static_folder='../frontend/build', 
-    static_url_path='/'
-)
+# The React build is served by frontend_bp (cache headers, precompressed files)
+app = Flask(__name__, static_folder=None)
+
+# Admin templates are compiled once per process; the bytecode cache lets
+# new workers and restarts skip compilation entirely.
+jinja_cache_dir = os.environ.get('JINJA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'wave-house-jinja'))
+os.makedirs(jinja_cache_dir, exist_ok=True)
+app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(jinja_cache_dir)}
 
 # Configure CORS
 CORS(app, origins=["*"])
 
+# Compress large JSON/HTML responses (gzip, or brotli when installed)
+init_compression(app)
+
 # Database configuration
 database_url = os.environ.get('DATABASE_URL')
 if database_url:
     app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    # One connection per concurrent request (gunicorn threads or greenlets)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': True,
+    }
 else:
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///wave_house.db'
 
@@ -70,21 +96,28 @@ app.register_blueprint(payment_bp, url_prefix='/api')
 app.register_blueprint(verification_bp, url_prefix='/api')
 app.register_blueprint(simple_booking_bp, url_prefix='/api')
 app.register_blueprint(direct_admin_bp, url_prefix='/api')
+app.register_blueprint(analytics_bp, url_prefix='/api')
+app.register_blueprint(resource_bp, url_prefix='/api')
+app.register_blueprint(assets_bp, url_prefix='/api')
 
-# Serve React app
-@app.route('/')
-def index():
-    return app.send_static_file('index.html')
+# Serve React app; client-side routes fall back to index.html in frontend_bp
+app.register_blueprint(frontend_bp)
 
-# Catch-all route for React Router
+# Unknown API paths and missing assets get a real 404
 @app.errorhandler(404)
 def not_found(e):
-    return app.send_static_file('index.html')
+    if request.path.startswith('/api/'):
+        return jsonify({'error': 'Not found'}), 404
+    return e
+
+# Every rule/method must have exactly one handler
+check_duplicate_routes(app)
 
 # Initialize database tables
 with app.app_context():
     initialize_database()
     db.create_all()
+    upgrade_schema()
     print("Database tables created successfully!")
 
 if __name__ == '__main__':
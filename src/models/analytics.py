@@ -0,0 +1,65 @@
+from datetime import datetime
+# Import db from user model to use the same instance
+from .user import db
+
+class DailyRollup(db.Model):
+    """Per-day booking, blocking and revenue totals materialized for analytics"""
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, unique=True, nullable=False, index=True)
+    occupied_hours = db.Column(db.Float, default=0.0, nullable=False)
+    blocked_hours = db.Column(db.Float, default=0.0, nullable=False)
+    booking_count = db.Column(db.Integer, default=0, nullable=False)  # pending + confirmed
+    confirmed_count = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+    resource_count = db.Column(db.Integer, default=1, server_default='1', nullable=False)  # active resources at refresh
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def capacity_hours(self):
+        """Bookable resource-hours left after manual blocks"""
+        return max(0.0, 24.0 * self.resource_count - self.blocked_hours)
+
+    def to_dict(self):
+        capacity = self.capacity_hours()
+        return {
+            'date': self.date.isoformat(),
+            'occupied_hours': self.occupied_hours,
+            'blocked_hours': self.blocked_hours,
+            'booking_count': self.booking_count,
+            'confirmed_count': self.confirmed_count,
+            'revenue': self.revenue,
+            'resource_count': self.resource_count,
+            'utilization': round(self.occupied_hours / capacity, 4) if capacity else None,
+            'updated_at': self.updated_at.isoformat()
+        }
+
+class MonthlyRollup(db.Model):
+    """Per-month totals aggregated from DailyRollup"""
+    id = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.String(7), unique=True, nullable=False, index=True)  # YYYY-MM
+    days = db.Column(db.Integer, nullable=False)
+    occupied_hours = db.Column(db.Float, default=0.0, nullable=False)
+    blocked_hours = db.Column(db.Float, default=0.0, nullable=False)
+    booking_count = db.Column(db.Integer, default=0, nullable=False)
+    confirmed_count = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+    resource_count = db.Column(db.Integer, default=1, server_default='1', nullable=False)  # active resources at refresh
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def capacity_hours(self):
+        """Bookable resource-hours in the month left after manual blocks"""
+        return max(0.0, self.days * 24.0 * self.resource_count - self.blocked_hours)
+
+    def to_dict(self):
+        capacity = self.capacity_hours()
+        return {
+            'month': self.month,
+            'days': self.days,
+            'occupied_hours': self.occupied_hours,
+            'blocked_hours': self.blocked_hours,
+            'booking_count': self.booking_count,
+            'confirmed_count': self.confirmed_count,
+            'revenue': self.revenue,
+            'resource_count': self.resource_count,
+            'utilization': round(self.occupied_hours / capacity, 4) if capacity else None,
+            'updated_at': self.updated_at.isoformat()
+        }
@@ -0,0 +1,87 @@
+from datetime import datetime
+# Import db from user model to use the same instance
+from .user import db
+
+# Archive tables mirror the live tables column for column (see
+# src/utils/archive.py, which copies rows by column name) plus archived_at.
+# Ids are kept from the live row, and foreign keys are dropped so archived
+# history never blocks deleting a client or resource.
+
+class ArchivedBooking(db.Model):
+    """A booking older than the archive horizon, moved out of the hot table"""
+    __tablename__ = 'booking_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    service_type = db.Column(db.String(50), nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
+    time = db.Column(db.String(20), nullable=False)
+    duration = db.Column(db.String(10), nullable=True)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    phone = db.Column(db.String(20), nullable=True)
+    project_type = db.Column(db.String(50), nullable=True)
+    message = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20), nullable=True)
+    resource_id = db.Column(db.Integer, nullable=True)
+    client_id = db.Column(db.Integer, nullable=True, index=True)
+    requires_verification = db.Column(db.Boolean, default=False, nullable=False)
+    verification_completed = db.Column(db.Boolean, default=False, nullable=False)
+    verification_session_id = db.Column(db.String(100), nullable=True)
+    payment_status = db.Column(db.String(20), nullable=True)
+    payment_amount = db.Column(db.Float, nullable=True)
+    stripe_payment_intent_id = db.Column(db.String(100), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'service_type': self.service_type,
+            'date': self.date.isoformat() if self.date else None,
+            'time': self.time,
+            'duration': self.duration,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'project_type': self.project_type,
+            'message': self.message,
+            'status': self.status,
+            'resource_id': self.resource_id,
+            'client_id': self.client_id,
+            'requires_verification': self.requires_verification,
+            'verification_completed': self.verification_completed,
+            'verification_session_id': self.verification_session_id,
+            'payment_status': self.payment_status,
+            'payment_amount': self.payment_amount,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'archived': True,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
+
+class ArchivedBlockedSlot(db.Model):
+    """A blocked slot on a date older than the archive horizon"""
+    __tablename__ = 'blocked_slot_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    date = db.Column(db.Date, nullable=False, index=True)
+    time = db.Column(db.String(20), nullable=False)
+    start_minute = db.Column(db.Integer, nullable=True)
+    duration_minutes = db.Column(db.Integer, nullable=True)
+    reason = db.Column(db.String(100), nullable=True)
+    resource_id = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'date': self.date.isoformat() if self.date else None,
+            'time': self.time,
+            'start_minute': self.start_minute,
+            'duration_minutes': self.duration_minutes,
+            'reason': self.reason,
+            'resource_id': self.resource_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'archived': True,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
@@ -1,10 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 from datetime import datetime
+from src.utils.timeslots import time_to_minutes
 
 # Import db from user model to use the same instance
 from .user import db
 
 class Booking(db.Model):
+    __table_args__ = (
+        db.Index('ix_booking_date_resource', 'date', 'resource_id'),
+        db.Index('ix_booking_status_created_at', 'status', 'created_at'),  # pending queue and hold expiry
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     service_type = db.Column(db.String(50), nullable=False)
     date = db.Column(db.Date, nullable=False)
@@ -15,7 +22,8 @@ class Booking(db.Model):
     phone = db.Column(db.String(20), nullable=True)
     project_type = db.Column(db.String(50), nullable=True)
     message = db.Column(db.Text, nullable=True)
-    status = db.Column(db.String(20), default='pending')  # pending, confirmed, cancelled
+    status = db.Column(db.String(20), default='pending')  # pending, confirmed, cancelled, expired
+    resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'), nullable=True, index=True)
     
     # Client verification fields
     client_id = db.Column(db.Integer, db.ForeignKey('client.id'), nullable=True)
@@ -43,6 +51,7 @@ class Booking(db.Model):
             'project_type': self.project_type,
             'message': self.message,
             'status': self.status,
+            'resource_id': self.resource_id,
             'client_id': self.client_id,
             'requires_verification': self.requires_verification,
             'verification_completed': self.verification_completed,
@@ -53,17 +62,34 @@ class Booking(db.Model):
         }
 
 class BlockedSlot(db.Model):
+    __table_args__ = (
+        db.Index('ix_blocked_slot_date_resource', 'date', 'resource_id'),
+        db.Index('ix_blocked_slot_date_start_minute', 'date', 'start_minute'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     date = db.Column(db.Date, nullable=False)
     time = db.Column(db.String(20), nullable=False)
+    start_minute = db.Column(db.Integer, nullable=True)  # minutes since midnight, kept in sync with time
+    duration_minutes = db.Column(db.Integer, nullable=True)  # slot size when created; None means one hour
     reason = db.Column(db.String(100), nullable=True)  # maintenance, holiday, etc.
+    resource_id = db.Column(db.Integer, db.ForeignKey('resource.id'), nullable=True, index=True)  # None blocks every resource
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    
+
+    @validates('time')
+    def validate_time(self, key, value):
+        """Keep the integer start minute used by SQL range grouping in sync"""
+        self.start_minute = time_to_minutes(value)
+        return value
+
     def to_dict(self):
         return {
             'id': self.id,
             'date': self.date.isoformat() if self.date else None,
             'time': self.time,
+            'start_minute': self.start_minute,
+            'duration_minutes': self.duration_minutes,
             'reason': self.reason,
+            'resource_id': self.resource_id,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
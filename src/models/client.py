@@ -1,12 +1,23 @@
 from datetime import datetime
+from sqlalchemy.orm import validates
 # Import db from user model to use the same instance
 from .user import db
 
+def normalize_email(email):
+    """Canonical form used to match clients: surrounding whitespace removed, lowercased"""
+    return email.strip().lower() if isinstance(email, str) else email
+
+def normalize_phone(phone):
+    """Digits of a phone number, for search regardless of formatting"""
+    digits = ''.join(ch for ch in phone if ch.isdigit()) if phone else ''
+    return digits or None
+
 class Client(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20), nullable=True)
+    phone_digits = db.Column(db.String(20), nullable=True, index=True)  # kept in sync with phone for search
     
     # ID Verification fields
     is_verified = db.Column(db.Boolean, default=False, nullable=False)
@@ -17,8 +28,8 @@ class Client(db.Model):
     
     # Client profile info
     first_booking_date = db.Column(db.DateTime, nullable=True)
-    total_bookings = db.Column(db.Integer, default=0, nullable=False)
-    total_spent = db.Column(db.Float, default=0.0, nullable=False)
+    total_bookings = db.Column(db.Integer, default=0, nullable=False, index=True)
+    total_spent = db.Column(db.Float, default=0.0, nullable=False, index=True)
     
     # Admin notes and flags
     admin_notes = db.Column(db.Text, nullable=True)
@@ -29,6 +40,16 @@ class Client(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    @validates('email')
+    def validate_email(self, key, value):
+        """Store emails normalized so Foo@x.com and foo@x.com are one client"""
+        return normalize_email(value)
+
+    @validates('phone')
+    def validate_phone(self, key, value):
+        self.phone_digits = normalize_phone(value)
+        return value
+
     def __repr__(self):
         return f'<Client {self.name} ({self.email})>'
 
@@ -68,3 +89,9 @@ class Client(db.Model):
             self.first_booking_date = datetime.utcnow()
         self.updated_at = datetime.utcnow()
 
+# Guards against case-variant duplicates written outside the ORM
+db.Index('ix_client_email_lower', db.func.lower(Client.email), unique=True)
+
+# Client directory: name prefix search and the status/flag filters
+db.Index('ix_client_name_lower', db.func.lower(Client.name))
+db.Index('ix_client_verification_flagged', Client.verification_status, Client.is_flagged)
@@ -0,0 +1,50 @@
+from datetime import datetime
+# Import db from user model to use the same instance
+from .user import db
+
+class ScheduledJob(db.Model):
+    """Lock and run metrics for one periodic maintenance job (see src/scheduler.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+    # The runner holding the job and until when; a crashed runner's lock
+    # simply expires
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_scheduled_for = db.Column(db.DateTime, nullable=True)  # the due minute last claimed
+
+    last_started_at = db.Column(db.DateTime, nullable=True)
+    last_finished_at = db.Column(db.DateTime, nullable=True)
+    last_status = db.Column(db.String(20), nullable=True)  # succeeded, failed
+    last_error = db.Column(db.Text, nullable=True)
+    last_result = db.Column(db.Text, nullable=True)
+
+    # Durations in milliseconds
+    last_duration_ms = db.Column(db.Integer, nullable=True)
+    max_duration_ms = db.Column(db.Integer, nullable=True)
+    total_duration_ms = db.Column(db.BigInteger, default=0, nullable=False)
+    run_count = db.Column(db.Integer, default=0, nullable=False)
+    failure_count = db.Column(db.Integer, default=0, nullable=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<ScheduledJob {self.name}>'
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'locked_by': self.locked_by,
+            'locked_until': self.locked_until.isoformat() if self.locked_until else None,
+            'last_scheduled_for': self.last_scheduled_for.isoformat() if self.last_scheduled_for else None,
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_finished_at': self.last_finished_at.isoformat() if self.last_finished_at else None,
+            'last_status': self.last_status,
+            'last_error': self.last_error,
+            'last_result': self.last_result,
+            'last_duration_ms': self.last_duration_ms,
+            'max_duration_ms': self.max_duration_ms,
+            'avg_duration_ms': round(self.total_duration_ms / self.run_count) if self.run_count else None,
+            'run_count': self.run_count,
+            'failure_count': self.failure_count
+        }
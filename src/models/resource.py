@@ -0,0 +1,29 @@
+from datetime import datetime
+# Import db from user model to use the same instance
+from .user import db
+
+# Slug of the room every legacy (pre multi-room) booking and block belongs to
+DEFAULT_RESOURCE_SLUG = 'main-studio'
+
+class Resource(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(50), unique=True, nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    kind = db.Column(db.String(20), default='room', nullable=False)  # room, booth
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    sort_order = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Resource {self.slug}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'slug': self.slug,
+            'name': self.name,
+            'kind': self.kind,
+            'is_active': self.is_active,
+            'sort_order': self.sort_order,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,202 @@
+import warnings
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SAWarning
+from sqlalchemy.schema import CreateIndex
+# Import db from user model to use the same instance
+from .user import db
+from .resource import Resource, DEFAULT_RESOURCE_SLUG
+
+def add_missing_columns():
+    """Add model columns that db.create_all() won't add to existing tables.
+
+    New columns must be nullable or carry a server_default so they can be
+    added to populated tables.
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = (f'ALTER TABLE {preparer.format_table(table)} '
+                       f'ADD COLUMN {preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}')
+                if column.server_default is not None:
+                    ddl += f' DEFAULT {column.server_default.arg}'
+                print(f"Adding column {table.name}.{column.name}")
+                conn.execute(text(ddl))
+
+def add_missing_indexes():
+    """Create model indexes that db.create_all() won't add to existing tables"""
+    engine = db.engine
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            # SQLite doesn't reflect expression indexes such as lower(email),
+            # so creation must tolerate an index that already exists
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', SAWarning)
+                existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    print(f"Creating index {index.name}")
+                    conn.execute(CreateIndex(index, if_not_exists=True))
+
+def ensure_default_resource():
+    """Seed the main studio room and attach legacy bookings and blocks to it"""
+    from .booking import Booking
+
+    resource = Resource.query.filter_by(slug=DEFAULT_RESOURCE_SLUG).first()
+    if not resource:
+        resource = Resource(slug=DEFAULT_RESOURCE_SLUG, name='Main Studio', kind='room')
+        db.session.add(resource)
+        db.session.flush()
+
+    # Blocks without a resource intentionally apply to every room, so only
+    # bookings are backfilled.
+    Booking.query.filter(Booking.resource_id.is_(None)).update(
+        {Booking.resource_id: resource.id}, synchronize_session=False
+    )
+    db.session.commit()
+
+def backfill_block_start_minutes():
+    """Fill BlockedSlot.start_minute for rows created before the column existed"""
+    from .booking import BlockedSlot
+    from src.utils.timeslots import time_to_minutes
+
+    # One UPDATE per distinct time string; there are at most a few dozen
+    times = db.session.query(BlockedSlot.time).filter(BlockedSlot.start_minute.is_(None)).distinct()
+    for (time_str,) in times.all():
+        BlockedSlot.query.filter(
+            BlockedSlot.time == time_str, BlockedSlot.start_minute.is_(None)
+        ).update({BlockedSlot.start_minute: time_to_minutes(time_str)}, synchronize_session=False)
+    db.session.commit()
+
+def backfill_payment_amounts():
+    """Price bookings stored before payment_amount was written.
+
+    Revenue rollups and reconcile_client_stats() sum payment_amount, so
+    unpriced legacy rows would count as $0. Rows are priced with the current
+    rate table, whose packages are the prices create_booking always charged,
+    with one UPDATE per distinct (service, duration, start time). Bookings
+    the table can't price (non-package durations, services without rates)
+    stay NULL, as they did before.
+    """
+    from .booking import Booking
+    from .archive import ArchivedBooking
+    from src.utils.pricing import calculate_booking_amount
+
+    inspector = inspect(db.session.connection())
+    for model in (Booking, ArchivedBooking):
+        if not inspector.has_table(model.__tablename__):
+            continue
+        combinations = db.session.query(model.service_type, model.duration, model.time).filter(
+            model.payment_amount.is_(None), model.duration.isnot(None)
+        ).distinct()
+        for service_type, duration, time_str in combinations.all():
+            amount = calculate_booking_amount(service_type, duration, time_str)
+            if amount is None:
+                continue
+            model.query.filter(
+                model.payment_amount.is_(None), model.service_type == service_type,
+                model.duration == duration, model.time == time_str
+            ).update({model.payment_amount: amount}, synchronize_session=False)
+    db.session.commit()
+
+def merge_client_emails():
+    """Normalize client emails, merging clients that differ only by case.
+
+    The earliest verified record (or else the earliest record) survives;
+    bookings and stats from the others move onto it. Runs before the unique
+    lower(email) index is created, which would fail on such duplicates.
+    """
+    from .client import Client, normalize_email
+    from .booking import Booking
+    from .archive import ArchivedBooking
+
+    normalized = db.func.lower(db.func.trim(Client.email))
+    pending = db.session.query(normalized).group_by(normalized).having(
+        db.or_(db.func.count(Client.id) > 1, db.func.max(db.case((Client.email != normalized, 1), else_=0)) == 1)
+    ).all()
+
+    for (email,) in pending:
+        clients = Client.query.filter(normalized == email).order_by(
+            Client.is_verified.desc(), Client.created_at, Client.id
+        ).all()
+        keeper, duplicates = clients[0], clients[1:]
+        for duplicate in duplicates:
+            print(f"Merging client {duplicate.id} ({duplicate.email}) into {keeper.id}")
+            for model in (Booking, ArchivedBooking):
+                model.query.filter_by(client_id=duplicate.id).update(
+                    {model.client_id: keeper.id}, synchronize_session=False
+                )
+            keeper.total_bookings += duplicate.total_bookings
+            keeper.total_spent += duplicate.total_spent
+            if duplicate.first_booking_date and (keeper.first_booking_date is None or duplicate.first_booking_date < keeper.first_booking_date):
+                keeper.first_booking_date = duplicate.first_booking_date
+            if duplicate.is_flagged and not keeper.is_flagged:
+                keeper.is_flagged = True
+                keeper.flag_reason = duplicate.flag_reason
+            if duplicate.admin_notes:
+                keeper.admin_notes = '\n'.join(filter(None, [keeper.admin_notes, duplicate.admin_notes]))
+            db.session.delete(duplicate)
+        # Free the old spellings before the survivor takes the normalized one
+        db.session.flush()
+        keeper.email = normalize_email(keeper.email)
+    db.session.commit()
+
+def backfill_client_phone_digits():
+    """Fill Client.phone_digits for rows created before the column existed"""
+    from .client import Client, normalize_phone
+
+    rows = db.session.query(Client.id, Client.phone).filter(
+        Client.phone.isnot(None), Client.phone_digits.is_(None)
+    ).all()
+    for client_id, phone in rows:
+        digits = normalize_phone(phone)
+        if digits:
+            Client.query.filter_by(id=client_id).update({Client.phone_digits: digits}, synchronize_session=False)
+    db.session.commit()
+
+# Trigram indexes let PostgreSQL answer '%term%' and fuzzy client searches
+# without a scan; the expressions match the ones used in src/utils/clients.py
+CLIENT_TRIGRAM_INDEXES = {
+    'ix_client_name_trgm': 'lower(name)',
+    'ix_client_email_trgm': 'email',
+    'ix_client_phone_digits_trgm': 'phone_digits',
+}
+
+def add_client_trigram_indexes():
+    """Enable pg_trgm and create the client search indexes (PostgreSQL only)"""
+    engine = db.engine
+    if engine.dialect.name != 'postgresql':
+        return
+    try:
+        with engine.begin() as conn:
+            conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+            for name, expression in CLIENT_TRIGRAM_INDEXES.items():
+                conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON client USING gin ({expression} gin_trgm_ops)'))
+    except Exception as e:
+        # Search still works without them, just by scanning
+        print(f"Could not create client trigram indexes: {e}")
+
+def upgrade_schema():
+    """Bring an existing database up to date with the current models"""
+    add_missing_columns()
+    merge_client_emails()
+    add_missing_indexes()
+    ensure_default_resource()
+    backfill_block_start_minutes()
+    backfill_client_phone_digits()
+    backfill_payment_amounts()
+    add_client_trigram_indexes()
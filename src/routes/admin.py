@@ -1,10 +1,17 @@
-from flask import Blueprint, request, jsonify, render_template_string, session
+from flask import Blueprint, request, jsonify, render_template, session
 from src.models.user import db
 from src.models.booking import Booking, BlockedSlot
+from src.utils.occupancy import resolve_resource_id, find_batch_conflicts
+from src.utils.timeslots import SLOT_MINUTES, parse_time_minutes
+from src.utils.blocks import delete_blocked_slots
+from src.utils.clients import search_clients, CLIENT_SORTS
+from src.utils.archive import archive_old_records, archive_cutoff
+from src.models.job import ScheduledJob
 from flask_cors import cross_origin
 from datetime import datetime
+import click
 
-admin_bp = Blueprint('admin', __name__)
+admin_bp = Blueprint('admin', __name__, template_folder='../templates')
 
 # Simple test route to verify blueprint is working
 @admin_bp.route('/admin/test')
@@ -14,444 +21,55 @@ def admin_test():
 # Admin password - change this to something secure
 ADMIN_PASSWORD = "admin123"
 
-# Login form template
-LOGIN_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Wave House Admin - Login</title>
-    <style>
-        body { 
-            font-family: Arial, sans-serif; 
-            background: #1a1a1a; 
-            color: white; 
-            display: flex; 
-            justify-content: center; 
-            align-items: center; 
-            height: 100vh; 
-            margin: 0; 
-        }
-        .login-container { 
-            background: #2a2a2a; 
-            padding: 40px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-            max-width: 400px;
-            width: 100%;
-        }
-        .logo { 
-            color: #00ffff; 
-            font-size: 24px; 
-            margin-bottom: 30px; 
-            font-weight: bold;
-        }
-        input[type="password"] { 
-            width: 100%; 
-            padding: 15px; 
-            margin: 15px 0; 
-            border: 1px solid #555; 
-            border-radius: 6px; 
-            background: #333; 
-            color: white; 
-            font-size: 16px;
-            box-sizing: border-box;
-        }
-        input[type="password"]:focus {
-            outline: none;
-            border-color: #00ffff;
-        }
-        button { 
-            width: 100%;
-            padding: 15px; 
-            background: #00aa00; 
-            color: white; 
-            border: none; 
-            border-radius: 6px; 
-            cursor: pointer; 
-            font-size: 16px;
-            font-weight: bold;
-        }
-        button:hover { 
-            background: #00cc00; 
-        }
-        .error { 
-            color: #ff4444; 
-            margin-top: 15px; 
-        }
-        .subtitle {
-            color: #aaa;
-            margin-bottom: 30px;
-        }
-    </style>
-</head>
-<body>
-    <div class="login-container">
-        <div class="logo">🎵 Wave House</div>
-        <div class="subtitle">Admin Dashboard</div>
-        <form method="POST">
-            <input type="password" name="password" placeholder="Enter admin password" required autofocus>
-            <button type="submit">Access Dashboard</button>
-        </form>
-        {% if error %}
-        <div class="error">{{ error }}</div>
-        {% endif %}
-    </div>
-</body>
-</html>
-"""
-
-# Simple admin interface HTML template
-ADMIN_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Wave House Admin</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #1a1a1a; color: white; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        .booking { background: #2a2a2a; padding: 15px; margin: 10px 0; border-radius: 8px; }
-        .booking.pending { border-left: 4px solid #ffa500; }
-        .booking.confirmed { border-left: 4px solid #00ff00; }
-        .booking.cancelled { border-left: 4px solid #ff0000; }
-        .blocked-slot { background: #3a2a2a; padding: 15px; margin: 10px 0; border-radius: 8px; border-left: 4px solid #ff6600; }
-        button { padding: 8px 16px; margin: 5px; border: none; border-radius: 4px; cursor: pointer; }
-        .confirm { background: #00aa00; color: white; }
-        .cancel { background: #aa0000; color: white; }
-        .delete { background: #666; color: white; }
-        .block-btn { background: #ff6600; color: white; }
-        h1, h2 { color: #00ffff; }
-        .stats { display: flex; gap: 20px; margin: 20px 0; }
-        .stat { background: #333; padding: 15px; border-radius: 8px; text-align: center; }
-        .bulk-block-form { background: #2a2a2a; padding: 20px; margin: 20px 0; border-radius: 8px; }
-        .form-group { margin: 15px 0; }
-        .form-group label { display: block; margin-bottom: 5px; color: #00ffff; }
-        .form-group input, .form-group select, .form-group textarea { 
-            width: 100%; padding: 10px; border: 1px solid #555; border-radius: 4px; 
-            background: #333; color: white; box-sizing: border-box; 
-        }
-        .form-group input:focus, .form-group select:focus, .form-group textarea:focus {
-            outline: none; border-color: #00ffff;
-        }
-        .time-slots { display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 10px; margin: 10px 0; }
-        .time-slot { background: #333; padding: 8px; border-radius: 4px; text-align: center; cursor: pointer; border: 2px solid transparent; }
-        .time-slot:hover { border-color: #00ffff; }
-        .time-slot.selected { background: #ff6600; border-color: #ff6600; }
-        .tabs { display: flex; margin: 20px 0; }
-        .tab { padding: 10px 20px; background: #333; border: none; color: white; cursor: pointer; margin-right: 5px; border-radius: 4px 4px 0 0; }
-        .tab.active { background: #00ffff; color: #1a1a1a; }
-        .tab-content { display: none; }
-        .tab-content.active { display: block; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Wave House Admin Dashboard</h1>
-        
-        <div class="stats">
-            <div class="stat">
-                <h3>Total Bookings</h3>
-                <p id="total-bookings">{{ total_bookings }}</p>
-            </div>
-            <div class="stat">
-                <h3>Pending</h3>
-                <p id="pending-bookings">{{ pending_bookings }}</p>
-            </div>
-            <div class="stat">
-                <h3>Confirmed</h3>
-                <p id="confirmed-bookings">{{ confirmed_bookings }}</p>
-            </div>
-            <div class="stat">
-                <h3>Blocked Slots</h3>
-                <p id="blocked-slots">{{ blocked_slots_count }}</p>
-            </div>
-        </div>
-
-        <div class="tabs">
-            <button class="tab active" onclick="showTab('bookings')">Booking Requests</button>
-            <button class="tab" onclick="showTab('blocking')">Bulk Block Times</button>
-            <button class="tab" onclick="showTab('blocked-slots')">Manage Blocked Slots</button>
-        </div>
-
-        <div id="bookings" class="tab-content active">
-            <h2>Booking Requests</h2>
-            <div id="bookings-list">
-                {% for booking in bookings %}
-                <div class="booking {{ booking.status }}" id="booking-{{ booking.id }}">
-                    <h3>{{ booking.name }} - {{ booking.service_type }}</h3>
-                    <p><strong>Date:</strong> {{ booking.date }} at {{ booking.time }}</p>
-                    <p><strong>Duration:</strong> {{ booking.duration or 'N/A' }}</p>
-                    <p><strong>Email:</strong> {{ booking.email }}</p>
-                    <p><strong>Phone:</strong> {{ booking.phone or 'N/A' }}</p>
-                    <p><strong>Project:</strong> {{ booking.project_type or 'N/A' }}</p>
-                    <p><strong>Message:</strong> {{ booking.message or 'N/A' }}</p>
-                    <p><strong>Status:</strong> {{ booking.status }}</p>
-                    <p><strong>Created:</strong> {{ booking.created_at }}</p>
-                    
-                    {% if booking.status == 'pending' %}
-                    <button class="confirm" onclick="updateStatus({{ booking.id }}, 'confirmed')">Confirm Booking</button>
-                    <button class="cancel" onclick="updateStatus({{ booking.id }}, 'cancelled')">Cancel Booking</button>
-                    {% endif %}
-                    <button class="delete" onclick="deleteBooking({{ booking.id }})">Delete</button>
-                </div>
-                {% endfor %}
-            </div>
-        </div>
-
-        <div id="blocking" class="tab-content">
-            <h2>Bulk Block Time Slots</h2>
-            <div class="bulk-block-form">
-                <form id="bulk-block-form">
-                    <div class="form-group">
-                        <label for="start-date">Start Date:</label>
-                        <input type="date" id="start-date" name="start_date" required>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="end-date">End Date:</label>
-                        <input type="date" id="end-date" name="end_date" required>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label>Select Days of Week:</label>
-                        <div style="display: flex; gap: 10px; margin: 10px 0;">
-                            <label><input type="checkbox" name="days" value="0" checked> Sunday</label>
-                            <label><input type="checkbox" name="days" value="1" checked> Monday</label>
-                            <label><input type="checkbox" name="days" value="2" checked> Tuesday</label>
-                            <label><input type="checkbox" name="days" value="3" checked> Wednesday</label>
-                            <label><input type="checkbox" name="days" value="4" checked> Thursday</label>
-                            <label><input type="checkbox" name="days" value="5" checked> Friday</label>
-                            <label><input type="checkbox" name="days" value="6" checked> Saturday</label>
-                        </div>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label>Select Time Slots to Block:</label>
-                        <div class="time-slots" id="time-slots">
-                            <!-- Time slots will be generated by JavaScript -->
-                        </div>
-                        <button type="button" onclick="selectAllTimes()">Select All</button>
-                        <button type="button" onclick="selectNightHours()">Select Night Hours (10PM-6AM)</button>
-                        <button type="button" onclick="clearTimeSelection()">Clear Selection</button>
-                    </div>
-                    
-                    <div class="form-group">
-                        <label for="reason">Reason for Blocking:</label>
-                        <input type="text" id="reason" name="reason" placeholder="e.g., Monthly client rental, Maintenance, Holiday" required>
-                    </div>
-                    
-                    <button type="submit" class="block-btn">Block Selected Time Slots</button>
-                </form>
-            </div>
-        </div>
-
-        <div id="blocked-slots" class="tab-content">
-            <h2>Manage Blocked Slots</h2>
-            <div id="blocked-slots-list">
-                {% for slot in blocked_slots %}
-                <div class="blocked-slot" id="blocked-slot-{{ slot.id }}">
-                    <h3>{{ slot.date }} at {{ slot.time }}</h3>
-                    <p><strong>Reason:</strong> {{ slot.reason or 'No reason specified' }}</p>
-                    <p><strong>Created:</strong> {{ slot.created_at }}</p>
-                    <button class="delete" onclick="deleteBlockedSlot({{ slot.id }})">Remove Block</button>
-                </div>
-                {% endfor %}
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // Tab functionality
-        function showTab(tabName) {
-            // Hide all tab contents
-            const tabContents = document.querySelectorAll('.tab-content');
-            tabContents.forEach(content => content.classList.remove('active'));
-            
-            // Remove active class from all tabs
-            const tabs = document.querySelectorAll('.tab');
-            tabs.forEach(tab => tab.classList.remove('active'));
-            
-            // Show selected tab content
-            document.getElementById(tabName).classList.add('active');
-            
-            // Add active class to clicked tab
-            event.target.classList.add('active');
-        }
-
-        // Generate time slots
-        function generateTimeSlots() {
-            const timeSlotsContainer = document.getElementById('time-slots');
-            const times = [];
-            
-            // Generate 24-hour time slots
-            for (let hour = 0; hour < 24; hour++) {
-                const time12 = hour === 0 ? '12:00 AM' : 
-                              hour < 12 ? `${hour}:00 AM` : 
-                              hour === 12 ? '12:00 PM' : 
-                              `${hour - 12}:00 PM`;
-                const time24 = `${hour.toString().padStart(2, '0')}:00`;
-                times.push({ display: time12, value: time24 });
-            }
-            
-            times.forEach(time => {
-                const slot = document.createElement('div');
-                slot.className = 'time-slot';
-                slot.textContent = time.display;
-                slot.dataset.time = time.value;
-                slot.onclick = () => toggleTimeSlot(slot);
-                timeSlotsContainer.appendChild(slot);
-            });
-        }
-
-        function toggleTimeSlot(slot) {
-            slot.classList.toggle('selected');
-        }
-
-        function selectAllTimes() {
-            const slots = document.querySelectorAll('.time-slot');
-            slots.forEach(slot => slot.classList.add('selected'));
-        }
-
-        function selectNightHours() {
-            clearTimeSelection();
-            const slots = document.querySelectorAll('.time-slot');
-            slots.forEach(slot => {
-                const hour = parseInt(slot.dataset.time.split(':')[0]);
-                if (hour >= 22 || hour < 6) { // 10PM to 6AM
-                    slot.classList.add('selected');
-                }
-            });
-        }
-
-        function clearTimeSelection() {
-            const slots = document.querySelectorAll('.time-slot');
-            slots.forEach(slot => slot.classList.remove('selected'));
-        }
-
-        // Form submission
-        document.getElementById('bulk-block-form').addEventListener('submit', function(e) {
-            e.preventDefault();
-            
-            const formData = new FormData(this);
-            const selectedTimes = Array.from(document.querySelectorAll('.time-slot.selected'))
-                                      .map(slot => slot.dataset.time);
-            const selectedDays = Array.from(document.querySelectorAll('input[name="days"]:checked'))
-                                     .map(input => parseInt(input.value));
-            
-            if (selectedTimes.length === 0) {
-                alert('Please select at least one time slot to block.');
-                return;
-            }
-            
-            if (selectedDays.length === 0) {
-                alert('Please select at least one day of the week.');
-                return;
-            }
-            
-            const data = {
-                start_date: formData.get('start_date'),
-                end_date: formData.get('end_date'),
-                days: selectedDays,
-                times: selectedTimes,
-                reason: formData.get('reason')
-            };
-            
-            fetch('/admin/bulk-block', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(data)
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.error) {
-                    alert('Error: ' + data.error);
-                } else {
-                    alert(`Successfully blocked ${data.blocked_count} time slots!`);
-                    location.reload();
-                }
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                alert('Error blocking time slots');
-            });
-        });
-
-        function updateStatus(bookingId, status) {
-            fetch(`/admin/bookings/${bookingId}`, {
-                method: 'PUT',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ status: status })
-            })
-            .then(response => response.json())
-            .then(data => {
-                if (data.error) {
-                    alert('Error: ' + data.error);
-                } else {
-                    location.reload();
-                }
-            })
-            .catch(error => {
-                console.error('Error:', error);
-                alert('Error updating booking');
-            });
-        }
-
-        function deleteBooking(bookingId) {
-            if (confirm('Are you sure you want to delete this booking?')) {
-                fetch(`/admin/bookings/${bookingId}`, {
-                    method: 'DELETE'
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.error) {
-                        alert('Error: ' + data.error);
-                    } else {
-                        location.reload();
-                    }
-                })
-                .catch(error => {
-                    console.error('Error:', error);
-                    alert('Error deleting booking');
-                });
-            }
-        }
-
-        function deleteBlockedSlot(slotId) {
-            if (confirm('Are you sure you want to remove this blocked time slot?')) {
-                fetch(`/admin/blocked-slots/${slotId}`, {
-                    method: 'DELETE'
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.error) {
-                        alert('Error: ' + data.error);
-                    } else {
-                        location.reload();
-                    }
-                })
-                .catch(error => {
-                    console.error('Error:', error);
-                    alert('Error deleting blocked slot');
-                });
-            }
-        }
-
-        // Initialize time slots when page loads
-        document.addEventListener('DOMContentLoaded', function() {
-            generateTimeSlots();
-            
-            // Set default dates (today and 3 months from now)
-            const today = new Date();
-            const threeMonthsLater = new Date(today);
-            threeMonthsLater.setMonth(threeMonthsLater.getMonth() + 3);
-            
-            document.getElementById('start-date').value = today.toISOString().split('T')[0];
-            document.getElementById('end-date').value = threeMonthsLater.toISOString().split('T')[0];
-        });
-    </script>
-</body>
-</html>
-"""
+# Rows per dashboard fragment page
+ADMIN_PAGE_SIZE = 25
+
+# Status changes the batch endpoint accepts, keyed by current status
+ALLOWED_TRANSITIONS = {
+    'pending': {'confirmed', 'cancelled'},
+    'confirmed': {'pending', 'cancelled'},
+    'cancelled': {'pending', 'confirmed'},
+    'expired': {'pending', 'confirmed', 'cancelled'},
+    'engineer-request': {'cancelled'},
+    'mixing-request': {'cancelled'},
+}
+
+# Upper bound on ids per batch request
+BATCH_STATUS_LIMIT = 500
+
+def get_dashboard_stats():
+    """Dashboard counters in one aggregate query plus one count"""
+    total, pending, confirmed = db.session.query(
+        db.func.count(Booking.id),
+        db.func.coalesce(db.func.sum(db.case((Booking.status == 'pending', 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case((Booking.status == 'confirmed', 1), else_=0)), 0)
+    ).one()
+    return {
+        'total_bookings': total,
+        'pending_bookings': int(pending),
+        'confirmed_bookings': int(confirmed),
+        'blocked_slots_count': BlockedSlot.query.count()
+    }
+
+def get_page_args():
+    """Read ?page=&per_page= with sane bounds"""
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', ADMIN_PAGE_SIZE, type=int), 1), 100)
+    return page, per_page
+
+def get_client_search_args():
+    """Read the client directory's ?q=&is_flagged=&verification_status=&sort=&order="""
+    sort = request.args.get('sort') or None
+    if sort and sort not in CLIENT_SORTS:
+        raise ValueError(f"Unsupported sort: {sort} (use one of {', '.join(CLIENT_SORTS)})")
+    flagged = request.args.get('is_flagged', '').lower()
+    return {
+        'q': request.args.get('q'),
+        'is_flagged': {'true': True, '1': True, 'false': False, '0': False}.get(flagged),
+        'verification_status': request.args.get('verification_status') or None,
+        'sort': sort,
+        'descending': request.args.get('order', 'desc').lower() != 'asc'
+    }
 
 @admin_bp.route('/admin', methods=['GET', 'POST'])
 def admin_dashboard():
@@ -469,41 +87,127 @@ def admin_dashboard():
             return admin_dashboard_view()
         else:
             print("DEBUG: Authentication failed")
-            return render_template_string(LOGIN_TEMPLATE, error="Incorrect password")
+            return render_template('admin/login.html', error="Incorrect password")
     
     # Check if already authenticated
     if session.get('admin_authenticated'):
         return admin_dashboard_view()
     
     # Show login form
-    return render_template_string(LOGIN_TEMPLATE)
+    return render_template('admin/login.html')
 
 def admin_dashboard_view():
-    """Display the actual admin dashboard"""
+    """Display the dashboard shell; lists are loaded as fragments"""
     try:
-        bookings = Booking.query.order_by(Booking.created_at.desc()).all()
-        blocked_slots = BlockedSlot.query.order_by(BlockedSlot.date.desc(), BlockedSlot.time.desc()).all()
-        
-        total_bookings = len(bookings)
-        pending_bookings = len([b for b in bookings if b.status == 'pending'])
-        confirmed_bookings = len([b for b in bookings if b.status == 'confirmed'])
-        blocked_slots_count = len(blocked_slots)
-        
-        return render_template_string(ADMIN_TEMPLATE, 
-                                    bookings=bookings,
-                                    blocked_slots=blocked_slots,
-                                    total_bookings=total_bookings,
-                                    pending_bookings=pending_bookings,
-                                    confirmed_bookings=confirmed_bookings,
-                                    blocked_slots_count=blocked_slots_count)
+        return render_template('admin/dashboard.html',
+                               slot_minutes=SLOT_MINUTES,
+                               **get_dashboard_stats())
     except Exception as e:
         return f"Error: {str(e)}", 500
 
+@admin_bp.route('/admin/fragments/bookings')
+def admin_bookings_fragment():
+    """One page of booking cards, newest first (?status= filters)"""
+    if not session.get('admin_authenticated'):
+        return 'Not authenticated', 401
+    
+    page, per_page = get_page_args()
+    query = Booking.query.order_by(Booking.created_at.desc())
+    if request.args.get('status'):
+        query = query.filter_by(status=request.args['status'])
+    
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    return render_template('admin/bookings.html', pagination=pagination)
+
+@admin_bp.route('/admin/fragments/blocked-slots')
+def admin_blocked_slots_fragment():
+    """One page of blocked slots, latest dates first"""
+    if not session.get('admin_authenticated'):
+        return 'Not authenticated', 401
+    
+    page, per_page = get_page_args()
+    pagination = BlockedSlot.query.order_by(
+        BlockedSlot.date.desc(), BlockedSlot.time.desc()
+    ).paginate(page=page, per_page=per_page, error_out=False)
+    return render_template('admin/blocked_slots.html', pagination=pagination)
+
+@admin_bp.route('/admin/fragments/clients')
+def admin_clients_fragment():
+    """One page of the client directory (same filters as /admin/clients)"""
+    if not session.get('admin_authenticated'):
+        return 'Not authenticated', 401
+    
+    try:
+        search = get_client_search_args()
+    except ValueError as e:
+        return str(e), 400
+    page, per_page = get_page_args()
+    pagination = search_clients(**search).paginate(page=page, per_page=per_page, error_out=False)
+    return render_template('admin/clients.html', pagination=pagination)
+
+@admin_bp.route('/admin/fragments/stats')
+def admin_stats_fragment():
+    """Dashboard counters as JSON for periodic refresh"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    return jsonify(get_dashboard_stats())
+
 @admin_bp.route('/admin/logout')
 def admin_logout():
     """Logout from admin dashboard"""
     session.pop('admin_authenticated', None)
-    return render_template_string(LOGIN_TEMPLATE, error="Logged out successfully")
+    return render_template('admin/login.html', error="Logged out successfully")
+
+@admin_bp.route('/admin/clients', methods=['GET'])
+@cross_origin()
+def get_clients():
+    """Paginated client directory: search, filter and sort clients"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        search = get_client_search_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        page, per_page = get_page_args()
+        pagination = search_clients(**search).paginate(page=page, per_page=per_page, error_out=False)
+        return jsonify({
+            'clients': [client.to_dict() for client in pagination.items],
+            'page': pagination.page,
+            'per_page': pagination.per_page,
+            'total': pagination.total,
+            'pages': pagination.pages
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/admin/jobs', methods=['GET'])
+@cross_origin()
+def get_scheduled_jobs():
+    """Maintenance job schedules, locks and duration metrics"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # Imported here: the scheduler module pulls in every job's dependencies
+    from src.scheduler import JOBS
+    
+    try:
+        rows = {row.name: row for row in ScheduledJob.query.all()}
+        now = datetime.utcnow()
+        jobs = []
+        for job in JOBS:
+            row = rows.get(job.name)
+            next_run = job.schedule.next_after(now) if job.schedule else None
+            jobs.append(dict(
+                row.to_dict() if row else {'name': job.name},
+                schedule=job.schedule.expression if job.schedule else None,
+                next_run_at=next_run.isoformat() if next_run else None
+            ))
+        return jsonify({'jobs': jobs})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @admin_bp.route('/admin/bookings/<int:booking_id>', methods=['PUT'])
 @cross_origin()
@@ -511,12 +215,83 @@ def update_booking_admin(booking_id):
     try:
         data = request.get_json()
         booking = Booking.query.get_or_404(booking_id)
+        previous_status = booking.status
         
         if 'status' in data:
             booking.status = data['status']
         
         db.session.commit()
-        return jsonify({'message': 'Booking updated successfully', 'booking': booking.to_dict()})
+        return jsonify({
+            'message': 'Booking updated successfully',
+            'booking': booking.to_dict(),
+            'previous_status': previous_status,
+            'html': render_template('admin/_booking.html', booking=booking)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/admin/bookings/batch-status', methods=['POST'])
+@cross_origin()
+def batch_update_booking_status():
+    """Move many bookings to one status in a single transaction.
+
+    Body: {"ids": [...], "status": "confirmed", "skip_invalid": false}.
+    Confirmations are conflict-checked together, against existing occupancy
+    and each other. By default any invalid id rejects the whole batch with
+    409; with skip_invalid the valid ones are applied and the rest reported.
+    """
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        data = request.get_json() or {}
+        status = data.get('status')
+        try:
+            booking_ids = sorted({int(booking_id) for booking_id in data.get('ids') or []})
+        except (TypeError, ValueError):
+            return jsonify({'error': 'ids must be a list of booking ids'}), 400
+        
+        if status not in {target for targets in ALLOWED_TRANSITIONS.values() for target in targets}:
+            return jsonify({'error': f'Unsupported status: {status}'}), 400
+        if not booking_ids:
+            return jsonify({'error': 'ids is required'}), 400
+        if len(booking_ids) > BATCH_STATUS_LIMIT:
+            return jsonify({'error': f'At most {BATCH_STATUS_LIMIT} bookings per batch'}), 400
+        
+        bookings = {booking.id: booking for booking in Booking.query.filter(Booking.id.in_(booking_ids))}
+        
+        errors = {}
+        for booking_id in booking_ids:
+            booking = bookings.get(booking_id)
+            if not booking:
+                errors[booking_id] = 'not found'
+            elif status not in ALLOWED_TRANSITIONS.get(booking.status, ()):
+                errors[booking_id] = f'cannot change {booking.status} to {status}'
+        
+        if status == 'confirmed':
+            confirming = [booking for booking_id, booking in bookings.items() if booking_id not in errors]
+            for booking_id, conflict in find_batch_conflicts(confirming).items():
+                errors[booking_id] = 'time slot already booked' if conflict == 'booked' else 'time slot blocked'
+        
+        if errors and not data.get('skip_invalid'):
+            return jsonify({'error': 'Some bookings cannot be updated', 'errors': errors}), 409
+        
+        updated = {booking_id: bookings[booking_id].status for booking_id in booking_ids if booking_id not in errors}
+        if updated:
+            Booking.query.filter(Booking.id.in_(list(updated))).update(
+                {Booking.status: status}, synchronize_session=False
+            )
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'Updated {len(updated)} bookings',
+            'status': status,
+            'updated_count': len(updated),
+            'previous_statuses': updated,
+            'errors': errors
+        })
         
     except Exception as e:
         db.session.rollback()
@@ -527,10 +302,11 @@ def update_booking_admin(booking_id):
 def delete_booking_admin(booking_id):
     try:
         booking = Booking.query.get_or_404(booking_id)
+        previous_status = booking.status
         db.session.delete(booking)
         db.session.commit()
         
-        return jsonify({'message': 'Booking deleted successfully'})
+        return jsonify({'message': 'Booking deleted successfully', 'deleted_id': booking_id, 'previous_status': previous_status})
         
     except Exception as e:
         db.session.rollback()
@@ -550,6 +326,13 @@ def bulk_block_slots():
         selected_times = data['times']  # List of time strings like "22:00"
         reason = data['reason']
         
+        # No resource blocks every room
+        resource_id = None
+        if data.get('resource_id') or data.get('resource'):
+            resource_id = resolve_resource_id(data.get('resource_id') or data.get('resource'))
+            if not resource_id:
+                return jsonify({'error': 'Unknown studio resource'}), 400
+        
         blocked_count = 0
         current_date = start_date
         
@@ -566,7 +349,8 @@ def bulk_block_slots():
                     # Check if this slot is already blocked
                     existing_block = BlockedSlot.query.filter_by(
                         date=current_date,
-                        time=time_str
+                        time=time_str,
+                        resource_id=resource_id
                     ).first()
                     
                     if not existing_block:
@@ -574,7 +358,9 @@ def bulk_block_slots():
                         blocked_slot = BlockedSlot(
                             date=current_date,
                             time=time_str,
-                            reason=reason
+                            duration_minutes=SLOT_MINUTES,
+                            reason=reason,
+                            resource_id=resource_id
                         )
                         db.session.add(blocked_slot)
                         blocked_count += 1
@@ -595,43 +381,87 @@ def bulk_block_slots():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-@admin_bp.route('/admin/blocked-slots/<int:slot_id>', methods=['DELETE'])
+@admin_bp.route('/admin/bulk-unblock', methods=['POST'])
 @cross_origin()
-def delete_blocked_slot(slot_id):
-    """Delete a blocked slot"""
+def bulk_unblock_slots():
+    """Bulk unblock time slots across a date range in a single DELETE"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
     try:
-        blocked_slot = BlockedSlot.query.get_or_404(slot_id)
-        db.session.delete(blocked_slot)
+        data = request.get_json() or {}
+        
+        try:
+            start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+            end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': 'start_date and end_date are required (YYYY-MM-DD)'}), 400
+        if end_date < start_date:
+            return jsonify({'error': 'end_date must not be before start_date'}), 400
+        
+        # Same shape as bulk-block. Clearing every weekday or every time of
+        # day must be asked for explicitly.
+        selected_days = data.get('days')  # List of weekday numbers (0=Sunday, 6=Saturday)
+        selected_times = data.get('times')  # List of time strings like "22:00"
+        if not selected_days and data.get('all_days') is not True:
+            return jsonify({'error': 'Select the days to unblock, or send all_days: true to unblock every weekday'}), 400
+        if selected_days and not all(isinstance(day, int) and 0 <= day <= 6 for day in selected_days):
+            return jsonify({'error': 'days must be weekday numbers from 0 (Sunday) to 6 (Saturday)'}), 400
+        if not selected_times and data.get('all_times') is not True:
+            return jsonify({'error': 'Select the times to unblock, or send all_times: true to unblock every time'}), 400
+        start_minutes = None
+        if selected_times:
+            start_minutes = [parse_time_minutes(time_str) for time_str in selected_times]
+            if None in start_minutes:
+                return jsonify({'error': 'Invalid time; use e.g. "22:00" or "10:00 PM"'}), 400
+        
+        resource_id = None
+        if data.get('resource_id') or data.get('resource'):
+            resource_id = resolve_resource_id(data.get('resource_id') or data.get('resource'))
+            if not resource_id:
+                return jsonify({'error': 'Unknown studio resource'}), 400
+        
+        counts = delete_blocked_slots(
+            start_date, end_date,
+            weekdays=selected_days or None,
+            start_minutes=start_minutes,
+            reason=data.get('reason') or None,
+            resource_id=resource_id
+        )
         db.session.commit()
         
-        return jsonify({'message': 'Blocked slot removed successfully'})
+        unblocked_count = sum(counts.values())
+        return jsonify({
+            'message': f'Successfully unblocked {unblocked_count} time slots',
+            'unblocked_count': unblocked_count,
+            'dates': counts
+        })
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-
-
-@admin_bp.route('/api/blocked-slots', methods=['GET'])
+@admin_bp.route('/admin/blocked-slots/<int:slot_id>', methods=['DELETE'])
+@admin_bp.route('/api/admin/blocked-slot/<int:slot_id>', methods=['DELETE'])  # static admin interface
 @cross_origin()
-def get_blocked_slots():
-    """Get all blocked slots for frontend calendar"""
+def delete_blocked_slot(slot_id):
+    """Delete a blocked slot"""
     try:
-        blocked_slots = BlockedSlot.query.all()
-        blocked_data = {}
+        deleted_count = BlockedSlot.query.filter_by(id=slot_id).delete(synchronize_session=False)
+        db.session.commit()
+        if not deleted_count:
+            return jsonify({'success': False, 'error': 'Blocked slot not found'}), 404
         
-        for slot in blocked_slots:
-            date_str = slot.date.strftime('%Y-%m-%d')
-            time_str = slot.time.strftime('%I:%M %p').lstrip('0')
-            
-            if date_str not in blocked_data:
-                blocked_data[date_str] = []
-            blocked_data[date_str].append(time_str)
+        return jsonify({
+            'success': True,
+            'message': 'Blocked slot removed successfully',
+            'deleted_id': slot_id,
+            'deleted_count': deleted_count
+        })
         
-        return jsonify(blocked_data)
     except Exception as e:
-        print(f"Error fetching blocked slots: {e}")
-        return jsonify({}), 500
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 
 
@@ -664,28 +494,6 @@ def get_all_bookings():
         print(f"Error getting bookings: {e}")
         return jsonify({'error': str(e)}), 500
 
-@admin_bp.route('/api/blocked-slots', methods=['GET'])
-@cross_origin()
-def get_all_blocked_slots():
-    """Get all blocked slots for admin dashboard"""
-    try:
-        blocked_slots = BlockedSlot.query.order_by(BlockedSlot.date, BlockedSlot.time).all()
-        slots_data = []
-        
-        for slot in blocked_slots:
-            slots_data.append({
-                'id': slot.id,
-                'date': slot.date.strftime('%Y-%m-%d') if slot.date else '',
-                'time': slot.time.strftime('%H:%M') if slot.time else '',
-                'created_at': slot.created_at.strftime('%Y-%m-%d %H:%M:%S') if slot.created_at else ''
-            })
-        
-        return jsonify(slots_data)
-        
-    except Exception as e:
-        print(f"Error getting blocked slots: {e}")
-        return jsonify({'error': str(e)}), 500
-
 @admin_bp.route('/api/admin/booking/<int:booking_id>', methods=['PUT'])
 @cross_origin()
 def update_booking_status(booking_id):
@@ -711,22 +519,11 @@ def update_booking_status(booking_id):
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@admin_bp.route('/api/admin/blocked-slot/<int:slot_id>', methods=['DELETE'])
-@cross_origin()
-def delete_blocked_slot(slot_id):
-    """Delete a blocked slot"""
-    try:
-        slot = BlockedSlot.query.get(slot_id)
-        if not slot:
-            return jsonify({'success': False, 'error': 'Blocked slot not found'}), 404
-        
-        db.session.delete(slot)
-        db.session.commit()
-        
-        return jsonify({'success': True, 'message': 'Blocked slot removed successfully'})
-        
-    except Exception as e:
-        print(f"Error deleting blocked slot: {e}")
-        db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 500
-
+@admin_bp.cli.command('archive-old-records')
+@click.option('--before', help='Archive rows dated before this day (YYYY-MM-DD), defaults to ARCHIVE_AFTER_DAYS ago')
+@click.option('--batch-size', type=int, help='Rows moved per transaction, defaults to ARCHIVE_BATCH_SIZE')
+def archive_old_records_command(before, batch_size):
+    """Move old bookings and blocks to the archive tables: flask admin archive-old-records"""
+    cutoff = datetime.strptime(before, '%Y-%m-%d').date() if before else archive_cutoff()
+    moved = archive_old_records(cutoff, batch_size)
+    print(f"Archived {moved['bookings']} bookings and {moved['blocked_slots']} blocked slots dated before {cutoff}")
@@ -0,0 +1,110 @@
+from flask import Blueprint, request, jsonify, session
+from datetime import datetime, date, timedelta
+from flask_cors import cross_origin
+import click
+from src.models.user import db
+from src.models.analytics import DailyRollup, MonthlyRollup
+from src.utils.rollups import refresh_rollups
+from src.utils.occupancy import get_active_resource_ids
+
+analytics_bp = Blueprint('analytics', __name__)
+
+def parse_date_range(default_days=30):
+    """Read ?start=YYYY-MM-DD&end=YYYY-MM-DD, defaulting to the last N days"""
+    end_str = request.args.get('end')
+    start_str = request.args.get('start')
+    end_date = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else date.today()
+    start_date = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else end_date - timedelta(days=default_days - 1)
+    return start_date, end_date
+
+@analytics_bp.route('/analytics/daily', methods=['GET'])
+@cross_origin()
+def get_daily_analytics():
+    """Per-day occupancy, blocking and revenue from the rollup table"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        start_date, end_date = parse_date_range()
+        rollups = DailyRollup.query.filter(
+            DailyRollup.date.between(start_date, end_date)
+        ).order_by(DailyRollup.date).all()
+        return jsonify([rollup.to_dict() for rollup in rollups])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@analytics_bp.route('/analytics/monthly', methods=['GET'])
+@cross_origin()
+def get_monthly_analytics():
+    """Per-month totals from the rollup table (?start=YYYY-MM&end=YYYY-MM)"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        query = MonthlyRollup.query
+        if request.args.get('start'):
+            query = query.filter(MonthlyRollup.month >= request.args['start'])
+        if request.args.get('end'):
+            query = query.filter(MonthlyRollup.month <= request.args['end'])
+        rollups = query.order_by(MonthlyRollup.month).all()
+        return jsonify([rollup.to_dict() for rollup in rollups])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@analytics_bp.route('/analytics/summary', methods=['GET'])
+@cross_origin()
+def get_analytics_summary():
+    """Totals and utilization over an arbitrary date range (e.g. last quarter)"""
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        start_date, end_date = parse_date_range(default_days=90)
+        occupied, blocked, booking_count, confirmed_count, revenue, rollup_days, rollup_resource_days = db.session.query(
+            db.func.coalesce(db.func.sum(DailyRollup.occupied_hours), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.blocked_hours), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.booking_count), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.confirmed_count), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.revenue), 0),
+            db.func.count(DailyRollup.id),
+            db.func.coalesce(db.func.sum(DailyRollup.resource_count), 0)
+        ).filter(
+            DailyRollup.date.between(start_date, end_date)
+        ).one()
+
+        # Each rolled-up day keeps the room count it was computed with; days
+        # with no activity have no row and use today's count
+        days = (end_date - start_date).days + 1
+        resource_count = max(len(get_active_resource_ids()), 1)
+        resource_days = int(rollup_resource_days) + (days - int(rollup_days)) * resource_count
+        capacity = max(0.0, resource_days * 24.0 - float(blocked))
+
+        return jsonify({
+            'start': start_date.isoformat(),
+            'end': end_date.isoformat(),
+            'days': days,
+            'resource_count': resource_count,
+            'resource_days': resource_days,
+            'occupied_hours': float(occupied),
+            'blocked_hours': float(blocked),
+            'booking_count': int(booking_count),
+            'confirmed_count': int(confirmed_count),
+            'revenue': float(revenue),
+            'utilization': round(float(occupied) / capacity, 4) if capacity else None
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@analytics_bp.cli.command('refresh-rollups')
+@click.option('--start', help='First date to refresh (YYYY-MM-DD), defaults to 7 days ago')
+@click.option('--end', help='Last date to refresh (YYYY-MM-DD), defaults to 90 days ahead')
+def refresh_rollups_command(start, end):
+    """Rebuild analytics rollups, e.g. nightly: flask analytics refresh-rollups"""
+    start_date = datetime.strptime(start, '%Y-%m-%d').date() if start else None
+    end_date = datetime.strptime(end, '%Y-%m-%d').date() if end else None
+    result = refresh_rollups(start_date, end_date)
+    print(f"Refreshed {result['days']} daily and {result['months']} monthly rollups")
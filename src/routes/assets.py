@@ -0,0 +1,32 @@
+import hashlib
+import os
+from functools import lru_cache
+from flask import Blueprint, request, send_from_directory, url_for
+
+# Admin CSS/JS extracted from the server-rendered pages
+ADMIN_STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static')
+
+# Fingerprinted URLs never change content, so browsers may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+assets_bp = Blueprint('assets', __name__)
+
+@lru_cache(maxsize=None)
+def asset_fingerprint(filename):
+    """Short content hash of a static file, computed once per process"""
+    with open(os.path.join(ADMIN_STATIC_DIR, filename), 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()[:12]
+
+@assets_bp.app_template_global()
+def asset_url(filename):
+    """URL for an admin static file, fingerprinted with its content hash"""
+    return url_for('assets.admin_static', filename=filename, v=asset_fingerprint(filename))
+
+@assets_bp.route('/admin-static/<path:filename>')
+def admin_static(filename):
+    """Serve admin CSS/JS; fingerprinted requests are cacheable forever"""
+    if request.args.get('v'):
+        response = send_from_directory(ADMIN_STATIC_DIR, filename, max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.immutable = True
+        return response
+    return send_from_directory(ADMIN_STATIC_DIR, filename)
@@ -1,90 +1,76 @@
-from flask import Blueprint, request, jsonify, session, redirect, render_template_string
+import os
+import queue
+import time
+from flask import Blueprint, Response, request, jsonify, session, redirect, render_template, current_app, stream_with_context
 from datetime import datetime, date, timedelta
 from src.models.booking import db, Booking, BlockedSlot
+from src.models.client import normalize_email
 from src.utils.email_sender import send_booking_notification
+from src.utils.background import run_in_background
+from src.utils.idempotency import idempotent, store_idempotent_response
+from src.utils.ratelimit import rate_limit
+from src.utils.pricing import calculate_booking_amount
+from src.utils.timeslots import (
+    minutes_to_time, duration_to_minutes,
+    SLOT_MINUTES, TURNOVER_MINUTES
+)
+from src.utils.occupancy import (
+    load_occupancy, booking_day_masks, mask_to_times, find_next_available, get_default_resource_id,
+    get_active_resource_ids, resolve_resource_id, mask_to_base64
+)
+from src.utils.snapshots import get_snapshot, snapshot_response
+from src.utils.events import get_broker
+from src.utils.blocks import get_blocked_ranges, get_block_window_cursors, delete_blocked_range
+from src.utils.archive import booking_history
+from src.utils.clients import admit_client, cache_client
 from flask_cors import cross_origin
 
-booking_bp = Blueprint('booking', __name__)
-
-def time_to_minutes(time_str):
-    """Convert time string like '2:00 PM' to minutes since midnight"""
-    try:
-        time_obj = datetime.strptime(time_str, '%I:%M %p').time()
-        return time_obj.hour * 60 + time_obj.minute
-    except:
-        return 0
-
-def minutes_to_time(minutes):
-    """Convert minutes since midnight to time string like '2:00 PM'"""
-    hours = minutes // 60
-    mins = minutes % 60
-    
-    if hours == 0:
-        return f"12:{mins:02d} AM"
-    elif hours < 12:
-        return f"{hours}:{mins:02d} AM"
-    elif hours == 12:
-        return f"12:{mins:02d} PM"
-    else:
-        return f"{hours-12}:{mins:02d} PM"
-
-def get_time_range(start_time, duration_hours):
-    """Get all time slots occupied by a booking"""
-    start_minutes = time_to_minutes(start_time)
-    duration_minutes = int(duration_hours) * 60
-    
-    occupied_slots = []
-    current_minutes = start_minutes
-    
-    # Generate all hourly slots within the duration
-    while current_minutes < start_minutes + duration_minutes:
-        occupied_slots.append(minutes_to_time(current_minutes))
-        current_minutes += 60
-        
-        # Handle day overflow (past midnight)
-        if current_minutes >= 24 * 60:
-            break
-    
-    return occupied_slots
-
-def check_booking_conflicts(booking_date, start_time, duration):
-    """Check if a new booking conflicts with existing bookings"""
-    if not duration:
-        return False
-        
+booking_bp = Blueprint('booking', __name__, template_folder='../templates')
+
+# Accept type that selects the compact availability format
+AVAILABILITY_BITMASK_MIMETYPE = 'application/vnd.wavehouse.availability+json'
+
+# Live availability streams are recycled so sync workers are not held forever;
+# EventSource reconnects on its own after `retry` milliseconds
+AVAILABILITY_STREAM_SECONDS = int(os.environ.get('AVAILABILITY_STREAM_SECONDS', 60))
+# Open streams per worker process; later clients fall back to polling
+AVAILABILITY_STREAM_MAX_SUBSCRIBERS = int(os.environ.get('AVAILABILITY_STREAM_MAX_SUBSCRIBERS', 200))
+AVAILABILITY_STREAM_RETRY_MS = 3000
+AVAILABILITY_KEEPALIVE_SECONDS = 15
+
+# Dates per page of the blocked-slot management view
+BLOCK_WINDOW_DAYS = 14
+
+def get_block_window_args():
+    """Read ?start=YYYY-MM-DD&days= for the blocked-slot views; start defaults to today"""
+    start_str = request.args.get('start')
+    window_start = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else date.today()
+    days = min(max(request.args.get('days', BLOCK_WINDOW_DAYS, type=int), 1), 92)
+    return window_start, window_start + timedelta(days=days - 1), days
+
+def unbookable_resource_response(value, unknown_status=404):
+    """Error response for a public resource parameter that didn't resolve"""
+    if resolve_resource_id(value) is None:
+        return jsonify({'error': 'Unknown studio resource'}), unknown_status
+    return jsonify({'error': 'This studio resource is not available for booking'}), 400
+
+def find_booking_conflict(booking_date, start_time, duration, resource_id=None, service_type=None):
+    """Return 'booked', 'blocked' or None for a requested booking on one resource"""
     try:
-        duration_int = int(duration)
+        new_booking_mask, spill_mask = booking_day_masks(start_time, duration, service_type)
     except (ValueError, TypeError):
-        return False
-        
-    # Get the time slots this booking would occupy
-    new_booking_slots = get_time_range(start_time, duration_int)
-    
-    # Get all confirmed bookings for this date
-    existing_bookings = Booking.query.filter_by(
-        date=booking_date,
-        status='confirmed'
-    ).all()
+        new_booking_mask, spill_mask = booking_day_masks(start_time, None, service_type)
     
-    # Check each existing booking for conflicts
-    for booking in existing_bookings:
-        if booking.duration and booking.duration != '':
-            try:
-                existing_duration = int(booking.duration)
-                if existing_duration > 0:
-                    existing_slots = get_time_range(booking.time, existing_duration)
-                    
-                    # Check for any overlap
-                    for slot in new_booking_slots:
-                        if slot in existing_slots:
-                            return True
-            except (ValueError, TypeError):
-                continue
-    
-    return False
+    resource_id = resource_id or get_default_resource_id()
+    next_date = booking_date + timedelta(days=1)
+    occupancy = load_occupancy(booking_date, next_date, resource_ids=[resource_id])
+    return (occupancy.find_conflict(booking_date, resource_id, new_booking_mask)
+            or occupancy.find_conflict(next_date, resource_id, spill_mask))
 
 @booking_bp.route('/bookings', methods=['POST'])
 @cross_origin()
+@rate_limit('bookings', per_ip='20/hour', per_email='5/hour')
+@idempotent
 def create_booking():
     try:
         data = request.get_json()
@@ -92,60 +78,25 @@ def create_booking():
         # Parse the date string
         booking_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         
-        # Check for duration-based conflicts
-        if data.get('duration'):
-            if check_booking_conflicts(booking_date, data['time'], data['duration']):
-                return jsonify({'error': 'This time slot conflicts with an existing booking'}), 400
-        
-        # Check if the exact slot is already booked (for single-hour bookings)
-        existing_booking = Booking.query.filter_by(
-            date=booking_date,
-            time=data['time'],
-            status='confirmed'
-        ).first()
-        
-        if existing_booking:
-            return jsonify({'error': 'This time slot is already booked'}), 400
-        
-        # Check if the slot is blocked
-        blocked_slot = BlockedSlot.query.filter_by(
-            date=booking_date,
-            time=data['time']
-        ).first()
+        resource_id = resolve_resource_id(data.get('resource_id') or data.get('resource'), active_only=True)
+        if not resource_id:
+            return unbookable_resource_response(data.get('resource_id') or data.get('resource'), unknown_status=400)
         
-        if blocked_slot:
+        # Check the whole booking window against confirmed bookings and blocks
+        conflict = find_booking_conflict(booking_date, data['time'], data.get('duration'), resource_id, data['service_type'])
+        if conflict == 'booked':
+            return jsonify({'error': 'This time slot conflicts with an existing booking'}), 400
+        if conflict == 'blocked':
             return jsonify({'error': 'This time slot is not available'}), 400
         
-        # Import Client model here to avoid circular imports
-        from src.models.client import Client
+        # Price the booking from the rate table
+        booking_amount = calculate_booking_amount(data['service_type'], data.get('duration'), data['time'])
+        email = normalize_email(data['email'])
         
-        # Check if client exists and their verification status
-        client = Client.query.filter_by(email=data['email']).first()
-        requires_verification = False
-        client_id = None
-        
-        if not client:
-            # New client - create profile and require verification
-            client = Client(
-                email=data['email'],
-                name=data['name'],
-                phone=data.get('phone'),
-                verification_status='pending'
-            )
-            db.session.add(client)
-            db.session.flush()  # Get the ID without committing
-            requires_verification = True
-            client_id = client.id
-        else:
-            # Existing client - check if they need verification
-            client_id = client.id
-            requires_verification = client.needs_verification()
-            
-            # Update client info if needed
-            if client.name != data['name']:
-                client.name = data['name']
-            if data.get('phone') and client.phone != data.get('phone'):
-                client.phone = data.get('phone')
+        # Create or update the client, learn their verification status and
+        # count the booking in their stats: one statement at most, none for a
+        # cached returning client still awaiting verification
+        client_id, requires_verification = admit_client(email, data['name'], data.get('phone'), booking_amount)
         
         # Create new booking
         booking = Booking(
@@ -154,55 +105,44 @@ def create_booking():
             time=data['time'],
             duration=data.get('duration'),
             name=data['name'],
-            email=data['email'],
+            email=email,
             phone=data.get('phone'),
             project_type=data.get('project_type'),
             message=data.get('message'),
             status='pending',
+            resource_id=resource_id,
             client_id=client_id,
             requires_verification=requires_verification,
-            verification_completed=not requires_verification
+            verification_completed=not requires_verification,
+            payment_amount=booking_amount
         )
         
         print(f"Creating booking: {data['name']} for {booking_date} at {data['time']}")  # Debug logging
         print(f"Client verification required: {requires_verification}")  # Debug logging
         
         db.session.add(booking)
-        db.session.commit()
-        print(f"Booking saved with ID: {booking.id}")  # Debug logging
+        db.session.flush()
+        # Serialize before committing; reading it afterwards would reload the row
+        response_data = {
+            'message': 'Booking request submitted successfully',
+            'booking': booking.to_dict(),
+            'requires_verification': requires_verification,
+            'client_id': client_id
+        }
         
-        # Update client booking stats if this is a confirmed booking
-        if not requires_verification:
-            # Calculate booking amount (you can customize this logic)
-            booking_amount = 0
-            if data.get('duration'):
-                duration_hours = int(data.get('duration', 0))
-                # Simple pricing logic - you can make this more sophisticated
-                if duration_hours == 4:
-                    booking_amount = 100
-                elif duration_hours == 6:
-                    booking_amount = 130
-                elif duration_hours == 8:
-                    booking_amount = 160
-                elif duration_hours == 12:
-                    booking_amount = 230
-                elif duration_hours == 24:
-                    booking_amount = 400
-            
-            client.update_booking_stats(booking_amount)
-            db.session.commit()
+        if requires_verification:
+            response_data['verification_message'] = 'ID verification required for first-time clients'
         
-        # Verify the booking was saved
-        saved_booking = Booking.query.get(booking.id)
-        if saved_booking:
-            print(f"Booking verified in database: {saved_booking.name}")
-        else:
-            print("ERROR: Booking not found after save!")
+        response = jsonify(response_data)
+        store_idempotent_response(response, 201)
+        db.session.commit()
+        print(f"Booking saved with ID: {response_data['booking']['id']}")  # Debug logging
+        cache_client(client_id, email, data['name'], data.get('phone'), requires_verification)
         
-        # Send email notification
+        # Send email notification off the request path
         booking_data = {
             'name': data['name'],
-            'email': data['email'],
+            'email': email,
             'phone': data.get('phone', ''),
             'date': data['date'],
             'time': data['time'],
@@ -210,19 +150,9 @@ def create_booking():
             'project_type': data.get('project_type', ''),
             'message': data.get('message', '')
         }
-        send_booking_notification(booking_data, "studio-access")
-        
-        response_data = {
-            'message': 'Booking request submitted successfully',
-            'booking': booking.to_dict(),
-            'requires_verification': requires_verification,
-            'client_id': client_id
-        }
+        run_in_background(send_booking_notification, booking_data, "studio-access")
         
-        if requires_verification:
-            response_data['verification_message'] = 'ID verification required for first-time clients'
-        
-        return jsonify(response_data), 201
+        return response, 201
         
     except Exception as e:
         db.session.rollback()
@@ -232,9 +162,10 @@ def create_booking():
 @booking_bp.route('/bookings', methods=['GET'])
 @cross_origin()
 def get_bookings():
+    """All bookings; ?include_archive=true adds bookings moved to the archive"""
     try:
-        bookings = Booking.query.all()
-        return jsonify([booking.to_dict() for booking in bookings])
+        include_archive = request.args.get('include_archive', '').lower() in ('1', 'true', 'yes')
+        return jsonify(booking_history(include_archive=include_archive))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -258,62 +189,206 @@ def update_booking_status(booking_id):
 @booking_bp.route('/availability', methods=['GET'])
 @cross_origin()
 def get_availability():
+    """Unavailable time slots per date.
+
+    ?resource=<id|slug> selects a room (default: main studio); ?resource=any
+    only reports slots where every active resource is taken.
+
+    ?format=bitmask (or Accept: application/vnd.wavehouse.availability+json)
+    returns each day as a base64 bitset over the slot grid instead of a list
+    of formatted times; frontend/src/lib/availability.js decodes it.
+    """
     try:
-        # Get all confirmed bookings
-        bookings = Booking.query.filter_by(status='confirmed').all()
-        print(f"Found {len(bookings)} confirmed bookings")  # Debug logging
-        for booking in bookings:
-            print(f"  - {booking.name}: {booking.date} at {booking.time} for {booking.duration} hours")
+        resource_param = request.args.get('resource')
+        if resource_param == 'any':
+            resource_ids = get_active_resource_ids()
+        else:
+            resource_id = resolve_resource_id(resource_param, active_only=True)
+            if not resource_id:
+                return unbookable_resource_response(resource_param)
+            resource_ids = [resource_id]
         
-        # Get all blocked slots
-        blocked_slots = BlockedSlot.query.all()
-        print(f"Found {len(blocked_slots)} blocked slots")  # Debug logging
+        compact = (request.args.get('format') == 'bitmask'
+                   or request.accept_mimetypes.best == AVAILABILITY_BITMASK_MIMETYPE)
         
-        unavailable = {}
+        def build():
+            occupancy = load_occupancy(resource_ids=resource_ids)
+            
+            masks = {}
+            for day in occupancy.dates():
+                if len(resource_ids) == 1:
+                    mask = occupancy.occupied_mask(day, resource_ids[0])
+                else:
+                    mask = occupancy.all_occupied_mask(day, resource_ids)
+                if mask:
+                    masks[day.isoformat()] = mask
+            
+            if compact:
+                body = {
+                    'format': 'bitmask',
+                    'slot_minutes': SLOT_MINUTES,
+                    'days': {day: mask_to_base64(mask) for day, mask in masks.items()}
+                }
+            else:
+                body = {day: mask_to_times(mask) for day, mask in masks.items()}
+            return current_app.json.dumps(body).encode()
         
-        # Add manually blocked slots
-        for blocked in blocked_slots:
-            date_str = blocked.date.isoformat()
-            if date_str not in unavailable:
-                unavailable[date_str] = []
-            unavailable[date_str].append(blocked.time)
+        # Every visitor's calendar fetches this; serve a shared snapshot that is
+        # rebuilt (and compressed) once per change instead of per request
+        snapshot = get_snapshot(('availability', tuple(resource_ids), compact), build)
+        response = snapshot_response(snapshot)
+        response.vary.add('Accept')
+        return response
         
-        # Add booking conflicts based on duration
-        for booking in bookings:
-            if booking.duration and booking.duration != '':
+    except Exception as e:
+        print(f"Error in get_availability: {str(e)}")  # Debug logging
+        return jsonify({'error': str(e)}), 500
+
+@booking_bp.route('/availability/config', methods=['GET'])
+@cross_origin()
+def get_availability_config():
+    """Slot grid and turnover settings the calendar needs to lay out times"""
+    return jsonify({
+        'slot_minutes': SLOT_MINUTES,
+        'turnover_minutes': TURNOVER_MINUTES
+    })
+
+def streaming_supported():
+    """Whether this worker can serve availability streams (see gunicorn.conf.py).
+
+    Long-lived responses are only cheap under gevent, and a stream only sees
+    every write when the broker is shared across workers (Redis) or there is
+    a single worker.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    if not monkey.is_module_patched('socket'):
+        return False
+    return get_broker().shared or os.environ.get('WEB_CONCURRENCY') == '1'
+
+@booking_bp.route('/availability/stream', methods=['GET'])
+@cross_origin()
+def stream_availability():
+    """Server-Sent Events feed of availability changes.
+
+    Each 'availability' event carries {slot_minutes, days: {date: base64}} for
+    the dates a commit touched, in the ?format=bitmask encoding (an all-zero
+    bitset means the day is free again). A 'reset' event means the change
+    could not be narrowed to dates and /api/availability should be refetched.
+    Takes the same ?resource= as /api/availability.
+    
+    A stream occupies its worker for its whole life, so it is only served
+    by gevent workers, and it must see writes made by every worker, so
+    several workers need AVAILABILITY_BROKER_URL (see streaming_supported).
+    Elsewhere, or once this worker has AVAILABILITY_STREAM_MAX_SUBSCRIBERS
+    streams, the response is 204 or 503, which stops EventSource
+    reconnecting; the calendar polls instead.
+    """
+    if not streaming_supported():
+        return '', 204
+    
+    resource_param = request.args.get('resource')
+    if resource_param == 'any':
+        resource_ids = get_active_resource_ids()
+    else:
+        resource_id = resolve_resource_id(resource_param, active_only=True)
+        if not resource_id:
+            return unbookable_resource_response(resource_param)
+        resource_ids = [resource_id]
+    # Don't hold a pooled connection for the life of the stream
+    db.session.remove()
+    
+    broker = get_broker()
+    subscriber = broker.subscribe(limit=AVAILABILITY_STREAM_MAX_SUBSCRIBERS)
+    if subscriber is None:
+        response = jsonify({'error': 'Too many availability streams, poll /api/availability instead'})
+        response.headers['Retry-After'] = str(AVAILABILITY_STREAM_SECONDS)
+        return response, 503
+    
+    def changed_days(message):
+        dates = [datetime.strptime(day, '%Y-%m-%d').date() for day in message.get('dates', [])]
+        if not dates:
+            return None
+        
+        def build():
+            occupancy = load_occupancy(min(dates), max(dates), resource_ids=resource_ids)
+            days = {}
+            for day in dates:
+                if len(resource_ids) == 1:
+                    mask = occupancy.occupied_mask(day, resource_ids[0])
+                else:
+                    mask = occupancy.all_occupied_mask(day, resource_ids)
+                days[day.isoformat()] = mask_to_base64(mask)
+            return current_app.json.dumps({'slot_minutes': SLOT_MINUTES, 'days': days}).encode()
+        
+        # Every subscriber gets the same delta; compute it once per change
+        try:
+            return get_snapshot(('availability-delta', tuple(resource_ids), tuple(message['dates'])), build).body.decode()
+        finally:
+            db.session.remove()
+    
+    def events():
+        deadline = time.monotonic() + AVAILABILITY_STREAM_SECONDS
+        try:
+            yield f"retry: {AVAILABILITY_STREAM_RETRY_MS}\n\n"
+            while time.monotonic() < deadline:
                 try:
-                    # Ensure duration is converted to integer
-                    duration_int = int(booking.duration)
-                    if duration_int > 0:
-                        # Get all time slots occupied by this booking
-                        occupied_slots = get_time_range(booking.time, duration_int)
-                        print(f"Booking {booking.name} occupies slots: {occupied_slots}")  # Debug logging
-                        date_str = booking.date.isoformat()
-                        
-                        if date_str not in unavailable:
-                            unavailable[date_str] = []
-                        
-                        # Add all occupied slots to unavailable
-                        for slot in occupied_slots:
-                            if slot not in unavailable[date_str]:
-                                unavailable[date_str].append(slot)
-                except (ValueError, TypeError):
-                    # Skip bookings with invalid duration
-                    print(f"Skipping booking {booking.name} - invalid duration: {booking.duration}")
+                    message = subscriber.get(timeout=AVAILABILITY_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
                     continue
-            else:
-                # Single time slot booking
-                date_str = booking.date.isoformat()
-                if date_str not in unavailable:
-                    unavailable[date_str] = []
-                if booking.time not in unavailable[date_str]:
-                    unavailable[date_str].append(booking.time)
-        
-        print(f"Final unavailable slots: {unavailable}")  # Debug logging
-        return jsonify(unavailable)
+                
+                if message.get('type') == 'reset':
+                    yield "event: reset\ndata: {}\n\n"
+                    continue
+                data = changed_days(message)
+                if data:
+                    yield f"event: availability\ndata: {data}\n\n"
+        finally:
+            broker.unsubscribe(subscriber)
+    
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # don't let proxies buffer events
+    return response
+
+@booking_bp.route('/availability/next', methods=['GET'])
+@cross_origin()
+def get_next_available():
+    """First start times with a free stretch of ?duration=N hours on or after ?after=YYYY-MM-DD"""
+    try:
+        duration_hours = float(request.args.get('duration', 4))
+        service_type = request.args.get('service', 'studio-access')
+        after = request.args.get('after')
+        start_date = datetime.strptime(after, '%Y-%m-%d').date() if after else date.today()
+        limit = min(int(request.args.get('limit', 5)), 50)
+        days = min(int(request.args.get('days', 60)), 366)
+        if duration_hours <= 0 or limit <= 0 or days <= 0:
+            return jsonify({'error': 'duration, limit and days must be positive'}), 400
+        
+        resource_param = request.args.get('resource')
+        if resource_param == 'any':
+            resource_ids = get_active_resource_ids()
+        else:
+            resource_id = resolve_resource_id(resource_param, active_only=True)
+            if not resource_id:
+                return unbookable_resource_response(resource_param)
+            resource_ids = [resource_id]
         
+        slots = find_next_available(start_date, days, duration_to_minutes(duration_hours), resource_ids, limit, service_type)
+        return jsonify({
+            'duration': duration_hours,
+            'slot_minutes': SLOT_MINUTES,
+            'after': start_date.isoformat(),
+            'days_searched': days,
+            'slots': slots
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        print(f"Error in get_availability: {str(e)}")  # Debug logging
+        print(f"Error in get_next_available: {str(e)}")  # Debug logging
         return jsonify({'error': str(e)}), 500
 
 @booking_bp.route('/blocked-slots', methods=['POST'])
@@ -325,10 +400,19 @@ def create_blocked_slot():
         # Parse the date string
         block_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
         
+        # No resource blocks every room (e.g. holidays)
+        resource_id = None
+        if data.get('resource_id') or data.get('resource'):
+            resource_id = resolve_resource_id(data.get('resource_id') or data.get('resource'))
+            if not resource_id:
+                return jsonify({'error': 'Unknown studio resource'}), 400
+        
         blocked_slot = BlockedSlot(
             date=block_date,
             time=data['time'],
-            reason=data.get('reason', 'Blocked by admin')
+            duration_minutes=SLOT_MINUTES,
+            reason=data.get('reason', 'Blocked by admin'),
+            resource_id=resource_id
         )
         
         db.session.add(blocked_slot)
@@ -348,40 +432,12 @@ def create_blocked_slot():
 def get_blocked_slots():
     """Get all blocked slots for frontend calendar integration"""
     try:
-        # Simple approach - just return the blocked slots in the expected format
-        from flask import jsonify
-        
-        blocked_slots = BlockedSlot.query.all()
         blocked_data = {}
-        
-        for slot in blocked_slots:
-            # Convert date to string
-            if hasattr(slot.date, 'strftime'):
-                date_str = slot.date.strftime('%Y-%m-%d')
-            else:
-                date_str = str(slot.date)
-            
-            # Convert time to 12-hour format
-            if hasattr(slot.time, 'strftime'):
-                time_str = slot.time.strftime('%I:%M %p').lstrip('0')
-            else:
-                # Handle time as string
-                time_str = str(slot.time)
-                if ':' in time_str:
-                    hour, minute = time_str.split(':')
-                    hour = int(hour)
-                    if hour == 0:
-                        time_str = f"12:{minute} AM"
-                    elif hour < 12:
-                        time_str = f"{hour}:{minute} AM"
-                    elif hour == 12:
-                        time_str = f"12:{minute} PM"
-                    else:
-                        time_str = f"{hour-12}:{minute} PM"
-            
-            if date_str not in blocked_data:
-                blocked_data[date_str] = []
-            blocked_data[date_str].append(time_str)
+        # Times are stored both as "10:00 PM" and "22:00"; normalize to 12-hour
+        for slot_date, start_minute in db.session.query(BlockedSlot.date, BlockedSlot.start_minute).order_by(
+            BlockedSlot.date, BlockedSlot.start_minute
+        ):
+            blocked_data.setdefault(slot_date.strftime('%Y-%m-%d'), []).append(minutes_to_time(start_minute or 0))
         
         return jsonify(blocked_data)
         
@@ -391,11 +447,12 @@ def get_blocked_slots():
 
 @booking_bp.route('/blocked-slots/<int:slot_id>', methods=['DELETE'])
 @cross_origin()
-def delete_blocked_slot(slot_id):
+def remove_blocked_slot(slot_id):
     try:
-        blocked_slot = BlockedSlot.query.get_or_404(slot_id)
-        db.session.delete(blocked_slot)
+        deleted_count = BlockedSlot.query.filter_by(id=slot_id).delete(synchronize_session=False)
         db.session.commit()
+        if not deleted_count:
+            return jsonify({'error': 'Blocked slot not found'}), 404
         
         return jsonify({'message': 'Blocked slot removed successfully'})
         
@@ -406,9 +463,12 @@ def delete_blocked_slot(slot_id):
 
 @booking_bp.route('/engineer-request', methods=['POST'])
 @cross_origin()
+@rate_limit('engineer-request', per_ip='10/hour', per_email='3/hour')
+@idempotent
 def create_engineer_request():
     try:
         data = request.get_json()
+        email = normalize_email(data['email'])
         
         # Create a special booking entry for engineer requests
         engineer_request = Booking(
@@ -417,7 +477,7 @@ def create_engineer_request():
             time='00:00 AM',    # Use placeholder time
             duration=None,
             name=data['name'],
-            email=data['email'],
+            email=email,
             phone=data.get('phone'),
             project_type='engineer-request',
             message=data['message'],
@@ -427,14 +487,14 @@ def create_engineer_request():
         db.session.add(engineer_request)
         db.session.commit()
         
-        # Send email notification
+        # Send email notification off the request path
         request_data = {
             'name': data['name'],
-            'email': data['email'],
+            'email': email,
             'phone': data.get('phone', ''),
             'message': data['message']
         }
-        send_booking_notification(request_data, "engineer-request")
+        run_in_background(send_booking_notification, request_data, "engineer-request")
         
         return jsonify({
             'message': 'Engineer request submitted successfully',
@@ -447,9 +507,12 @@ def create_engineer_request():
 
 @booking_bp.route('/mixing-request', methods=['POST'])
 @cross_origin()
+@rate_limit('mixing-request', per_ip='10/hour', per_email='3/hour')
+@idempotent
 def create_mixing_request():
     try:
         data = request.get_json()
+        email = normalize_email(data['email'])
         
         # Create a special booking entry for mixing requests
         mixing_request = Booking(
@@ -458,7 +521,7 @@ def create_mixing_request():
             time='00:00 AM',    # Use placeholder time
             duration=None,
             name=data['name'],
-            email=data['email'],
+            email=email,
             phone=data.get('phone'),
             project_type='mixing-request',
             message=data['message'],
@@ -468,14 +531,14 @@ def create_mixing_request():
         db.session.add(mixing_request)
         db.session.commit()
         
-        # Send email notification
+        # Send email notification off the request path
         request_data = {
             'name': data['name'],
-            'email': data['email'],
+            'email': email,
             'phone': data.get('phone', ''),
             'message': data['message']
         }
-        send_booking_notification(request_data, "mixing")
+        run_in_background(send_booking_notification, request_data, "mixing")
         
         return jsonify({
             'message': 'Mixing request submitted successfully',
@@ -515,90 +578,7 @@ def wave_admin_dashboard():
 
 def render_admin_login(error=None):
     """Render admin login page"""
-    error_msg = f'<div style="color: red; margin-bottom: 10px;">{error}</div>' if error else ''
-    
-    login_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Wave House Admin - Login</title>
-        <style>
-            body {{ 
-                font-family: Arial, sans-serif; 
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                margin: 0; 
-                padding: 0; 
-                display: flex; 
-                justify-content: center; 
-                align-items: center; 
-                min-height: 100vh;
-            }}
-            .login-container {{
-                background: rgba(255, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
-                border-radius: 15px;
-                padding: 40px;
-                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                text-align: center;
-                min-width: 300px;
-            }}
-            .logo {{
-                color: #00d4ff;
-                font-size: 24px;
-                font-weight: bold;
-                margin-bottom: 10px;
-            }}
-            .subtitle {{
-                color: #ffffff;
-                margin-bottom: 30px;
-                opacity: 0.8;
-            }}
-            input[type="password"] {{
-                width: 100%;
-                padding: 12px;
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                border-radius: 8px;
-                background: rgba(255, 255, 255, 0.1);
-                color: white;
-                font-size: 16px;
-                margin-bottom: 20px;
-                box-sizing: border-box;
-            }}
-            input[type="password"]::placeholder {{
-                color: rgba(255, 255, 255, 0.7);
-            }}
-            button {{
-                width: 100%;
-                padding: 12px;
-                background: #00d4ff;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-size: 16px;
-                font-weight: bold;
-                cursor: pointer;
-                transition: background 0.3s;
-            }}
-            button:hover {{
-                background: #00b8e6;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="login-container">
-            <div class="logo">🎵 Wave House</div>
-            <div class="subtitle">Admin Dashboard</div>
-            {error_msg}
-            <form method="post">
-                <input type="password" name="password" placeholder="Enter admin password" required>
-                <button type="submit">Access Dashboard</button>
-            </form>
-        </div>
-    </body>
-    </html>
-    """
-    return login_html
+    return render_template('wave_admin/login.html', error=error)
 
 def wave_admin_dashboard_view():
     """Render the main admin dashboard"""
@@ -608,117 +588,11 @@ def wave_admin_dashboard_view():
     confirmed_bookings = Booking.query.filter_by(status='confirmed').count()
     blocked_slots = BlockedSlot.query.count()
     
-    dashboard_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Wave House Admin Dashboard</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                min-height: 100vh;
-                color: white;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            .header h1 {{
-                color: #00d4ff;
-                font-size: 32px;
-                margin: 0;
-            }}
-            .stats-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                gap: 20px;
-                margin-bottom: 30px;
-            }}
-            .stat-card {{
-                background: rgba(255, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
-                border-radius: 15px;
-                padding: 20px;
-                text-align: center;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-            }}
-            .stat-number {{
-                font-size: 36px;
-                font-weight: bold;
-                color: #00d4ff;
-                margin-bottom: 5px;
-            }}
-            .stat-label {{
-                font-size: 14px;
-                opacity: 0.8;
-            }}
-            .actions {{
-                display: flex;
-                gap: 15px;
-                justify-content: center;
-                flex-wrap: wrap;
-            }}
-            .action-btn {{
-                background: #00d4ff;
-                color: white;
-                padding: 12px 24px;
-                border: none;
-                border-radius: 8px;
-                font-size: 16px;
-                font-weight: bold;
-                cursor: pointer;
-                text-decoration: none;
-                display: inline-block;
-                transition: background 0.3s;
-            }}
-            .action-btn:hover {{
-                background: #00b8e6;
-            }}
-            .action-btn.secondary {{
-                background: rgba(255, 255, 255, 0.2);
-            }}
-            .action-btn.secondary:hover {{
-                background: rgba(255, 255, 255, 0.3);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>Wave House Admin Dashboard</h1>
-        </div>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-number">{total_bookings}</div>
-                <div class="stat-label">Total Bookings</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{pending_bookings}</div>
-                <div class="stat-label">Pending</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{confirmed_bookings}</div>
-                <div class="stat-label">Confirmed</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-number">{blocked_slots}</div>
-                <div class="stat-label">Blocked Slots</div>
-            </div>
-        </div>
-        
-        <div class="actions">
-            <a href="/api/wave-admin/bookings" class="action-btn">Booking Requests</a>
-            <a href="/api/wave-admin/bulk-block" class="action-btn">Bulk Block Times</a>
-            <a href="/api/wave-admin/manage-blocks" class="action-btn">Manage Blocked Slots</a>
-            <a href="/api/wave-admin/logout" class="action-btn secondary">Logout</a>
-        </div>
-    </body>
-    </html>
-    """
-    return dashboard_html
+    return render_template('wave_admin/dashboard.html',
+                           total_bookings=total_bookings,
+                           pending_bookings=pending_bookings,
+                           confirmed_bookings=confirmed_bookings,
+                           blocked_slots=blocked_slots)
 
 @booking_bp.route('/wave-admin/logout')
 def wave_admin_logout():
@@ -734,267 +608,84 @@ def wave_admin_manage_blocks():
     if not session.get('wave_admin_authenticated'):
         return redirect('/api/wave-admin')
     
-    # Get all blocked slots grouped by date
-    blocked_slots = BlockedSlot.query.order_by(BlockedSlot.date, BlockedSlot.time).all()
+    try:
+        window_start, window_end, days = get_block_window_args()
+    except ValueError:
+        return redirect('/api/wave-admin/manage-blocks')
     
-    # Group by date
-    slots_by_date = {}
-    for slot in blocked_slots:
-        date_str = slot.date.strftime('%Y-%m-%d')
-        if date_str not in slots_by_date:
-            slots_by_date[date_str] = []
-        slots_by_date[date_str].append(slot)
+    # Contiguous slots are collapsed into ranges in SQL, one window of dates at a time
+    dates = get_blocked_ranges(window_start, window_end)
+    for day in dates:
+        day['formatted_date'] = datetime.strptime(day['date'], '%Y-%m-%d').strftime('%B %d, %Y')
+    prev_start, next_start = get_block_window_cursors(window_start, window_end, days)
     
-    # Generate HTML for blocked slots
-    slots_html = ""
-    for date_str, slots in sorted(slots_by_date.items()):
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        formatted_date = date_obj.strftime('%B %d, %Y')
-        
-        slots_html += f"""
-        <div class="date-group">
-            <h3>{formatted_date} ({len(slots)} slots)</h3>
-            <div class="date-actions">
-                <button onclick="deleteAllForDate('{date_str}')" class="btn-danger">Delete All for This Date</button>
-            </div>
-            <div class="slots-grid">
-        """
-        
-        for slot in slots:
-            time_str = slot.time.strftime('%I:%M %p')
-            slots_html += f"""
-                <div class="slot-item" data-id="{slot.id}">
-                    <span class="slot-time">{time_str}</span>
-                    <span class="slot-reason">{slot.reason or 'No reason'}</span>
-                    <button onclick="deleteSlot({slot.id})" class="btn-delete">×</button>
-                </div>
-            """
-        
-        slots_html += """
-            </div>
-        </div>
-        """
+    return render_template(
+        'wave_admin/manage_blocks.html',
+        dates=dates,
+        window_start=window_start,
+        window_end=window_end,
+        days=days,
+        prev_start=prev_start,
+        next_start=next_start
+    )
+
+@booking_bp.route('/wave-admin/blocked-ranges', methods=['GET'])
+def get_blocked_ranges_window():
+    """Blocked slots collapsed into contiguous ranges for one window of dates"""
+    if not session.get('wave_admin_authenticated'):
+        return jsonify({'error': 'Unauthorized'}), 401
     
-    if not slots_html:
-        slots_html = "<p>No blocked slots found.</p>"
+    try:
+        window_start, window_end, days = get_block_window_args()
+    except ValueError:
+        return jsonify({'error': 'Invalid start date format. Use YYYY-MM-DD'}), 400
+    
+    resource_id = None
+    if request.args.get('resource'):
+        resource_id = resolve_resource_id(request.args.get('resource'))
+        if resource_id is None:
+            return jsonify({'error': 'Unknown studio resource'}), 400
     
-    manage_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Manage Blocked Slots - Wave House Admin</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
-                min-height: 100vh;
-                color: white;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-            }}
-            .header h1 {{
-                color: #00d4ff;
-                font-size: 28px;
-                margin: 0;
-            }}
-            .back-btn {{
-                background: rgba(255, 255, 255, 0.2);
-                color: white;
-                padding: 8px 16px;
-                border: none;
-                border-radius: 6px;
-                text-decoration: none;
-                display: inline-block;
-                margin-bottom: 20px;
-            }}
-            .date-group {{
-                background: rgba(255, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
-                border-radius: 15px;
-                padding: 20px;
-                margin-bottom: 20px;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-            }}
-            .date-group h3 {{
-                color: #00d4ff;
-                margin-top: 0;
-                margin-bottom: 15px;
-            }}
-            .date-actions {{
-                margin-bottom: 15px;
-            }}
-            .slots-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(200px, 1fr));
-                gap: 10px;
-            }}
-            .slot-item {{
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 8px;
-                padding: 10px;
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-            }}
-            .slot-time {{
-                font-weight: bold;
-                color: #00d4ff;
-            }}
-            .slot-reason {{
-                font-size: 12px;
-                opacity: 0.8;
-                margin-left: 10px;
-                flex-grow: 1;
-            }}
-            .btn-delete {{
-                background: #ff4757;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                width: 24px;
-                height: 24px;
-                cursor: pointer;
-                font-size: 16px;
-                line-height: 1;
-            }}
-            .btn-danger {{
-                background: #ff4757;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                cursor: pointer;
-                font-size: 14px;
-            }}
-            .btn-danger:hover {{
-                background: #ff3742;
-            }}
-            .success-msg {{
-                background: #2ed573;
-                color: white;
-                padding: 10px;
-                border-radius: 6px;
-                margin-bottom: 20px;
-                display: none;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <a href="/api/wave-admin" class="back-btn">← Back to Dashboard</a>
-            <h1>Manage Blocked Slots</h1>
-        </div>
-        
-        <div id="success-msg" class="success-msg"></div>
-        
-        <div id="blocked-slots">
-            {slots_html}
-        </div>
-        
-        <script>
-            function deleteSlot(slotId) {{
-                if (confirm('Are you sure you want to delete this blocked slot?')) {{
-                    fetch('/api/delete-blocked-slot', {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/json',
-                        }},
-                        body: JSON.stringify({{ slot_id: slotId }})
-                    }})
-                    .then(response => response.json())
-                    .then(data => {{
-                        if (data.success) {{
-                            document.querySelector(`[data-id="${{slotId}}"]`).remove();
-                            showSuccess('Blocked slot deleted successfully');
-                        }} else {{
-                            alert('Error deleting slot: ' + data.error);
-                        }}
-                    }})
-                    .catch(error => {{
-                        alert('Error deleting slot: ' + error);
-                    }});
-                }}
-            }}
-            
-            function deleteAllForDate(dateStr) {{
-                if (confirm(`Are you sure you want to delete ALL blocked slots for ${{dateStr}}?`)) {{
-                    fetch('/api/delete-blocked-slots-by-date', {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/json',
-                        }},
-                        body: JSON.stringify({{ date: dateStr }})
-                    }})
-                    .then(response => response.json())
-                    .then(data => {{
-                        if (data.success) {{
-                            location.reload();
-                        }} else {{
-                            alert('Error deleting slots: ' + data.error);
-                        }}
-                    }})
-                    .catch(error => {{
-                        alert('Error deleting slots: ' + error);
-                    }});
-                }}
-            }}
-            
-            function showSuccess(message) {{
-                const successMsg = document.getElementById('success-msg');
-                successMsg.textContent = message;
-                successMsg.style.display = 'block';
-                setTimeout(() => {{
-                    successMsg.style.display = 'none';
-                }}, 3000);
-            }}
-        </script>
-    </body>
-    </html>
-    """
-    return manage_html
-
-@booking_bp.route('/delete-blocked-slot', methods=['POST'])
-def delete_blocked_slot():
-    """Delete a single blocked slot"""
     try:
-        data = request.get_json()
-        slot_id = data.get('slot_id')
-        
-        slot = BlockedSlot.query.get(slot_id)
-        if slot:
-            db.session.delete(slot)
-            db.session.commit()
-            return jsonify({'success': True})
-        else:
-            return jsonify({'success': False, 'error': 'Slot not found'})
+        prev_start, next_start = get_block_window_cursors(window_start, window_end, days)
+        return jsonify({
+            'start': window_start.isoformat(),
+            'end': window_end.isoformat(),
+            'days': days,
+            'prev_start': prev_start,
+            'next_start': next_start,
+            'dates': get_blocked_ranges(window_start, window_end, resource_id)
+        })
     except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)})
+        return jsonify({'error': str(e)}), 500
 
-@booking_bp.route('/delete-blocked-slots-by-date', methods=['POST'])
-def delete_blocked_slots_by_date():
-    """Delete all blocked slots for a specific date"""
+@booking_bp.route('/wave-admin/blocked-ranges/delete', methods=['POST'])
+def delete_blocked_range_window():
+    """Delete every blocked slot in one collapsed range"""
+    if not session.get('wave_admin_authenticated'):
+        return jsonify({'error': 'Unauthorized'}), 401
+    
     try:
-        data = request.get_json()
-        date_str = data.get('date')
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        
-        slots = BlockedSlot.query.filter_by(date=date_obj).all()
-        for slot in slots:
-            db.session.delete(slot)
-        
+        data = request.get_json() or {}
+        try:
+            block_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+            start_minute = int(data['start_minute'])
+            end_minute = int(data['end_minute'])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': 'date, start_minute and end_minute are required'}), 400
+        
+        deleted_count = delete_blocked_range(
+            block_date, start_minute, end_minute,
+            resource_id=data.get('resource_id'),
+            reason=data.get('reason'),
+            match_reason='reason' in data
+        )
         db.session.commit()
-        return jsonify({'success': True, 'deleted_count': len(slots)})
+        
+        return jsonify({'success': True, 'deleted_count': deleted_count})
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)})
-
-
+        return jsonify({'error': str(e)}), 500
 
 @booking_bp.route('/admin-stats', methods=['GET'])
 def get_admin_stats():
@@ -1005,12 +696,19 @@ def get_admin_stats():
         confirmed_bookings = Booking.query.filter_by(status='confirmed').count()
         blocked_slots = BlockedSlot.query.count()
         
-        return jsonify({
+        stats = {
             'total': total_bookings,
             'pending': pending_bookings,
             'confirmed': confirmed_bookings,
             'blocked': blocked_slots
-        })
+        }
+        # Revenue is only shown to a signed-in admin
+        if session.get('admin_authenticated'):
+            stats['revenue'] = float(db.session.query(
+                db.func.coalesce(db.func.sum(Booking.payment_amount), 0)
+            ).filter(Booking.status == 'confirmed').scalar())
+        
+        return jsonify(stats)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1019,44 +717,46 @@ def get_admin_stats():
 def delete_blocked_slot():
     """Delete a specific blocked slot"""
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         slot_id = data.get('slot_id')
         
         if not slot_id:
-            return jsonify({'error': 'Slot ID is required'}), 400
-        
-        slot = BlockedSlot.query.get(slot_id)
-        if not slot:
-            return jsonify({'error': 'Slot not found'}), 404
+            return jsonify({'success': False, 'error': 'Slot ID is required'}), 400
         
-        db.session.delete(slot)
+        deleted_count = BlockedSlot.query.filter_by(id=slot_id).delete(synchronize_session=False)
         db.session.commit()
+        if not deleted_count:
+            return jsonify({'success': False, 'error': 'Slot not found'}), 404
         
         return jsonify({'success': True, 'message': 'Blocked slot deleted successfully'})
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 @booking_bp.route('/delete-blocked-slots-by-date', methods=['POST'])
 def delete_blocked_slots_by_date():
     """Delete all blocked slots for a specific date"""
     try:
-        data = request.get_json()
-        date = data.get('date')
+        data = request.get_json() or {}
+        date_str = data.get('date')
         
-        if not date:
-            return jsonify({'error': 'Date is required'}), 400
+        if not date_str:
+            return jsonify({'success': False, 'error': 'Date is required'}), 400
+        try:
+            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
         
         # Delete all slots for the specified date
-        deleted_count = BlockedSlot.query.filter_by(date=date).delete()
+        deleted_count = BlockedSlot.query.filter_by(date=date_obj).delete(synchronize_session=False)
         db.session.commit()
         
         return jsonify({
             'success': True, 
-            'message': f'Deleted {deleted_count} blocked slots for {date}',
+            'message': f'Deleted {deleted_count} blocked slots for {date_str}',
             'deleted_count': deleted_count
         })
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -0,0 +1,96 @@
+import mimetypes
+import os
+from functools import lru_cache
+from flask import Blueprint, Response, abort, jsonify, request, send_file, send_from_directory
+from werkzeug.security import safe_join
+from src.routes.assets import IMMUTABLE_MAX_AGE
+from src.utils.compression import choose_encoding, compress, set_encoded_body, COMPRESSION_MIN_BYTES
+
+# Vite production build (frontend/vite.config.js sets build.outDir to match)
+FRONTEND_BUILD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'frontend', 'build')
+
+# Vite puts content-hashed files here; everything else in the build keeps its name
+HASHED_ASSETS_DIR = 'assets'
+
+# Unhashed files (favicon, robots.txt) may change on deploy
+PUBLIC_FILE_MAX_AGE = 60 * 60
+
+# Precompressed copies written next to each file by src/utils/precompress.py
+SIDECAR_EXTENSIONS = {'br': '.br', 'gzip': '.gz'}
+
+frontend_bp = Blueprint('frontend', __name__)
+
+def build_path(filename):
+    """Absolute path of a file inside the build, or None if the name escapes it or isn't a file"""
+    path = safe_join(FRONTEND_BUILD_DIR, filename)
+    return path if path and os.path.isfile(path) else None
+
+# Only called for files that exist in the build, but bounded all the same
+@lru_cache(maxsize=1024)
+def sidecar_encodings(path):
+    """Encodings with a precompressed sidecar for a build file (the build never changes at runtime)"""
+    return frozenset(encoding for encoding, ext in SIDECAR_EXTENSIONS.items() if os.path.isfile(path + ext))
+
+@lru_cache(maxsize=1)
+def load_index():
+    """index.html and its compressed variants, read once per process"""
+    with open(os.path.join(FRONTEND_BUILD_DIR, 'index.html'), 'rb') as f:
+        body = f.read()
+    return body, {}
+
+def index_response():
+    """Serve the SPA shell from memory; it must be revalidated so new deploys show up"""
+    try:
+        body, encoded = load_index()
+    except FileNotFoundError:
+        abort(404)
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding')) if len(body) >= COMPRESSION_MIN_BYTES else None
+    if encoding and encoding not in encoded:
+        encoded[encoding] = compress(body, encoding)
+
+    response = set_encoded_body(Response(mimetype='text/html'), encoded[encoding] if encoding else body, encoding)
+    response.cache_control.no_cache = True
+    return response
+
+def send_build_file(filename, max_age, immutable=False):
+    """Send a file from the build, preferring a precompressed sidecar the client accepts"""
+    path = build_path(filename)
+    if path is None:
+        abort(404)
+    encodings = sidecar_encodings(path)
+    encoding = choose_encoding(request.headers.get('Accept-Encoding')) if encodings else None
+
+    if encoding in encodings:
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_file(path + SIDECAR_EXTENSIONS[encoding], mimetype=mimetype, max_age=max_age, conditional=True)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(FRONTEND_BUILD_DIR, filename, max_age=max_age)
+
+    if encodings:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
+@frontend_bp.route('/assets/<path:filename>')
+def hashed_asset(filename):
+    """Fingerprinted Vite output; a miss is a real 404, never index.html"""
+    return send_build_file(f'{HASHED_ASSETS_DIR}/{filename}', IMMUTABLE_MAX_AGE, immutable=True)
+
+@frontend_bp.route('/')
+@frontend_bp.route('/<path:path>')
+def spa(path=''):
+    """Public build files by name, otherwise the React app for client-side routes"""
+    if path.startswith('api/'):
+        return jsonify({'error': 'Not found'}), 404
+
+    if path and build_path(path):
+        return send_build_file(path, PUBLIC_FILE_MAX_AGE)
+
+    # Paths that look like files are missing assets, not router paths
+    if os.path.splitext(path)[1]:
+        abort(404)
+    return index_response()
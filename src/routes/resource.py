@@ -0,0 +1,129 @@
+from flask import Blueprint, request, jsonify, session
+from datetime import datetime, timedelta
+from flask_cors import cross_origin
+from src.models.user import db
+from src.models.resource import Resource
+from src.utils.occupancy import load_occupancy, booking_day_masks, get_active_resource_ids
+
+resource_bp = Blueprint('resource', __name__)
+
+@resource_bp.route('/resources', methods=['GET'])
+@cross_origin()
+def get_resources():
+    """List bookable rooms and booths"""
+    try:
+        resources = Resource.query.filter_by(is_active=True).order_by(Resource.sort_order, Resource.id).all()
+        return jsonify([resource.to_dict() for resource in resources])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@resource_bp.route('/resources/free', methods=['GET'])
+@cross_origin()
+def get_free_resources():
+    """Which resources are free for a whole window (?date=&time=&duration=)"""
+    try:
+        booking_date = datetime.strptime(request.args['date'], '%Y-%m-%d').date()
+        next_date = booking_date + timedelta(days=1)
+        window_mask, spill_mask = booking_day_masks(
+            request.args['time'], request.args.get('duration'), request.args.get('service', 'studio-access')
+        )
+        
+        resource_ids = get_active_resource_ids()
+        occupancy = load_occupancy(booking_date, next_date, resource_ids=resource_ids)
+        free_ids = occupancy.free_resources(booking_date, resource_ids, window_mask)
+        if spill_mask:
+            free_ids = occupancy.free_resources(next_date, free_ids, spill_mask)
+        
+        resources = Resource.query.filter(Resource.id.in_(free_ids)).order_by(Resource.sort_order, Resource.id).all() if free_ids else []
+        return jsonify({
+            'date': booking_date.isoformat(),
+            'time': request.args['time'],
+            'duration': request.args.get('duration'),
+            'any_free': bool(free_ids),
+            'resources': [resource.to_dict() for resource in resources]
+        })
+    except (KeyError, ValueError) as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+RESOURCE_KINDS = ('room', 'booth')
+
+def resource_fields(data, creating):
+    """Validated Resource column values from a request body, or (None, error message).
+
+    Creating requires a slug and name; updates may change the name but never
+    the slug, which other records and URLs refer to.
+    """
+    if not isinstance(data, dict):
+        return None, 'A JSON object body is required'
+    
+    fields = {}
+    for field, max_length in ((('slug', 50), ('name', 100)) if creating else (('name', 100),)):
+        if field not in data and not creating:
+            continue
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            return None, f'{field} is required'
+        if len(value.strip()) > max_length:
+            return None, f'{field} must be at most {max_length} characters'
+        fields[field] = value.strip()
+    
+    if 'kind' in data:
+        if data['kind'] not in RESOURCE_KINDS:
+            return None, f"kind must be one of: {', '.join(RESOURCE_KINDS)}"
+        fields['kind'] = data['kind']
+    if 'is_active' in data:
+        if not isinstance(data['is_active'], bool):
+            return None, 'is_active must be true or false'
+        fields['is_active'] = data['is_active']
+    if 'sort_order' in data:
+        if isinstance(data['sort_order'], bool) or not isinstance(data['sort_order'], int):
+            return None, 'sort_order must be an integer'
+        fields['sort_order'] = data['sort_order']
+    return fields, None
+
+@resource_bp.route('/admin/resources', methods=['POST'])
+@cross_origin()
+def create_resource():
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        fields, error = resource_fields(request.get_json(silent=True), creating=True)
+        if error:
+            return jsonify({'error': error}), 400
+        if Resource.query.filter_by(slug=fields['slug']).first():
+            return jsonify({'error': f"A resource with slug '{fields['slug']}' already exists"}), 409
+        
+        resource = Resource(**fields)
+        db.session.add(resource)
+        db.session.commit()
+        return jsonify({'message': 'Resource created successfully', 'resource': resource.to_dict()}), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@resource_bp.route('/admin/resources/<int:resource_id>', methods=['PUT'])
+@cross_origin()
+def update_resource(resource_id):
+    if not session.get('admin_authenticated'):
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        fields, error = resource_fields(request.get_json(silent=True), creating=False)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        resource = db.session.get(Resource, resource_id)
+        if not resource:
+            return jsonify({'error': 'Resource not found'}), 404
+        
+        for field, value in fields.items():
+            setattr(resource, field, value)
+        
+        db.session.commit()
+        return jsonify({'message': 'Resource updated successfully', 'resource': resource.to_dict()})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,216 @@
+"""Periodic maintenance jobs, run off the request path.
+
+    python -m src.scheduler              # run forever (the Procfile's clock process)
+    python -m src.scheduler --list       # show jobs, schedules and metrics
+    python -m src.scheduler --run NAME   # run one job now
+
+Schedules are five-field cron expressions in UTC. Override one with
+SCHEDULE_<JOB NAME> (e.g. SCHEDULE_REFRESH_ROLLUPS="*/30 * * * *"), or set it
+to "off" to disable the job. Several schedulers may run at once: each due run
+is claimed with a conditional UPDATE on its ScheduledJob row, so exactly one
+of them runs it. Jobs run one after another; a tick that starts late (after
+a long job) catches up on every minute since the previous tick, running each
+job that fell due once and logging the runs it folded together. Durations and outcomes are recorded on the same row and
+served at /api/admin/jobs.
+"""
+import argparse
+import json
+import os
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+from src.models.user import db
+from src.models.job import ScheduledJob
+from src.utils.cron import CronSchedule
+from src.utils.archive import archive_old_records
+from src.utils.clients import reconcile_client_stats
+from src.utils.expiry import expire_pending_bookings
+from src.utils.idempotency import prune_idempotency_keys
+from src.utils.rollups import refresh_rollups
+
+# A claimed run that hasn't finished after this long is presumed dead and
+# its lock lapses
+DEFAULT_LOCK_SECONDS = 15 * 60
+
+# How far back a late tick looks for runs it missed
+CATCH_UP_MINUTES = int(os.environ.get('SCHEDULER_CATCH_UP_MINUTES', 24 * 60))
+
+RUNNER_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+class Job:
+    def __init__(self, name, schedule, func, lock_seconds=DEFAULT_LOCK_SECONDS):
+        self.name = name
+        expression = os.environ.get(f'SCHEDULE_{name.upper()}', schedule)
+        self.schedule = None if expression.lower() == 'off' else CronSchedule(expression)
+        self.func = func
+        self.lock_seconds = lock_seconds
+
+    def is_due(self, moment):
+        return self.schedule is not None and self.schedule.matches(moment)
+
+JOBS = [
+    Job('expire_pending_bookings', '*/10 * * * *', expire_pending_bookings),
+    Job('refresh_rollups', '15 * * * *', refresh_rollups),
+    Job('prune_idempotency_keys', '0 * * * *', prune_idempotency_keys),
+    Job('archive_old_records', '30 3 * * *', archive_old_records, lock_seconds=60 * 60),
+    Job('reconcile_client_stats', '0 4 * * *', reconcile_client_stats),
+]
+
+def get_job(name):
+    for job in JOBS:
+        if job.name == name:
+            return job
+    raise KeyError(f"Unknown job: {name}")
+
+def ensure_job_rows():
+    """Create the ScheduledJob row each job locks on"""
+    existing = {name for (name,) in db.session.query(ScheduledJob.name)}
+    for job in JOBS:
+        if job.name not in existing:
+            db.session.add(ScheduledJob(name=job.name))
+    try:
+        db.session.commit()
+    except Exception:
+        # Another scheduler created them first
+        db.session.rollback()
+
+def claim(job, due):
+    """Take the job's lock for the run due at ``due``; False if another runner has it"""
+    now = datetime.utcnow()
+    claimed = ScheduledJob.query.filter(
+        ScheduledJob.name == job.name,
+        db.or_(ScheduledJob.locked_until.is_(None), ScheduledJob.locked_until < now),
+        db.or_(ScheduledJob.last_scheduled_for.is_(None), ScheduledJob.last_scheduled_for < due)
+    ).update({
+        ScheduledJob.locked_by: RUNNER_ID,
+        ScheduledJob.locked_until: now + timedelta(seconds=job.lock_seconds),
+        ScheduledJob.last_scheduled_for: due,
+        ScheduledJob.last_started_at: now
+    }, synchronize_session=False)
+    db.session.commit()
+    return claimed == 1
+
+def record_run(job, started, error=None, result=None):
+    """Release the lock and fold this run's duration and outcome into the job's metrics"""
+    duration_ms = int((time.monotonic() - started) * 1000)
+    ScheduledJob.query.filter_by(name=job.name, locked_by=RUNNER_ID).update({
+        ScheduledJob.locked_by: None,
+        ScheduledJob.locked_until: None,
+        ScheduledJob.last_finished_at: datetime.utcnow(),
+        ScheduledJob.last_status: 'failed' if error else 'succeeded',
+        ScheduledJob.last_error: error,
+        ScheduledJob.last_result: None if result is None else json.dumps(result, default=str),
+        ScheduledJob.last_duration_ms: duration_ms,
+        ScheduledJob.max_duration_ms: db.case(
+            (db.func.coalesce(ScheduledJob.max_duration_ms, 0) < duration_ms, duration_ms),
+            else_=ScheduledJob.max_duration_ms
+        ),
+        ScheduledJob.total_duration_ms: ScheduledJob.total_duration_ms + duration_ms,
+        ScheduledJob.run_count: ScheduledJob.run_count + 1,
+        ScheduledJob.failure_count: ScheduledJob.failure_count + (1 if error else 0)
+    }, synchronize_session=False)
+    db.session.commit()
+    return duration_ms
+
+def run_job(job, due):
+    """Run one due job if this runner wins the claim; returns True if it ran"""
+    if not claim(job, due):
+        return False
+
+    started = time.monotonic()
+    print(f"Job {job.name} started (due {due:%Y-%m-%d %H:%M})")
+    try:
+        result = job.func()
+    except Exception:
+        db.session.rollback()
+        error = traceback.format_exc()
+        duration_ms = record_run(job, started, error=error)
+        print(f"Job {job.name} failed after {duration_ms} ms:\n{error}")
+    else:
+        duration_ms = record_run(job, started, result=result)
+        print(f"Job {job.name} finished in {duration_ms} ms: {result}")
+    return True
+
+def minutes_between(since, moment):
+    """Each minute after the one containing ``since`` up to the one containing ``moment``"""
+    last = moment.replace(second=0, microsecond=0)
+    minute = since.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    minute = max(minute, last - timedelta(minutes=CATCH_UP_MINUTES - 1))
+    while minute <= last:
+        yield minute
+        minute += timedelta(minutes=1)
+
+def run_due_jobs(moment, since=None):
+    """Run every job due in the minute containing ``moment``, or in any minute after ``since``.
+
+    A job due in several of those minutes runs once, for the latest; the
+    runs it stands in for are logged.
+    """
+    minutes = list(minutes_between(since, moment)) if since else [moment.replace(second=0, microsecond=0)]
+    for job in JOBS:
+        due_minutes = [minute for minute in minutes if job.is_due(minute)]
+        if not due_minutes:
+            continue
+        due = due_minutes[-1]
+        if len(due_minutes) > 1:
+            print(f"Job {job.name} missed {len(due_minutes) - 1} run(s) since "
+                  f"{due_minutes[0]:%Y-%m-%d %H:%M}; running once for {due:%H:%M}")
+        try:
+            run_job(job, due)
+        except Exception as e:
+            # Lost the database between claim and record; the lock expires
+            db.session.rollback()
+            print(f"Error running job {job.name}: {e}")
+
+def run_forever(app):
+    """Check schedules at the top of every minute, catching up after a slow tick"""
+    with app.app_context():
+        ensure_job_rows()
+    print(f"Scheduler {RUNNER_ID} running {', '.join(job.name for job in JOBS if job.schedule)}")
+    last_tick = None
+    while True:
+        now = datetime.utcnow()
+        if last_tick and now - last_tick >= timedelta(minutes=2):
+            print(f"Scheduler tick is {int((now - last_tick).total_seconds() // 60) - 1} minute(s) late; catching up")
+        with app.app_context():
+            run_due_jobs(now, since=last_tick)
+            db.session.remove()
+        last_tick = now
+        next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        time.sleep(max((next_minute - datetime.utcnow()).total_seconds(), 0))
+
+def list_jobs():
+    rows = {row.name: row for row in ScheduledJob.query.all()}
+    now = datetime.utcnow()
+    for job in JOBS:
+        row = rows.get(job.name)
+        schedule = job.schedule.expression if job.schedule else 'off'
+        next_run = job.schedule.next_after(now) if job.schedule else None
+        stats = row.to_dict() if row else {}
+        print(f"{job.name:<26} {schedule:<14} next {next_run or '-'}  "
+              f"runs {stats.get('run_count', 0)}  failures {stats.get('failure_count', 0)}  "
+              f"avg {stats.get('avg_duration_ms')} ms  last {stats.get('last_status')}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Run Wave House maintenance jobs')
+    parser.add_argument('--list', action='store_true', help='show jobs and their metrics')
+    parser.add_argument('--run', metavar='NAME', help='run one job now and exit')
+    args = parser.parse_args()
+
+    from src.main import app
+
+    if args.list:
+        with app.app_context():
+            list_jobs()
+    elif args.run:
+        with app.app_context():
+            ensure_job_rows()
+            job = get_job(args.run)
+            if not run_job(job, datetime.utcnow()):
+                print(f"Job {job.name} is already running elsewhere")
+    else:
+        run_forever(app)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,348 @@
+// Tab functionality
+function showTab(tabName) {
+    // Hide all tab contents
+    const tabContents = document.querySelectorAll('.tab-content');
+    tabContents.forEach(content => content.classList.remove('active'));
+
+    // Remove active class from all tabs
+    const tabs = document.querySelectorAll('.tab');
+    tabs.forEach(tab => tab.classList.remove('active'));
+
+    // Show selected tab content
+    document.getElementById(tabName).classList.add('active');
+
+    // Add active class to clicked tab
+    event.target.classList.add('active');
+}
+
+// Generate time slots
+function generateTimeSlots() {
+    const timeSlotsContainer = document.getElementById('time-slots');
+    const times = [];
+
+    // Generate time slots on the configured grid
+    const slotMinutes = parseInt(document.body.dataset.slotMinutes);
+    for (let minutes = 0; minutes < 24 * 60; minutes += slotMinutes) {
+        const hour = Math.floor(minutes / 60);
+        const mins = (minutes % 60).toString().padStart(2, '0');
+        const time12 = hour === 0 ? `12:${mins} AM` : 
+                      hour < 12 ? `${hour}:${mins} AM` : 
+                      hour === 12 ? `12:${mins} PM` : 
+                      `${hour - 12}:${mins} PM`;
+        const time24 = `${hour.toString().padStart(2, '0')}:${mins}`;
+        times.push({ display: time12, value: time24 });
+    }
+
+    times.forEach(time => {
+        const slot = document.createElement('div');
+        slot.className = 'time-slot';
+        slot.textContent = time.display;
+        slot.dataset.time = time.value;
+        slot.onclick = () => toggleTimeSlot(slot);
+        timeSlotsContainer.appendChild(slot);
+    });
+}
+
+function toggleTimeSlot(slot) {
+    slot.classList.toggle('selected');
+}
+
+function selectAllTimes() {
+    const slots = document.querySelectorAll('.time-slot');
+    slots.forEach(slot => slot.classList.add('selected'));
+}
+
+function selectNightHours() {
+    clearTimeSelection();
+    const slots = document.querySelectorAll('.time-slot');
+    slots.forEach(slot => {
+        const hour = parseInt(slot.dataset.time.split(':')[0]);
+        if (hour >= 22 || hour < 6) { // 10PM to 6AM
+            slot.classList.add('selected');
+        }
+    });
+}
+
+function clearTimeSelection() {
+    const slots = document.querySelectorAll('.time-slot');
+    slots.forEach(slot => slot.classList.remove('selected'));
+}
+
+// Form submission
+document.getElementById('bulk-block-form').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const selectedTimes = Array.from(document.querySelectorAll('.time-slot.selected'))
+                              .map(slot => slot.dataset.time);
+    const selectedDays = Array.from(document.querySelectorAll('input[name="days"]:checked'))
+                             .map(input => parseInt(input.value));
+
+    if (selectedTimes.length === 0) {
+        alert('Please select at least one time slot to block.');
+        return;
+    }
+
+    if (selectedDays.length === 0) {
+        alert('Please select at least one day of the week.');
+        return;
+    }
+
+    const data = {
+        start_date: formData.get('start_date'),
+        end_date: formData.get('end_date'),
+        days: selectedDays,
+        times: selectedTimes,
+        reason: formData.get('reason')
+    };
+
+    fetch(`${ADMIN_BASE}/bulk-block`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            alert('Error: ' + data.error);
+        } else {
+            alert(`Successfully blocked ${data.blocked_count} time slots!`);
+            adjustStat('blocked-slots-count', data.blocked_count);
+            loadBlockedSlots(blockedSlotsPage);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error blocking time slots');
+    });
+});
+
+const WEEKDAY_NAMES = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
+
+function bulkUnblock() {
+    const form = document.getElementById('bulk-block-form');
+    const selectedTimes = Array.from(document.querySelectorAll('.time-slot.selected'))
+                              .map(slot => slot.dataset.time);
+    const selectedDays = Array.from(document.querySelectorAll('input[name="days"]:checked'))
+                             .map(input => parseInt(input.value));
+
+    if (!form.start_date.value || !form.end_date.value) {
+        alert('Please choose a start and end date.');
+        return;
+    }
+
+    // Spell out the scope: no days or times selected clears all of them in the range
+    const dayScope = selectedDays.length
+        ? `on ${selectedDays.map(day => WEEKDAY_NAMES[day]).join(', ')}`
+        : 'on EVERY day of the week';
+    const timeScope = selectedTimes.length
+        ? `at ${selectedTimes.join(', ')}`
+        : 'at ALL times (every blocked slot on those days)';
+    const reasonScope = form.reason.value ? ` with reason "${form.reason.value}"` : '';
+    if (!confirm(`Unblock slots from ${form.start_date.value} to ${form.end_date.value} ${dayScope}, ${timeScope}${reasonScope}?`)) {
+        return;
+    }
+
+    const data = {
+        start_date: form.start_date.value,
+        end_date: form.end_date.value,
+        days: selectedDays,
+        all_days: selectedDays.length === 0,
+        times: selectedTimes,
+        all_times: selectedTimes.length === 0,
+        reason: form.reason.value
+    };
+
+    fetch(`${ADMIN_BASE}/bulk-unblock`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            alert('Error: ' + data.error);
+        } else {
+            alert(`Successfully unblocked ${data.unblocked_count} time slots!`);
+            adjustStat('blocked-slots-count', -data.unblocked_count);
+            loadBlockedSlots(1);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error unblocking time slots');
+    });
+}
+
+const ADMIN_BASE = document.body.dataset.adminBase;
+let bookingsPage = 1;
+let blockedSlotsPage = 1;
+let clientSearchTimer = null;
+
+function adjustStat(elementId, delta) {
+    const element = document.getElementById(elementId);
+    element.textContent = parseInt(element.textContent) + delta;
+}
+
+function adjustStatusStats(status, delta) {
+    if (status === 'pending') adjustStat('pending-bookings', delta);
+    if (status === 'confirmed') adjustStat('confirmed-bookings', delta);
+}
+
+function loadFragment(url, containerId) {
+    return fetch(url)
+        .then(response => response.text())
+        .then(html => { document.getElementById(containerId).innerHTML = html; })
+        .catch(error => {
+            console.error('Error:', error);
+            document.getElementById(containerId).textContent = 'Error loading data';
+        });
+}
+
+function loadBookings(page) {
+    bookingsPage = page;
+    const status = document.getElementById('status-filter').value;
+    return loadFragment(`${ADMIN_BASE}/fragments/bookings?page=${page}&status=${status}`, 'bookings-list');
+}
+
+function loadBlockedSlots(page) {
+    blockedSlotsPage = page;
+    return loadFragment(`${ADMIN_BASE}/fragments/blocked-slots?page=${page}`, 'blocked-slots-list');
+}
+
+function loadClients(page) {
+    const params = new URLSearchParams({
+        page: page,
+        q: document.getElementById('client-search').value,
+        verification_status: document.getElementById('client-verification-filter').value,
+        is_flagged: document.getElementById('client-flagged-filter').value,
+        sort: document.getElementById('client-sort').value
+    });
+    // Names sort A-Z; totals sort largest first
+    if (params.get('sort') === 'name') params.set('order', 'asc');
+    return loadFragment(`${ADMIN_BASE}/fragments/clients?${params}`, 'clients-list');
+}
+
+// Wait for a pause in typing before searching
+function searchClients() {
+    clearTimeout(clientSearchTimer);
+    clientSearchTimer = setTimeout(() => loadClients(1), 250);
+}
+
+function updateStatus(bookingId, status) {
+    fetch(`${ADMIN_BASE}/bookings/${bookingId}`, {
+        method: 'PUT',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ status: status })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            alert('Error: ' + data.error);
+        } else {
+            document.getElementById(`booking-${bookingId}`).outerHTML = data.html;
+            adjustStatusStats(data.previous_status, -1);
+            adjustStatusStats(data.booking.status, 1);
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error updating booking');
+    });
+}
+
+function batchUpdateStatus(status) {
+    const ids = Array.from(document.querySelectorAll('.booking-select:checked'))
+                     .map(input => parseInt(input.value));
+
+    if (ids.length === 0) {
+        alert('Please select at least one booking.');
+        return;
+    }
+
+    fetch(`${ADMIN_BASE}/bookings/batch-status`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ids: ids, status: status, skip_invalid: true })
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.error) {
+            alert('Error: ' + data.error);
+            return;
+        }
+        Object.values(data.previous_statuses).forEach(previous => {
+            adjustStatusStats(previous, -1);
+            adjustStatusStats(data.status, 1);
+        });
+        const skipped = Object.entries(data.errors)
+                              .map(([bookingId, reason]) => `#${bookingId}: ${reason}`);
+        if (skipped.length) {
+            alert(`Updated ${data.updated_count} bookings. Skipped:\n` + skipped.join('\n'));
+        }
+        loadBookings(bookingsPage);
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error updating bookings');
+    });
+}
+
+function deleteBooking(bookingId) {
+    if (confirm('Are you sure you want to delete this booking?')) {
+        fetch(`${ADMIN_BASE}/bookings/${bookingId}`, {
+            method: 'DELETE'
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                alert('Error: ' + data.error);
+            } else {
+                document.getElementById(`booking-${bookingId}`).remove();
+                adjustStat('total-bookings', -1);
+                adjustStatusStats(data.previous_status, -1);
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error deleting booking');
+        });
+    }
+}
+
+function deleteBlockedSlot(slotId) {
+    if (confirm('Are you sure you want to remove this blocked time slot?')) {
+        fetch(`${ADMIN_BASE}/blocked-slots/${slotId}`, {
+            method: 'DELETE'
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                alert('Error: ' + data.error);
+            } else {
+                document.getElementById(`blocked-slot-${slotId}`).remove();
+                adjustStat('blocked-slots-count', -data.deleted_count);
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error deleting blocked slot');
+        });
+    }
+}
+
+// Initialize time slots when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    generateTimeSlots();
+    loadBookings(1);
+    loadBlockedSlots(1);
+    loadClients(1);
+
+    // Set default dates (today and 3 months from now)
+    const today = new Date();
+    const threeMonthsLater = new Date(today);
+    threeMonthsLater.setMonth(threeMonthsLater.getMonth() + 3);
+
+    document.getElementById('start-date').value = today.toISOString().split('T')[0];
+    document.getElementById('end-date').value = threeMonthsLater.toISOString().split('T')[0];
+});
@@ -0,0 +1,56 @@
+function deleteRange(button) {
+    const range = JSON.parse(button.dataset.range);
+    if (confirm('Are you sure you want to delete this blocked range?')) {
+        fetch('/api/wave-admin/blocked-ranges/delete', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(range)
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                button.closest('.slot-item').remove();
+                showSuccess(`Deleted ${data.deleted_count} blocked slots`);
+            } else {
+                alert('Error deleting range: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error deleting range: ' + error);
+        });
+    }
+}
+
+function deleteAllForDate(dateStr) {
+    if (confirm(`Are you sure you want to delete ALL blocked slots for ${dateStr}?`)) {
+        fetch('/api/delete-blocked-slots-by-date', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ date: dateStr })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Error deleting slots: ' + data.error);
+            }
+        })
+        .catch(error => {
+            alert('Error deleting slots: ' + error);
+        });
+    }
+}
+
+function showSuccess(message) {
+    const successMsg = document.getElementById('success-msg');
+    successMsg.textContent = message;
+    successMsg.style.display = 'block';
+    setTimeout(() => {
+        successMsg.style.display = 'none';
+    }, 3000);
+}
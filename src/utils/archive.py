@@ -0,0 +1,87 @@
+import os
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, insert, literal, select
+from src.models.user import db
+from src.models.booking import Booking, BlockedSlot
+from src.models.archive import ArchivedBooking, ArchivedBlockedSlot
+from src.utils.rollups import refresh_rollups
+
+# Bookings and blocks dated more than this many days ago move to the archive
+# tables, so the live tables only hold the recent past and the future.
+ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 365))
+
+# Rows moved per transaction; keeps locks and transaction size small
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+
+# Live model -> archive model
+ARCHIVES = {
+    Booking: ArchivedBooking,
+    BlockedSlot: ArchivedBlockedSlot,
+}
+
+def archive_cutoff(today=None):
+    """First date that stays in the live tables"""
+    return (today or date.today()) - timedelta(days=ARCHIVE_AFTER_DAYS)
+
+def _archive_batch(model, cutoff, batch_size):
+    """Copy one batch of rows dated before ``cutoff`` to the archive and delete them, in one transaction.
+
+    Statements run against the tables rather than the models: archived dates
+    are long past, so there is no availability to invalidate.
+    """
+    source = model.__table__
+    target = ARCHIVES[model].__table__
+    ids = db.session.execute(
+        select(source.c.id).where(source.c.date < cutoff).order_by(source.c.id).limit(batch_size)
+    ).scalars().all()
+    if not ids:
+        return 0
+
+    columns = [column.name for column in source.columns]
+    db.session.execute(insert(target).from_select(
+        columns + ['archived_at'],
+        select(*[source.c[name] for name in columns], literal(datetime.utcnow(), db.DateTime)).where(source.c.id.in_(ids))
+    ))
+    db.session.execute(delete(source).where(source.c.id.in_(ids)))
+    db.session.commit()
+    return len(ids)
+
+def archive_old_records(cutoff=None, batch_size=None, max_batches=None):
+    """Move bookings and blocked slots dated before ``cutoff`` into the archive tables.
+
+    Commits after every batch, so an interrupted run keeps its progress and
+    the next run carries on. Rollups read the archive tables as well, and
+    the archived dates are rolled up once the rows have moved, so no history
+    drops out of analytics. Returns the number of rows moved per table.
+    """
+    cutoff = cutoff or archive_cutoff()
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+    earliest = min(filter(None, (
+        db.session.query(db.func.min(model.date)).filter(model.date < cutoff).scalar() for model in ARCHIVES
+    )), default=None)
+    moved = {}
+    for model, key in ((Booking, 'bookings'), (BlockedSlot, 'blocked_slots')):
+        moved[key] = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            try:
+                count = _archive_batch(model, cutoff, batch_size)
+            except Exception:
+                db.session.rollback()
+                raise
+            if not count:
+                break
+            moved[key] += count
+            batches += 1
+
+    if earliest:
+        refresh_rollups(earliest, cutoff - timedelta(days=1))
+    return moved
+
+def booking_history(include_archive=False):
+    """All bookings as dicts, followed by archived ones when ``include_archive`` is set"""
+    models = (Booking, ArchivedBooking) if include_archive else (Booking,)
+    bookings = []
+    for model in models:
+        bookings.extend(booking.to_dict() for booking in model.query.order_by(model.id))
+    return bookings
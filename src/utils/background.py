@@ -0,0 +1,35 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+
+# Slow side effects (notification email) run here so a request returns as soon
+# as its transaction commits. Under gevent workers these threads are greenlets.
+BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS', 2))
+
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+
+def get_executor():
+    """Per-process executor, recreated after a fork (threads don't survive one)"""
+    global _executor, _executor_pid
+    if _executor_pid != os.getpid():
+        with _lock:
+            if _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix='background')
+                _executor_pid = os.getpid()
+    return _executor
+
+def run_in_background(fn, *args, **kwargs):
+    """Run ``fn`` inside an app context off the request path; errors are logged, not raised"""
+    app = current_app._get_current_object()
+
+    def task():
+        with app.app_context():
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                print(f"Background task {getattr(fn, '__name__', fn)} failed: {e}")
+
+    return get_executor().submit(task)
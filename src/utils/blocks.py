@@ -0,0 +1,118 @@
+from datetime import timedelta
+from sqlalchemy import delete
+from src.models.user import db
+from src.models.booking import BlockedSlot
+from src.utils.timeslots import minutes_to_time, LEGACY_BLOCK_MINUTES
+
+def _block_end_minute():
+    return BlockedSlot.start_minute + db.func.coalesce(BlockedSlot.duration_minutes, LEGACY_BLOCK_MINUTES)
+
+def get_blocked_ranges(start_date, end_date, resource_id=None):
+    """Collapse blocked slots into contiguous ranges per date, grouped in SQL.
+
+    Slots on the same date, resource and reason that touch end-to-start form
+    one range (gaps-and-islands over start_minute), so a month of blocked
+    night hours comes back as one row per night instead of eight.
+    """
+    partition = (BlockedSlot.date, BlockedSlot.resource_id, BlockedSlot.reason)
+    end_minute = _block_end_minute()
+    previous_end = db.func.lag(end_minute).over(partition_by=partition, order_by=(BlockedSlot.start_minute, BlockedSlot.id))
+
+    slots = db.session.query(
+        BlockedSlot.id,
+        BlockedSlot.date,
+        BlockedSlot.resource_id,
+        BlockedSlot.reason,
+        BlockedSlot.start_minute,
+        end_minute.label('end_minute'),
+        db.case((previous_end >= BlockedSlot.start_minute, 0), else_=1).label('starts_range')
+    ).filter(BlockedSlot.date.between(start_date, end_date))
+    if resource_id is not None:
+        slots = slots.filter(BlockedSlot.resource_id == resource_id)
+    slots = slots.subquery()
+
+    # A running count of range starts numbers the ranges within each partition
+    range_number = db.func.sum(slots.c.starts_range).over(
+        partition_by=(slots.c.date, slots.c.resource_id, slots.c.reason),
+        order_by=(slots.c.start_minute, slots.c.id)
+    )
+    numbered = db.session.query(slots, range_number.label('range_number')).subquery()
+
+    rows = db.session.query(
+        numbered.c.date,
+        numbered.c.resource_id,
+        numbered.c.reason,
+        db.func.min(numbered.c.start_minute).label('start_minute'),
+        db.func.max(numbered.c.end_minute).label('end_minute'),
+        db.func.count(numbered.c.id).label('slot_count')
+    ).group_by(
+        numbered.c.date, numbered.c.resource_id, numbered.c.reason, numbered.c.range_number
+    ).order_by(
+        numbered.c.date, db.func.min(numbered.c.start_minute)
+    )
+
+    dates = []
+    for row in rows:
+        if not dates or dates[-1]['date'] != row.date.isoformat():
+            dates.append({'date': row.date.isoformat(), 'slot_count': 0, 'ranges': []})
+        day = dates[-1]
+        day['slot_count'] += row.slot_count
+        day['ranges'].append({
+            'start_minute': row.start_minute,
+            'end_minute': row.end_minute,
+            'start_time': minutes_to_time(row.start_minute % (24 * 60)),
+            'end_time': minutes_to_time(row.end_minute % (24 * 60)),
+            'resource_id': row.resource_id,
+            'reason': row.reason,
+            'slot_count': row.slot_count
+        })
+    return dates
+
+def get_block_window_cursors(start_date, end_date, days):
+    """Start dates of the previous and next windows that contain blocks"""
+    next_date = db.session.query(db.func.min(BlockedSlot.date)).filter(BlockedSlot.date > end_date).scalar()
+    previous_date = db.session.query(db.func.max(BlockedSlot.date)).filter(BlockedSlot.date < start_date).scalar()
+    return (
+        (previous_date - timedelta(days=days - 1)).isoformat() if previous_date else None,
+        next_date.isoformat() if next_date else None
+    )
+
+def delete_blocked_range(block_date, start_minute, end_minute, resource_id=None, reason=None, match_reason=False):
+    """Delete every slot of one range with a single DELETE; returns the row count"""
+    query = BlockedSlot.query.filter(
+        BlockedSlot.date == block_date,
+        BlockedSlot.start_minute >= start_minute,
+        BlockedSlot.start_minute < end_minute,
+        BlockedSlot.resource_id.is_(None) if resource_id is None else BlockedSlot.resource_id == resource_id
+    )
+    if match_reason:
+        query = query.filter(BlockedSlot.reason.is_(None) if reason is None else BlockedSlot.reason == reason)
+    return query.delete(synchronize_session=False)
+
+def weekday_expression(column):
+    """Day of week for a Date column in SQL, Sunday=0 through Saturday=6"""
+    if db.engine.dialect.name == 'sqlite':
+        return db.cast(db.func.strftime('%w', column), db.Integer)
+    return db.cast(db.extract('dow', column), db.Integer)
+
+def delete_blocked_slots(start_date, end_date, weekdays=None, start_minutes=None, reason=None, resource_id=None):
+    """Unblock a date range with one set-based DELETE.
+
+    ``weekdays`` uses the bulk-block numbering (0=Sunday, 6=Saturday) and
+    ``start_minutes`` restricts the delete to slots starting at those times;
+    either left as None matches everything. Returns {date: deleted count}.
+    """
+    statement = delete(BlockedSlot).where(BlockedSlot.date.between(start_date, end_date))
+    if weekdays is not None:
+        statement = statement.where(weekday_expression(BlockedSlot.date).in_(weekdays))
+    if start_minutes is not None:
+        statement = statement.where(BlockedSlot.start_minute.in_(start_minutes))
+    if reason is not None:
+        statement = statement.where(BlockedSlot.reason == reason)
+    if resource_id is not None:
+        statement = statement.where(BlockedSlot.resource_id == resource_id)
+
+    counts = {}
+    for (block_date,) in db.session.execute(statement.returning(BlockedSlot.date), execution_options={'synchronize_session': False}):
+        counts[block_date.isoformat()] = counts.get(block_date.isoformat(), 0) + 1
+    return counts
@@ -0,0 +1,255 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import event, inspect, select, union_all, update
+from src.models.user import db
+from src.models.booking import Booking
+from src.models.archive import ArchivedBooking
+from src.models.client import Client, normalize_email, normalize_phone
+from src.utils.rollups import BOOKING_STATUSES
+
+# Verification state of recent clients, keyed by normalized email, so repeat
+# bookings skip the client upsert. Changes made in this process evict entries
+# immediately; the TTL bounds how stale a change made by another worker can be.
+CLIENT_CACHE_SECONDS = float(os.environ.get('CLIENT_CACHE_SECONDS', 60))
+CLIENT_CACHE_SIZE = int(os.environ.get('CLIENT_CACHE_SIZE', 1024))
+
+_clients = OrderedDict()
+_lock = threading.Lock()
+
+def get_cached_client(email):
+    """Cached {id, email, name, phone, needs_verification} for an email, or None"""
+    email = normalize_email(email)
+    with _lock:
+        entry = _clients.get(email)
+        if entry is None:
+            return None
+        if entry['expires_at'] <= time.monotonic():
+            del _clients[email]
+            return None
+        _clients.move_to_end(email)
+        return entry
+
+def cache_client(client_id, email, name, phone, needs_verification):
+    """Remember a committed client's verification state; returns the entry"""
+    email = normalize_email(email)
+    entry = {
+        'id': client_id,
+        'email': email,
+        'name': name,
+        'phone': phone,
+        'needs_verification': needs_verification,
+        'expires_at': time.monotonic() + CLIENT_CACHE_SECONDS
+    }
+    with _lock:
+        _clients[email] = entry
+        _clients.move_to_end(email)
+        while len(_clients) > CLIENT_CACHE_SIZE:
+            _clients.popitem(last=False)
+    return entry
+
+def forget_client(email):
+    with _lock:
+        _clients.pop(normalize_email(email), None)
+
+@event.listens_for(Client, 'after_update')
+@event.listens_for(Client, 'after_delete')
+def _evict_changed_client(mapper, connection, target):
+    # Verification changes go through the ORM; evict the old and new spelling
+    for email in inspect(target).attrs.email.history.sum() or [target.email]:
+        forget_client(email)
+
+def client_needs_verification():
+    """SQL twin of Client.needs_verification()"""
+    return db.and_(Client.__table__.c.is_verified.is_(False), Client.__table__.c.verification_status.in_(('pending', 'failed')))
+
+def _dialect_insert(table):
+    """INSERT with ON CONFLICT support for the bound database"""
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
+
+def upsert_client(email, name, phone=None, booking_amount=0):
+    """Create or update the client for a booking in one statement.
+
+    A new client starts pending verification. A returning client gets the
+    form's name (and phone, when given), and clients that don't need
+    verification have the booking counted in their stats right away.
+    Returns (client id, requires_verification) from the same round trip.
+    """
+    table = Client.__table__
+    now = datetime.utcnow()
+    insert = _dialect_insert(table).values(
+        email=normalize_email(email),
+        name=name,
+        phone=phone,
+        phone_digits=normalize_phone(phone),
+        is_verified=False,
+        verification_status='pending',
+        total_bookings=0,
+        total_spent=0.0,
+        is_flagged=False,
+        created_at=now,
+        updated_at=now
+    )
+    counted = db.case((client_needs_verification(), 0), else_=1)
+    insert = insert.on_conflict_do_update(
+        index_elements=[table.c.email],
+        set_={
+            'name': insert.excluded.name,
+            'phone': db.func.coalesce(insert.excluded.phone, table.c.phone),
+            'phone_digits': db.func.coalesce(insert.excluded.phone_digits, table.c.phone_digits),
+            'total_bookings': table.c.total_bookings + counted,
+            'total_spent': table.c.total_spent + counted * (booking_amount or 0),
+            'first_booking_date': db.case(
+                (client_needs_verification(), table.c.first_booking_date),
+                else_=db.func.coalesce(table.c.first_booking_date, now)
+            ),
+            'updated_at': now
+        }
+    ).returning(table.c.id, table.c.is_verified, table.c.verification_status)
+
+    client_id, is_verified, verification_status = db.session.execute(insert).one()
+    return client_id, not is_verified and verification_status in ('pending', 'failed')
+
+def record_client_booking(client_id, booking_amount=0):
+    """Count a booking in a client's stats with one UPDATE by id; False if the client is gone"""
+    now = datetime.utcnow()
+    updated = Client.query.filter_by(id=client_id).update({
+        Client.total_bookings: Client.total_bookings + 1,
+        Client.total_spent: Client.total_spent + (booking_amount or 0),
+        Client.first_booking_date: db.func.coalesce(Client.first_booking_date, now),
+        Client.updated_at: now
+    }, synchronize_session=False)
+    return updated == 1
+
+def admit_client(email, name, phone=None, booking_amount=0):
+    """Client id and requires_verification for a booking, via the cache when it can.
+
+    A cached client whose name and phone match the form needs no upsert: one
+    awaiting verification needs no statement at all, and a verified one only
+    has the booking counted by id. Anything else goes through upsert_client.
+    Call cache_client() once the booking commits.
+    """
+    entry = get_cached_client(email)
+    if entry and entry['name'] == name and (not phone or entry['phone'] == phone):
+        if entry['needs_verification']:
+            return entry['id'], True
+        if record_client_booking(entry['id'], booking_amount):
+            return entry['id'], False
+        forget_client(email)
+    return upsert_client(email, name, phone, booking_amount)
+
+def reconcile_client_stats():
+    """Recompute total_bookings/total_spent from the bookings themselves.
+
+    Counts pending and confirmed bookings, live and archived, that don't
+    await verification (the ones create_booking counts), which also drops
+    cancellations the running totals never subtracted. Only clients whose
+    stats drifted are written; returns how many.
+    """
+    sources = [
+        select(model.client_id, model.payment_amount, model.created_at).where(
+            model.client_id.isnot(None),
+            model.status.in_(BOOKING_STATUSES),
+            model.verification_completed.is_(True)
+        )
+        for model in (Booking, ArchivedBooking)
+    ]
+    bookings = union_all(*sources).subquery()
+    totals = select(
+        bookings.c.client_id,
+        db.func.count().label('booking_count'),
+        db.func.coalesce(db.func.sum(bookings.c.payment_amount), 0).label('spent'),
+        db.func.min(bookings.c.created_at).label('first_booking')
+    ).group_by(bookings.c.client_id).subquery()
+
+    rows = db.session.query(
+        Client.id, Client.total_bookings, Client.total_spent, Client.first_booking_date,
+        totals.c.booking_count, totals.c.spent, totals.c.first_booking
+    ).outerjoin(totals, totals.c.client_id == Client.id)
+
+    changes = []
+    for client_id, total_bookings, total_spent, first_booking_date, booking_count, spent, first_booking in rows:
+        booking_count, spent = booking_count or 0, float(spent or 0)
+        if total_bookings == booking_count and round(total_spent, 2) == round(spent, 2):
+            continue
+        change = {'id': client_id, 'total_bookings': booking_count, 'total_spent': spent}
+        if first_booking_date is None and first_booking is not None:
+            change['first_booking_date'] = first_booking
+        changes.append(change)
+
+    if changes:
+        db.session.execute(update(Client), changes)
+    db.session.commit()
+    return len(changes)
+
+# Client directory sort keys (?sort=); ties break on id for stable pages
+CLIENT_SORTS = {
+    'total_spent': Client.total_spent,
+    'total_bookings': Client.total_bookings,
+    'created_at': Client.created_at,
+    'name': db.func.lower(Client.name),
+}
+
+# Shorter terms only match as prefixes; substring matching on one or two
+# characters matches nearly everything and can't use the trigram indexes
+MIN_SUBSTRING_LENGTH = 3
+
+_trigram_available = None
+
+def trigram_available():
+    """Whether pg_trgm is installed, checked once per process"""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = db.engine.dialect.name == 'postgresql' and bool(
+            db.session.execute(db.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).scalar()
+        )
+    return _trigram_available
+
+def _like_escape(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def search_clients(q=None, is_flagged=None, verification_status=None, sort=None, descending=True):
+    """Client directory query: search, filters and ordering, ready to paginate.
+
+    ``q`` matches name and email by prefix and, from three characters, by
+    substring (plus trigram similarity on names where pg_trgm exists), and
+    matches phone numbers by their digits. Without an explicit ``sort``,
+    prefix matches rank first.
+    """
+    query = Client.query
+    if is_flagged is not None:
+        query = query.filter(Client.is_flagged == is_flagged)
+    if verification_status:
+        query = query.filter(Client.verification_status == verification_status)
+
+    name = db.func.lower(Client.name)
+    ranking = []
+    term = (q or '').strip().lower()
+    if term:
+        escaped = _like_escape(term)
+        prefix_match = db.or_(name.like(f'{escaped}%', escape='\\'), Client.email.like(f'{escaped}%', escape='\\'))
+        conditions = [prefix_match]
+        if len(term) >= MIN_SUBSTRING_LENGTH:
+            conditions += [name.like(f'%{escaped}%', escape='\\'), Client.email.like(f'%{escaped}%', escape='\\')]
+            if trigram_available():
+                conditions.append(name.op('%')(term))
+                ranking.append(db.func.similarity(name, term).desc())
+        digits = normalize_phone(term)
+        if digits:
+            pattern = f'%{digits}%' if len(digits) >= MIN_SUBSTRING_LENGTH else f'{digits}%'
+            conditions.append(Client.phone_digits.like(pattern))
+        query = query.filter(db.or_(*conditions))
+        ranking.insert(0, db.case((prefix_match, 0), else_=1))
+
+    if sort:
+        column = CLIENT_SORTS[sort]
+        return query.order_by(column.desc() if descending else column.asc(), Client.id)
+    if ranking:
+        return query.order_by(*ranking, name, Client.id)
+    return query.order_by(Client.created_at.desc(), Client.id.desc())
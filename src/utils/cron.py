@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+# (name, lowest, highest) for the five fields of a cron expression
+FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day', 1, 31),
+    ('month', 1, 12),
+    ('weekday', 0, 6),  # 0=Sunday, as in cron and the bulk-block form
+)
+
+def _parse_field(text, lowest, highest):
+    """Values allowed by one cron field: *, */n, a, a-b, a-b/n and comma lists"""
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {step_text}")
+        if part == '*':
+            start, end = lowest, highest
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = int(part)
+            end = highest if step > 1 else start
+        if not lowest <= start <= end <= highest:
+            raise ValueError(f"Cron value out of range {lowest}-{highest}: {part}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+class CronSchedule:
+    """A standard five-field cron expression (minute hour day month weekday).
+
+    Like cron, when both day and weekday are restricted a time matches if
+    either does.
+    """
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Cron expression needs {len(FIELDS)} fields: {expression!r}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(part, lowest, highest) for part, (_, lowest, highest) in zip(parts, FIELDS)
+        )
+        self.any_day = parts[2] == '*'
+        self.any_weekday = parts[4] == '*'
+
+    def __repr__(self):
+        return f'<CronSchedule {self.expression}>'
+
+    def matches(self, moment):
+        """Whether the schedule fires during the minute containing ``moment``"""
+        if moment.minute not in self.minutes or moment.hour not in self.hours or moment.month not in self.months:
+            return False
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """The first minute strictly after ``moment`` the schedule fires in"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # A year and a day covers every valid expression (e.g. 29 Feb aside)
+        for _ in range(366 * 24 * 60 + 1):
+            if self.matches(candidate):
+                return candidate
+            candidate += timedelta(minutes=1)
+        return None
@@ -0,0 +1,149 @@
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+# Messages buffered per subscriber before it is considered stalled
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Redis listener reconnect backoff, doubling up to the maximum
+RECONNECT_INITIAL_SECONDS = 1
+RECONNECT_MAX_SECONDS = 30
+
+# Identifies this process on a shared channel so it can skip its own messages
+PROCESS_ID = uuid.uuid4().hex
+
+class LocalBroker:
+    """Fan availability messages out to subscriber queues in this process.
+
+    Enough for a single worker; see RedisBroker for several.
+    """
+
+    # Whether subscribers see messages published by other worker processes
+    shared = False
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._remote_listeners = []
+
+    def subscribe(self, limit=None):
+        """A new subscriber queue, or None if ``limit`` subscribers already exist"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if limit is not None and len(self._subscribers) >= limit:
+                return None
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, message):
+        self._deliver(message)
+
+    def add_remote_listener(self, callback):
+        """Call ``callback(message)`` for messages published by other processes"""
+        self._remote_listeners.append(callback)
+
+    def ensure_listening(self):
+        """Start receiving other processes' messages (nothing to do in-process)"""
+
+    def _deliver(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # A stalled client: replace its backlog with a single reset so
+                # it refetches everything once it catches up
+                while not subscriber.empty():
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.put_nowait({'type': 'reset', 'generation': message.get('generation')})
+
+class RedisBroker(LocalBroker):
+    """Relay messages through a Redis pub/sub channel so every worker sees them.
+
+    Requires the ``redis`` package. Each process runs one listener thread,
+    started lazily (and restarted after a fork) that delivers to its local
+    subscribers.
+    """
+
+    shared = True
+
+    def __init__(self, url, channel='wave-house:availability'):
+        import redis
+
+        super().__init__()
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._listener_pid = None
+
+    def publish(self, message):
+        self.ensure_listening()
+        self.client.publish(self.channel, json.dumps({**message, 'origin': PROCESS_ID}))
+
+    def subscribe(self, limit=None):
+        self.ensure_listening()
+        return super().subscribe(limit)
+
+    def ensure_listening(self):
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+            threading.Thread(target=self._listen, name='availability-events', daemon=True).start()
+
+    def _listen(self):
+        """Relay channel messages forever, reconnecting with backoff if Redis drops"""
+        delay = RECONNECT_INITIAL_SECONDS
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Messages published while disconnected are lost; make every
+                # worker and stream refetch
+                if delay > RECONNECT_INITIAL_SECONDS:
+                    self._relay({'type': 'reset'})
+                delay = RECONNECT_INITIAL_SECONDS
+                for item in pubsub.listen():
+                    try:
+                        message = json.loads(item['data'])
+                    except (TypeError, ValueError):
+                        continue
+                    if message.pop('origin', None) != PROCESS_ID:
+                        self._relay(message)
+                    else:
+                        self._deliver(message)
+            except Exception as e:
+                print(f"Availability listener lost Redis ({e}); reconnecting in {delay}s")
+            time.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    def _relay(self, message):
+        """Handle a message from another process: invalidate caches, then notify streams"""
+        for callback in self._remote_listeners:
+            try:
+                callback(message)
+            except Exception as e:
+                print(f"Error handling availability message: {e}")
+        self._deliver(message)
+
+_broker = None
+
+def get_broker():
+    """The process-wide broker; AVAILABILITY_BROKER_URL=redis://... shares events across workers"""
+    global _broker
+    if _broker is None:
+        url = os.environ.get('AVAILABILITY_BROKER_URL')
+        _broker = RedisBroker(url) if url else LocalBroker()
+    return _broker
@@ -0,0 +1,59 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from src.models.user import db
+from src.models.booking import Booking
+
+# How long a pending booking is held before it expires. Bookings waiting on
+# ID verification get a shorter hold than ones waiting on the studio to
+# confirm them. 0 disables that policy.
+PENDING_VERIFICATION_TTL_HOURS = float(os.environ.get('PENDING_VERIFICATION_TTL_HOURS', 48))
+PENDING_CONFIRMATION_TTL_HOURS = float(os.environ.get('PENDING_CONFIRMATION_TTL_HOURS', 7 * 24))
+
+# Rows updated per transaction
+EXPIRY_BATCH_SIZE = int(os.environ.get('EXPIRY_BATCH_SIZE', 500))
+
+def expiry_policies(now=None):
+    """(name, filter clause) for each enabled hold policy"""
+    now = now or datetime.utcnow()
+    awaiting_verification = db.and_(Booking.requires_verification.is_(True), Booking.verification_completed.is_(False))
+    policies = []
+    if PENDING_VERIFICATION_TTL_HOURS > 0:
+        policies.append(('unverified', db.and_(
+            awaiting_verification,
+            Booking.created_at < now - timedelta(hours=PENDING_VERIFICATION_TTL_HOURS)
+        )))
+    if PENDING_CONFIRMATION_TTL_HOURS > 0:
+        policies.append(('unconfirmed', db.and_(
+            db.not_(awaiting_verification),
+            Booking.created_at < now - timedelta(hours=PENDING_CONFIRMATION_TTL_HOURS)
+        )))
+    return policies
+
+def expire_pending_bookings(now=None, batch_size=None):
+    """Move pending bookings held past their TTL to 'expired', in batches.
+
+    Each batch picks ids through the (status, created_at) index and updates
+    them with one statement that re-checks the status, so a booking
+    confirmed in the meantime is left alone. Statements run against the
+    table: pending bookings don't occupy availability, so there is nothing
+    to invalidate. Returns the number expired per policy.
+    """
+    batch_size = batch_size or EXPIRY_BATCH_SIZE
+    table = Booking.__table__
+    expired = {}
+    for name, condition in expiry_policies(now):
+        expired[name] = 0
+        while True:
+            ids = db.session.execute(
+                select(Booking.id).where(Booking.status == 'pending', condition)
+                .order_by(Booking.created_at).limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            result = db.session.execute(
+                update(table).where(table.c.id.in_(ids), table.c.status == 'pending').values(status='expired')
+            )
+            db.session.commit()
+            expired[name] += result.rowcount
+    return expired
@@ -0,0 +1,129 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import Response, g, jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db
+from src.models.idempotency import IdempotencyKey
+
+# How long a stored response is replayed for a retried key
+IDEMPOTENCY_TTL_SECONDS = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 24 * 60 * 60))
+
+# A claim with no stored response after this long belongs to a request that
+# died mid-flight; the next retry may take it over
+IDEMPOTENCY_LOCK_SECONDS = 60
+
+MAX_KEY_LENGTH = 255
+
+def _claim(scope, key, fingerprint):
+    """Insert the in-progress row for a key; returns (claim id, None) or (None, existing row)"""
+    now = datetime.utcnow()
+    claim = IdempotencyKey(scope=scope, key=key, fingerprint=fingerprint, created_at=now,
+                           expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS))
+    db.session.add(claim)
+    try:
+        db.session.commit()
+        return claim.id, None
+    except IntegrityError:
+        db.session.rollback()
+
+    existing = IdempotencyKey.query.filter_by(scope=scope, key=key).first()
+    if existing is None:
+        return None, None
+
+    abandoned = existing.status_code is None and existing.created_at < now - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)
+    if existing.expires_at <= now or abandoned:
+        # Take the row over in place; the WHERE on created_at makes this a
+        # compare-and-set, so only one concurrent retry wins
+        taken = IdempotencyKey.query.filter_by(id=existing.id, created_at=existing.created_at).update({
+            IdempotencyKey.fingerprint: fingerprint,
+            IdempotencyKey.status_code: None,
+            IdempotencyKey.response_body: None,
+            IdempotencyKey.created_at: now,
+            IdempotencyKey.expires_at: now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS),
+        }, synchronize_session=False)
+        db.session.commit()
+        if taken:
+            return existing.id, None
+        existing = IdempotencyKey.query.filter_by(id=existing.id).first()
+    return None, existing
+
+def store_idempotent_response(response, status_code):
+    """Save the response for this request's Idempotency-Key in the caller's transaction.
+
+    Views that commit their work once call this just before that commit, so
+    the stored response lands atomically with the work instead of in a
+    commit of its own. Does nothing when the request has no key.
+    """
+    claim_id = g.get('idempotency_claim_id')
+    if claim_id is None:
+        return
+    IdempotencyKey.query.filter_by(id=claim_id).update({
+        IdempotencyKey.status_code: status_code,
+        IdempotencyKey.response_body: response.get_data(as_text=True),
+    }, synchronize_session=False)
+    g.idempotency_stored = True
+
+def idempotent(view):
+    """Replay the first response for requests that repeat an Idempotency-Key header.
+
+    Without the header the view runs as usual. A retry with the same key and
+    body gets the stored response (marked Idempotent-Replayed) without running
+    the view; the same key with a different body is a 422, and a retry while
+    the first request is still running is a 409. 5xx responses are not stored
+    so the client can retry them.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key')
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({'error': f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters'}), 400
+
+        scope = request.endpoint
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        claim_id, existing = _claim(scope, key, fingerprint)
+
+        if claim_id is None:
+            if existing is not None and existing.fingerprint != fingerprint:
+                return jsonify({'error': 'Idempotency-Key was already used for a different request'}), 422
+            if existing is None or existing.status_code is None:
+                response = jsonify({'error': 'A request with this Idempotency-Key is still being processed'})
+                response.headers['Retry-After'] = '1'
+                return response, 409
+            response = Response(existing.response_body, status=existing.status_code, mimetype='application/json')
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        g.idempotency_claim_id = claim_id
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            IdempotencyKey.query.filter_by(id=claim_id).delete(synchronize_session=False)
+            db.session.commit()
+            raise
+
+        if g.pop('idempotency_stored', False) and response.status_code < 500:
+            # Already committed with the view's own transaction
+            return response
+        if response.status_code >= 500:
+            IdempotencyKey.query.filter_by(id=claim_id).delete(synchronize_session=False)
+        else:
+            IdempotencyKey.query.filter_by(id=claim_id).update({
+                IdempotencyKey.status_code: response.status_code,
+                IdempotencyKey.response_body: response.get_data(as_text=True),
+            }, synchronize_session=False)
+        db.session.commit()
+        return response
+    return wrapper
+
+def prune_idempotency_keys():
+    """Delete expired keys; returns the number removed"""
+    deleted = IdempotencyKey.query.filter(
+        IdempotencyKey.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
@@ -0,0 +1,288 @@
+import base64
+from datetime import timedelta
+from functools import reduce
+import operator
+from src.models.user import db
+from src.models.booking import Booking, BlockedSlot
+from src.models.resource import Resource, DEFAULT_RESOURCE_SLUG
+from src.utils.timeslots import (
+    time_to_minutes, minutes_to_time, duration_to_minutes, turnover_minutes,
+    SLOT_MINUTES, LEGACY_BLOCK_MINUTES
+)
+
+# Each day is a bitmask over the slot grid: bit i set means slot i is taken.
+# Python ints act as fixed-width bit vectors here, so combining a day across
+# every resource is a handful of word-sized AND/OR operations even at
+# 15-minute granularity (96 bits per day).
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+def interval_mask(start_minute, end_minute):
+    """Bitmask of the slots overlapped by [start_minute, end_minute), clipped at midnight"""
+    end_minute = min(end_minute, 24 * 60)
+    if end_minute <= start_minute:
+        return 0
+    first_slot = start_minute // SLOT_MINUTES
+    last_slot = (end_minute - 1) // SLOT_MINUTES
+    return ((1 << (last_slot - first_slot + 1)) - 1) << first_slot
+
+def booking_day_masks(start_time, duration, service_type=None):
+    """Slot bitmasks a booking occupies on its own date and on the next date.
+
+    The service's turnover buffer is held after the session, so back-to-back
+    bookings keep room for changeover.
+    """
+    start_minute = time_to_minutes(start_time)
+    if not duration:
+        # Legacy single-slot booking
+        end_minute = start_minute + SLOT_MINUTES
+    else:
+        end_minute = start_minute + duration_to_minutes(duration)
+    end_minute += turnover_minutes(service_type)
+    spill_mask = interval_mask(0, end_minute - 24 * 60) if end_minute > 24 * 60 else 0
+    return interval_mask(start_minute, end_minute), spill_mask
+
+def block_mask(start_time, duration_minutes=None):
+    """Bitmask of the slots covered by a blocked slot row"""
+    start_minute = time_to_minutes(start_time)
+    return interval_mask(start_minute, start_minute + (duration_minutes or LEGACY_BLOCK_MINUTES))
+
+def run_starts(free_mask, length):
+    """Bits where a run of at least ``length`` consecutive free slots starts.
+
+    Each step ANDs the mask with a shifted copy of itself, doubling the run
+    length covered, so a 12-hour search is four shifts rather than a scan.
+    """
+    starts = free_mask
+    covered = 1
+    while covered < length:
+        step = min(covered, length - covered)
+        starts &= starts >> step
+        covered += step
+    return starts
+
+def mask_to_times(mask):
+    """Expand a day bitmask into display times like '2:00 PM'"""
+    times = []
+    slot = 0
+    while mask:
+        if mask & 1:
+            times.append(minutes_to_time(slot * SLOT_MINUTES))
+        mask >>= 1
+        slot += 1
+    return times
+
+# Bytes per day in the compact availability format
+SLOT_BYTES = -(-SLOTS_PER_DAY // 8)
+
+def mask_to_base64(mask):
+    """Encode a day bitmask as base64 of its little-endian bytes (bit i = slot i)"""
+    return base64.b64encode(mask.to_bytes(SLOT_BYTES, 'little')).decode('ascii')
+
+_default_resource_id = None
+
+def get_default_resource_id():
+    """ID of the main studio room (cached per process, it never changes)"""
+    global _default_resource_id
+    if _default_resource_id is None:
+        resource = Resource.query.filter_by(slug=DEFAULT_RESOURCE_SLUG).first()
+        _default_resource_id = resource.id if resource else None
+    return _default_resource_id
+
+def get_active_resource_ids():
+    """IDs of bookable resources in display order"""
+    rows = db.session.query(Resource.id).filter_by(is_active=True).order_by(Resource.sort_order, Resource.id)
+    return [row.id for row in rows]
+
+def resolve_resource_id(value, active_only=False):
+    """Map a resource id, numeric string or slug to an id; None means the main studio.
+
+    With ``active_only`` a room an admin has deactivated resolves to None too,
+    for the public booking endpoints. Admin tools can still address it.
+    """
+    if value is None or value == '':
+        return get_default_resource_id()
+    if isinstance(value, int) or str(value).isdigit():
+        resource = db.session.get(Resource, int(value))
+    else:
+        resource = Resource.query.filter_by(slug=str(value)).first()
+    if not resource or (active_only and not resource.is_active):
+        return None
+    return resource.id
+
+class OccupancyIndex:
+    """Booked and blocked slot bitmasks per date and resource"""
+
+    def __init__(self):
+        self.booked = {}   # date -> {resource_id: mask}
+        self.blocked = {}  # date -> {resource_id or None: mask}, None blocks every resource
+
+    def add_booking(self, day, resource_id, mask):
+        day_masks = self.booked.setdefault(day, {})
+        day_masks[resource_id] = day_masks.get(resource_id, 0) | mask
+
+    def add_block(self, day, resource_id, mask):
+        day_masks = self.blocked.setdefault(day, {})
+        day_masks[resource_id] = day_masks.get(resource_id, 0) | mask
+
+    def dates(self):
+        return sorted(set(self.booked) | set(self.blocked))
+
+    def booked_mask(self, day, resource_id):
+        return self.booked.get(day, {}).get(resource_id, 0)
+
+    def blocked_mask(self, day, resource_id):
+        day_masks = self.blocked.get(day, {})
+        return day_masks.get(resource_id, 0) | day_masks.get(None, 0)
+
+    def occupied_mask(self, day, resource_id):
+        return self.booked_mask(day, resource_id) | self.blocked_mask(day, resource_id)
+
+    def occupied_masks(self, day, resource_ids):
+        """Occupied masks for every resource on one day, in resource order"""
+        booked = self.booked.get(day, {})
+        blocked = self.blocked.get(day, {})
+        blocked_everywhere = blocked.get(None, 0)
+        return [booked.get(rid, 0) | blocked.get(rid, 0) | blocked_everywhere for rid in resource_ids]
+
+    def all_occupied_mask(self, day, resource_ids):
+        """Slots where no resource is free"""
+        masks = self.occupied_masks(day, resource_ids)
+        return reduce(operator.and_, masks, FULL_DAY_MASK) if masks else FULL_DAY_MASK
+
+    def free_resources(self, day, resource_ids, mask):
+        """Resources with none of the slots in ``mask`` taken"""
+        masks = self.occupied_masks(day, resource_ids)
+        return [rid for rid, occupied in zip(resource_ids, masks) if not occupied & mask]
+
+    def find_conflict(self, day, resource_id, mask):
+        """Return 'booked', 'blocked' or None for a candidate slot mask"""
+        if self.booked_mask(day, resource_id) & mask:
+            return 'booked'
+        if self.blocked_mask(day, resource_id) & mask:
+            return 'blocked'
+        return None
+
+def load_occupancy(start_date=None, end_date=None, resource_ids=None):
+    """Build an OccupancyIndex from confirmed bookings and blocked slots.
+
+    Dates are inclusive; leaving both unset loads every date. Only the columns
+    the bitmasks need are selected.
+    """
+    end_date = end_date or start_date
+    default_resource_id = get_default_resource_id()
+    index = OccupancyIndex()
+
+    bookings = db.session.query(
+        Booking.date, Booking.time, Booking.duration, Booking.service_type, Booking.resource_id
+    ).filter(Booking.status == 'confirmed')
+    blocks = db.session.query(
+        BlockedSlot.date, BlockedSlot.time, BlockedSlot.duration_minutes, BlockedSlot.resource_id
+    )
+
+    if start_date:
+        # The previous day is included for sessions that spill past midnight
+        bookings = bookings.filter(Booking.date.between(start_date - timedelta(days=1), end_date))
+        blocks = blocks.filter(BlockedSlot.date.between(start_date, end_date))
+    if resource_ids is not None:
+        booking_resources = Booking.resource_id.in_(resource_ids)
+        if default_resource_id in resource_ids:
+            booking_resources = db.or_(booking_resources, Booking.resource_id.is_(None))
+        bookings = bookings.filter(booking_resources)
+        blocks = blocks.filter(db.or_(BlockedSlot.resource_id.in_(resource_ids), BlockedSlot.resource_id.is_(None)))
+
+    for day, start_time, duration, service_type, resource_id in bookings:
+        try:
+            mask, spill_mask = booking_day_masks(start_time, duration, service_type)
+        except (ValueError, TypeError):
+            # Skip bookings with invalid duration
+            continue
+        index.add_booking(day, resource_id or default_resource_id, mask)
+        if spill_mask:
+            # Sessions that run past midnight also hold the next morning
+            index.add_booking(day + timedelta(days=1), resource_id or default_resource_id, spill_mask)
+
+    for day, start_time, duration_minutes, resource_id in blocks:
+        index.add_block(day, resource_id, block_mask(start_time, duration_minutes))
+
+    return index
+
+def find_next_available(start_date, days, duration_minutes, resource_ids, limit=5, service_type=None):
+    """First ``limit`` start times with ``duration_minutes`` free in a row.
+
+    Days from start_date are laid end to end in one bit vector, so a free
+    stretch that runs past midnight is found like any other. With several
+    resources a start qualifies if any one of them is free for the whole
+    stretch; the free resource ids are returned with each start.
+    """
+    end_date = start_date + timedelta(days=days - 1)
+    occupancy = load_occupancy(start_date, end_date, resource_ids=resource_ids)
+    held_minutes = duration_minutes + turnover_minutes(service_type)
+    length = -(-held_minutes // SLOT_MINUTES)
+    window_mask = (1 << (SLOTS_PER_DAY * days)) - 1
+
+    free_starts = {}
+    for resource_id in resource_ids:
+        occupied = 0
+        for offset in range(days):
+            day_mask = occupancy.occupied_mask(start_date + timedelta(days=offset), resource_id)
+            occupied |= day_mask << (offset * SLOTS_PER_DAY)
+        free_starts[resource_id] = run_starts(window_mask & ~occupied, length)
+
+    candidates = reduce(operator.or_, free_starts.values(), 0)
+    results = []
+    while candidates and len(results) < limit:
+        slot = (candidates & -candidates).bit_length() - 1
+        candidates &= candidates - 1
+
+        start_minute = slot * SLOT_MINUTES
+        end_minute = start_minute + duration_minutes
+        start = start_date + timedelta(days=start_minute // (24 * 60))
+        end = start_date + timedelta(days=end_minute // (24 * 60))
+        results.append({
+            'date': start.isoformat(),
+            'time': minutes_to_time(start_minute % (24 * 60)),
+            'end_date': end.isoformat(),
+            'end_time': minutes_to_time(end_minute % (24 * 60)),
+            'resource_ids': [rid for rid in resource_ids if free_starts[rid] >> slot & 1]
+        })
+    return results
+
+def find_batch_conflicts(bookings):
+    """Conflict-check several bookings being confirmed together.
+
+    Loads one OccupancyIndex covering every booking and adds each accepted
+    booking to it as it goes, so the batch is checked against existing
+    occupancy and against itself. Bookings are taken in (date, time, id)
+    order; the earlier of two overlapping requests wins. Returns
+    {booking_id: 'booked' | 'blocked'} for the ones that cannot be confirmed.
+    """
+    if not bookings:
+        return {}
+
+    default_resource_id = get_default_resource_id()
+    resource_ids = sorted({booking.resource_id or default_resource_id for booking in bookings})
+    start_date = min(booking.date for booking in bookings)
+    end_date = max(booking.date for booking in bookings) + timedelta(days=1)
+    occupancy = load_occupancy(start_date, end_date, resource_ids=resource_ids)
+
+    conflicts = {}
+    ordered = sorted(bookings, key=lambda booking: (booking.date, time_to_minutes(booking.time), booking.id))
+    for booking in ordered:
+        resource_id = booking.resource_id or default_resource_id
+        next_date = booking.date + timedelta(days=1)
+        try:
+            mask, spill_mask = booking_day_masks(booking.time, booking.duration, booking.service_type)
+        except (ValueError, TypeError):
+            mask, spill_mask = booking_day_masks(booking.time, None, booking.service_type)
+
+        conflict = (occupancy.find_conflict(booking.date, resource_id, mask)
+                    or occupancy.find_conflict(next_date, resource_id, spill_mask))
+        if conflict:
+            conflicts[booking.id] = conflict
+            continue
+
+        occupancy.add_booking(booking.date, resource_id, mask)
+        if spill_mask:
+            occupancy.add_booking(next_date, resource_id, spill_mask)
+    return conflicts
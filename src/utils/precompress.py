@@ -0,0 +1,40 @@
+"""Write .gz (and .br, when Brotli is installed) sidecars for a static build.
+
+Run after `npm run build`:
+
+    python -m src.utils.precompress frontend/build
+"""
+import mimetypes
+import os
+import sys
+from src.utils.compression import COMPRESSIBLE_MIMETYPES, COMPRESSION_MIN_BYTES, compress, supported_encodings
+from src.routes.frontend import SIDECAR_EXTENSIONS
+
+def precompress_directory(root):
+    """Compress every compressible file under root once at build time; returns the sidecar count"""
+    written = 0
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(tuple(SIDECAR_EXTENSIONS.values())):
+                continue
+            if mimetypes.guess_type(filename)[0] not in COMPRESSIBLE_MIMETYPES:
+                continue
+
+            path = os.path.join(directory, filename)
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < COMPRESSION_MIN_BYTES:
+                continue
+
+            for encoding in supported_encodings():
+                compressed = compress(data, encoding, best=True)
+                # Keep the sidecar only when it actually saves bytes
+                if len(compressed) < len(data):
+                    with open(path + SIDECAR_EXTENSIONS[encoding], 'wb') as f:
+                        f.write(compressed)
+                    written += 1
+    return written
+
+if __name__ == '__main__':
+    build_dir = sys.argv[1] if len(sys.argv) > 1 else 'frontend/build'
+    print(f"Wrote {precompress_directory(build_dir)} precompressed files in {build_dir}")
@@ -0,0 +1,94 @@
+import json
+import os
+from functools import lru_cache
+from src.utils.timeslots import time_to_minutes
+
+# Default rate table for Wave House services: the studio's published package
+# prices.
+#
+# Each service maps fixed package durations (in hours) to a flat price. Other
+# durations are unpriced unless the service sets an ``hourly`` rate. Optional
+# ``multipliers`` scale the price for the portion of the session that falls
+# inside each window, e.g.
+#     {'name': 'night', 'start_hour': 22, 'end_hour': 6, 'multiplier': 1.25}
+# Hours are 0-23 and windows may wrap past midnight. The studio has no hourly
+# rate or time-of-day pricing, so the default table sets neither; add them in
+# a PRICING_TABLE_PATH file.
+DEFAULT_RATE_TABLE = {
+    'studio-access': {
+        'packages': {4: 100, 6: 130, 8: 160, 12: 230, 24: 400},
+    },
+}
+
+
+def _hour_in_window(hour, start_hour, end_hour):
+    """Check whether an hour falls inside a (possibly wrapping) window"""
+    if start_hour <= end_hour:
+        return start_hour <= hour < end_hour
+    return hour >= start_hour or hour < end_hour
+
+
+@lru_cache(maxsize=1)
+def load_rate_table():
+    """Load the rate table once per process.
+
+    Set PRICING_TABLE_PATH to a JSON file with the same shape as
+    DEFAULT_RATE_TABLE to override the built-in prices.
+    """
+    table = DEFAULT_RATE_TABLE
+    path = os.environ.get('PRICING_TABLE_PATH')
+    if path:
+        with open(path) as f:
+            table = json.load(f)
+
+    compiled = {}
+    for service_type, config in table.items():
+        # Precompute the multiplier for every hour of the day so pricing a
+        # booking is a table lookup instead of a window scan per hour.
+        hourly_multipliers = [1.0] * 24
+        for window in config.get('multipliers', []):
+            for hour in range(24):
+                if _hour_in_window(hour, window['start_hour'], window['end_hour']):
+                    hourly_multipliers[hour] *= float(window['multiplier'])
+
+        compiled[service_type] = {
+            'packages': {int(hours): float(price) for hours, price in config.get('packages', {}).items()},
+            'hourly': float(config['hourly']) if config.get('hourly') else None,
+            'hourly_multipliers': hourly_multipliers,
+        }
+    return compiled
+
+
+def calculate_booking_amount(service_type, duration, start_time=None):
+    """Calculate the price of a booking from the rate table.
+
+    Returns None when the service has no rate table entry, the booking has
+    no usable duration (engineer/mixing requests, legacy single-slot bookings)
+    or the duration is not a package and the service has no hourly rate.
+    """
+    rates = load_rate_table().get(service_type)
+    if not rates or not duration:
+        return None
+
+    try:
+        duration_hours = float(duration)
+    except (ValueError, TypeError):
+        return None
+    if duration_hours <= 0:
+        return None
+
+    base_amount = rates['packages'].get(duration_hours) if duration_hours.is_integer() else None
+    if base_amount is None:
+        if rates['hourly'] is None:
+            return None
+        base_amount = rates['hourly'] * duration_hours
+
+    # Accepts '10:00 PM' and 24-hour '22:00'
+    start_hour = time_to_minutes(start_time) // 60 if start_time else 0
+
+    # Average the per-hour multipliers over the session so a booking that only
+    # partly overlaps a window is only partly scaled.
+    multipliers = rates['hourly_multipliers']
+    hours = max(1, int(-(-duration_hours // 1)))
+    total = sum(multipliers[(start_hour + offset) % 24] for offset in range(hours))
+    return round(base_amount * total / hours, 2)
@@ -0,0 +1,142 @@
+import math
+import os
+import threading
+import time
+from functools import wraps
+from flask import jsonify, request
+
+# Set RATE_LIMIT_ENABLED=false to switch limiting off (local load tests)
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() not in ('0', 'false', 'no', 'off')
+
+# Proxies in front of the app that append to X-Forwarded-For (Render: one)
+TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 1))
+
+PERIOD_SECONDS = {'second': 1, 'minute': 60, 'hour': 60 * 60, 'day': 24 * 60 * 60}
+
+def parse_budget(budget):
+    """'10/minute' -> (capacity 10, refill 10/60 tokens per second)"""
+    count, _, period = budget.partition('/')
+    capacity = int(count)
+    return capacity, capacity / PERIOD_SECONDS[period.strip()]
+
+class MemoryStore:
+    """Token buckets in this process; each worker enforces its own budget"""
+
+    # Past this many buckets, full (idle) ones are dropped
+    MAX_BUCKETS = 10000
+
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, refill_rate, now):
+        """Spend one token; returns (allowed, seconds until a token is available)"""
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.MAX_BUCKETS:
+                self._evict_idle(now)
+        return allowed, 0 if allowed else (1 - tokens) / refill_rate
+
+    def _evict_idle(self, now):
+        # Buckets that would have refilled completely carry no state worth keeping.
+        # The refill rate is not stored per key, so an hour of idleness is the cutoff.
+        cutoff = now - PERIOD_SECONDS['hour']
+        for key in [key for key, (_, updated_at) in self._buckets.items() if updated_at < cutoff]:
+            del self._buckets[key]
+
+class RedisStore:
+    """Token buckets shared by every worker, updated atomically in Redis.
+
+    Requires the ``redis`` package.
+    """
+
+    TAKE_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry_after = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry_after = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, url, prefix='wave-house:ratelimit:'):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(self.TAKE_SCRIPT)
+
+    def take(self, key, capacity, refill_rate, now):
+        allowed, retry_after = self._take(keys=[self.prefix + key], args=[capacity, refill_rate, now])
+        return bool(allowed), float(retry_after)
+
+_store = None
+
+def get_store():
+    """The process-wide bucket store; RATE_LIMIT_STORAGE_URL=redis://... shares budgets across workers"""
+    global _store
+    if _store is None:
+        url = os.environ.get('RATE_LIMIT_STORAGE_URL')
+        _store = RedisStore(url) if url else MemoryStore()
+    return _store
+
+def client_ip():
+    """Caller's address as seen by the last trusted proxy"""
+    route = request.access_route
+    if len(route) >= TRUSTED_PROXY_COUNT > 0:
+        return route[-TRUSTED_PROXY_COUNT]
+    return route[0] if route else request.remote_addr
+
+def rate_limit(name, per_ip=None, per_email=None):
+    """Token-bucket limit a view by client IP and by the JSON body's email.
+
+    Budgets are strings like '10/minute'. Put this outside any decorator that
+    touches the database: limited requests are rejected from memory (or one
+    Redis round trip) with 429 and Retry-After.
+    """
+    ip_budget = parse_budget(per_ip) if per_ip else None
+    email_budget = parse_budget(per_email) if per_email else None
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not RATE_LIMIT_ENABLED:
+                return view(*args, **kwargs)
+
+            checks = []
+            if ip_budget:
+                checks.append((f'{name}:ip:{client_ip()}', ip_budget))
+            if email_budget:
+                data = request.get_json(silent=True)
+                email = data.get('email') if isinstance(data, dict) else None
+                if isinstance(email, str) and email.strip():
+                    checks.append((f'{name}:email:{email.strip().lower()}', email_budget))
+
+            now = time.time()
+            store = get_store()
+            for key, (capacity, refill_rate) in checks:
+                allowed, retry_after = store.take(key, capacity, refill_rate, now)
+                if not allowed:
+                    response = jsonify({'error': 'Too many requests, please try again later'})
+                    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                    return response, 429
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
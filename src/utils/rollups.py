@@ -0,0 +1,180 @@
+import calendar
+from datetime import datetime, date, timedelta
+from src.models.user import db
+from src.models.booking import Booking, BlockedSlot
+from src.models.analytics import DailyRollup, MonthlyRollup
+from src.models.archive import ArchivedBooking, ArchivedBlockedSlot
+from src.utils.timeslots import occupied_minutes, LEGACY_BLOCK_MINUTES
+from src.utils.occupancy import get_active_resource_ids
+
+# Statuses that count as a real booking (request placeholders are excluded)
+BOOKING_STATUSES = ('pending', 'confirmed')
+
+def _daily_totals(start_date, end_date, resource_count=1):
+    """Aggregate per-day totals for a date range straight from the live and archive tables.
+
+    Hours are resource-hours: a block that covers every resource counts once
+    per resource, matching a capacity of 24 hours per resource per day.
+    Archived rows are read too, so a range the archive job has already
+    moved (even partly) still rolls up completely.
+    """
+    totals = {}
+
+    def row_for(day):
+        if day not in totals:
+            totals[day] = {
+                'occupied_minutes': 0,
+                'blocked_hours': 0.0,
+                'booking_count': 0,
+                'confirmed_count': 0,
+                'revenue': 0.0,
+            }
+        return totals[day]
+
+    for booking_model, block_model in ((Booking, BlockedSlot), (ArchivedBooking, ArchivedBlockedSlot)):
+        # Counts and revenue are grouped in SQL
+        counts = db.session.query(
+            booking_model.date,
+            db.func.count(booking_model.id),
+            db.func.sum(db.case((booking_model.status == 'confirmed', 1), else_=0)),
+            db.func.coalesce(db.func.sum(db.case((booking_model.status == 'confirmed', booking_model.payment_amount), else_=0)), 0)
+        ).filter(
+            booking_model.date.between(start_date, end_date),
+            booking_model.status.in_(BOOKING_STATUSES)
+        ).group_by(booking_model.date)
+
+        for day, booking_count, confirmed_count, revenue in counts:
+            row = row_for(day)
+            row['booking_count'] += booking_count
+            row['confirmed_count'] += int(confirmed_count or 0)
+            row['revenue'] += float(revenue or 0)
+
+        # Rows created before slot sizes were stored cover one hour
+        every_resource = block_model.resource_id.is_(None)
+        blocked = db.session.query(
+            block_model.date,
+            every_resource,
+            db.func.sum(db.func.coalesce(block_model.duration_minutes, LEGACY_BLOCK_MINUTES))
+        ).filter(
+            block_model.date.between(start_date, end_date)
+        ).group_by(block_model.date, every_resource)
+
+        for day, blocks_every_resource, blocked_minutes in blocked:
+            resources = resource_count if blocks_every_resource else 1
+            row_for(day)['blocked_hours'] += float(blocked_minutes or 0) * resources / 60.0
+
+        # Occupied time needs the start time, so only the three columns are loaded.
+        # Sessions from the day before the range can run past midnight into it.
+        occupied = db.session.query(
+            booking_model.date, booking_model.time, booking_model.duration
+        ).filter(
+            booking_model.date.between(start_date - timedelta(days=1), end_date),
+            booking_model.status == 'confirmed'
+        )
+
+        for day, start_time, duration in occupied:
+            try:
+                minutes, overnight_minutes = occupied_minutes(start_time, duration) if duration else (60, 0)
+            except (ValueError, TypeError):
+                continue
+            if day >= start_date:
+                row_for(day)['occupied_minutes'] += minutes
+            next_day = day + timedelta(days=1)
+            if overnight_minutes and next_day <= end_date:
+                row_for(next_day)['occupied_minutes'] += overnight_minutes
+
+    return totals
+
+def refresh_daily_rollups(start_date, end_date):
+    """Recompute DailyRollup rows for every day in [start_date, end_date]"""
+    resource_count = max(len(get_active_resource_ids()), 1)
+    totals = _daily_totals(start_date, end_date, resource_count)
+    now = datetime.utcnow()
+
+    DailyRollup.query.filter(
+        DailyRollup.date.between(start_date, end_date)
+    ).delete(synchronize_session=False)
+
+    rows = []
+    for day, row in totals.items():
+        rows.append(DailyRollup(
+            date=day,
+            occupied_hours=row['occupied_minutes'] / 60.0,
+            blocked_hours=row['blocked_hours'],
+            booking_count=row['booking_count'],
+            confirmed_count=row['confirmed_count'],
+            revenue=row['revenue'],
+            resource_count=resource_count,
+            updated_at=now
+        ))
+    db.session.add_all(rows)
+    db.session.flush()
+    return len(rows)
+
+def refresh_monthly_rollups(start_date, end_date):
+    """Re-aggregate MonthlyRollup rows for every month touched by the range"""
+    now = datetime.utcnow()
+    resource_count = max(len(get_active_resource_ids()), 1)
+    refreshed = 0
+    year, month = start_date.year, start_date.month
+
+    while (year, month) <= (end_date.year, end_date.month):
+        days_in_month = calendar.monthrange(year, month)[1]
+        month_start = date(year, month, 1)
+        month_end = date(year, month, days_in_month)
+        month_key = month_start.strftime('%Y-%m')
+
+        occupied, blocked, booking_count, confirmed_count, revenue = db.session.query(
+            db.func.coalesce(db.func.sum(DailyRollup.occupied_hours), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.blocked_hours), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.booking_count), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.confirmed_count), 0),
+            db.func.coalesce(db.func.sum(DailyRollup.revenue), 0)
+        ).filter(
+            DailyRollup.date.between(month_start, month_end)
+        ).one()
+
+        rollup = MonthlyRollup.query.filter_by(month=month_key).first()
+        if not rollup:
+            rollup = MonthlyRollup(month=month_key)
+            db.session.add(rollup)
+
+        rollup.days = days_in_month
+        rollup.resource_count = resource_count
+        rollup.occupied_hours = float(occupied)
+        rollup.blocked_hours = float(blocked)
+        rollup.booking_count = int(booking_count)
+        rollup.confirmed_count = int(confirmed_count)
+        rollup.revenue = float(revenue)
+        rollup.updated_at = now
+        refreshed += 1
+
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+
+    return refreshed
+
+def refresh_rollups(start_date=None, end_date=None):
+    """Refresh daily and monthly rollups for a date range and commit.
+
+    Defaults to the window a nightly run should cover: the past week (late
+    cancellations and status changes) through the next 90 days of bookings.
+    Older ranges, archived or not, can be rebuilt by passing them explicitly.
+    """
+    today = date.today()
+    start_date = start_date or today - timedelta(days=7)
+    end_date = end_date or today + timedelta(days=90)
+
+    if start_date > end_date:
+        return {'days': 0, 'months': 0}
+
+    try:
+        days = refresh_daily_rollups(start_date, end_date)
+        months = refresh_monthly_rollups(start_date, end_date)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {'days': days, 'months': months}
@@ -0,0 +1,21 @@
+IGNORED_METHODS = {'HEAD', 'OPTIONS'}
+
+def find_duplicate_routes(app):
+    """Return {(rule, method): [endpoints]} for every rule/method served more than once"""
+    handlers = {}
+    for rule in app.url_map.iter_rules():
+        for method in (rule.methods or set()) - IGNORED_METHODS:
+            handlers.setdefault((rule.rule, method), []).append(rule.endpoint)
+    return {key: endpoints for key, endpoints in handlers.items() if len(endpoints) > 1}
+
+def check_duplicate_routes(app):
+    """Fail startup when two handlers are registered for the same rule and method.
+
+    Werkzeug quietly dispatches to whichever rule was added first, so a
+    duplicate means the handler that actually serves traffic depends on
+    blueprint registration order.
+    """
+    duplicates = find_duplicate_routes(app)
+    if duplicates:
+        lines = [f"{method} {rule}: {', '.join(endpoints)}" for (rule, method), endpoints in sorted(duplicates.items())]
+        raise RuntimeError('Duplicate routes registered:\n' + '\n'.join(lines))
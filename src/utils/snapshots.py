@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from datetime import timedelta
+from flask import Response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from src.models.booking import Booking, BlockedSlot
+from src.models.resource import Resource
+from src.utils.events import get_broker
+from src.utils.compression import COMPRESSION_MIN_BYTES, choose_encoding, compress, set_encoded_body
+
+# Models whose changes invalidate availability snapshots
+TRACKED_MODELS = (Booking, BlockedSlot, Resource)
+
+# Only confirmed bookings occupy time, and only through these columns
+OCCUPYING_STATUS = 'confirmed'
+OCCUPANCY_COLUMNS = frozenset(('status', 'date', 'time', 'duration', 'resource_id'))
+
+# Commits in this process invalidate snapshots immediately; the TTL bounds how
+# stale a snapshot can be when another worker made the change.
+SNAPSHOT_TTL_SECONDS = float(os.environ.get('AVAILABILITY_CACHE_SECONDS', 30))
+
+_generation = 0
+_snapshots = {}
+_lock = threading.Lock()
+
+def current_generation():
+    return _generation
+
+def bump_generation():
+    """Invalidate every snapshot built so far"""
+    global _generation
+    with _lock:
+        _generation += 1
+        _snapshots.clear()
+
+class Snapshot:
+    """A serialized response body plus its compressed variants, built once per generation"""
+
+    def __init__(self, body, generation):
+        self.body = body
+        self.generation = generation
+        self.expires_at = time.monotonic() + SNAPSHOT_TTL_SECONDS
+        self.encoded = {}
+
+    def is_fresh(self):
+        return self.generation == _generation and time.monotonic() < self.expires_at
+
+    def encoded_body(self, encoding):
+        """Body for a Content-Encoding (None means identity), compressed on first use"""
+        if encoding is None or len(self.body) < COMPRESSION_MIN_BYTES:
+            return self.body, None
+        if encoding not in self.encoded:
+            self.encoded[encoding] = compress(self.body, encoding)
+        return self.encoded[encoding], encoding
+
+def get_snapshot(key, build):
+    """Return the cached Snapshot for ``key``, calling ``build()`` for the body bytes on a miss"""
+    get_broker().ensure_listening()
+    snapshot = _snapshots.get(key)
+    if snapshot and snapshot.is_fresh():
+        return snapshot
+
+    # Read the generation before building so a commit that lands mid-build
+    # leaves this snapshot already stale.
+    generation = _generation
+    snapshot = Snapshot(build(), generation)
+    with _lock:
+        if generation == _generation:
+            _snapshots[key] = snapshot
+    return snapshot
+
+def snapshot_response(snapshot, mimetype='application/json'):
+    """Serve a snapshot in the best encoding the client accepts"""
+    data, encoding = snapshot.encoded_body(choose_encoding(request.headers.get('Accept-Encoding')))
+    return set_encoded_body(Response(mimetype=mimetype), data, encoding)
+
+def _changed_dates(obj):
+    """Dates whose occupancy a new, changed or deleted booking/block affects"""
+    if isinstance(obj, Resource):
+        return None
+    dates = set(inspect(obj).attrs.date.history.sum())
+    if not dates and obj.date:
+        # Expired after an earlier commit; loading it costs one query
+        dates = {obj.date}
+    if isinstance(obj, Booking):
+        # Sessions that run past midnight also hold the next morning
+        dates |= {day + timedelta(days=1) for day in dates}
+    return dates
+
+def _attribute_values(state, key):
+    """Old and new values of an attribute, loading it if it was expired"""
+    return set(state.attrs[key].history.sum()) or {getattr(state.obj(), key)}
+
+def _affects_availability(obj, updated):
+    """Whether flushing this booking/block/resource can change what is free.
+
+    Blocks and resources always can. A booking only can when it is (or was)
+    confirmed and is being added, deleted, or moved/resized/re-statused, so
+    new pending requests and edits to contact fields leave snapshots alone.
+    """
+    if not isinstance(obj, Booking):
+        return True
+    state = inspect(obj)
+    if updated and not any(state.attrs[key].history.has_changes() for key in OCCUPANCY_COLUMNS):
+        return False
+    return OCCUPYING_STATUS in _attribute_values(state, 'status')
+
+def _record_change(session, dates):
+    """Remember what this transaction changed; dates=None means refetch everything"""
+    session.info['availability_changed'] = True
+    if dates is None:
+        session.info['availability_reset'] = True
+    else:
+        session.info.setdefault('availability_dates', set()).update(dates)
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flush(session, flush_context):
+    for objects, updated in ((session.new, False), (session.dirty, True), (session.deleted, False)):
+        for obj in list(objects):
+            if isinstance(obj, TRACKED_MODELS) and _affects_availability(obj, updated):
+                _record_change(session, _changed_dates(obj))
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_bulk_statement(orm_execute_state):
+    # Query.update()/delete() and delete(Model) statements bypass the flush,
+    # and neither the rows nor the columns they touch are known here, so any
+    # of them on a tracked model refetches everything
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, TRACKED_MODELS):
+            _record_change(orm_execute_state.session, None)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    if not session.info.pop('availability_changed', False):
+        return
+    dates = session.info.pop('availability_dates', set())
+    reset = session.info.pop('availability_reset', False)
+    bump_generation()
+
+    # Push the change to live calendars (see /api/availability/stream)
+    if reset:
+        message = {'type': 'reset', 'generation': _generation}
+    else:
+        message = {'type': 'availability', 'generation': _generation,
+                   'dates': sorted(day.isoformat() for day in dates)}
+    try:
+        get_broker().publish(message)
+    except Exception as e:
+        print(f"Error publishing availability change: {e}")
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    for key in ('availability_changed', 'availability_dates', 'availability_reset'):
+        session.info.pop(key, None)
+
+# Changes committed by other workers invalidate this worker's snapshots too
+get_broker().add_remote_listener(lambda message: bump_generation())
@@ -0,0 +1,70 @@
+import os
+from datetime import datetime
+
+# Slot grid granularity in minutes (15, 30 or 60). Every availability mask,
+# conflict check and admin time picker is laid out on this grid.
+SLOT_MINUTES = int(os.environ.get('SLOT_MINUTES', 60))
+if SLOT_MINUTES not in (15, 30, 60):
+    raise ValueError(f'SLOT_MINUTES must be 15, 30 or 60, got {SLOT_MINUTES}')
+
+# Default length of a BlockedSlot row created before slot sizes were stored
+LEGACY_BLOCK_MINUTES = 60
+
+def parse_turnover_minutes(value):
+    """Parse 'studio-access=30,mixing=15' into a per-service buffer mapping"""
+    buffers = {}
+    for item in (value or '').split(','):
+        if '=' in item:
+            service_type, minutes = item.split('=', 1)
+            buffers[service_type.strip()] = int(minutes)
+    return buffers
+
+# Turnover buffer held after each session, per service type
+TURNOVER_MINUTES = parse_turnover_minutes(os.environ.get('TURNOVER_MINUTES', ''))
+
+def turnover_minutes(service_type):
+    """Buffer held after a session of this service before the next can start"""
+    return TURNOVER_MINUTES.get(service_type, 0)
+
+def duration_to_minutes(duration):
+    """Convert a duration in hours ('4', '1.5') to whole minutes"""
+    return int(round(float(duration) * 60))
+
+def parse_time_minutes(time_str):
+    """Minutes since midnight for '2:00 PM' or '14:00', or None if it doesn't parse"""
+    for time_format in ('%I:%M %p', '%H:%M'):
+        try:
+            time_obj = datetime.strptime(time_str.strip(), time_format).time()
+            return time_obj.hour * 60 + time_obj.minute
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+def time_to_minutes(time_str):
+    """Convert time string like '2:00 PM' (or 24-hour '14:00') to minutes since midnight"""
+    minutes = parse_time_minutes(time_str)
+    return 0 if minutes is None else minutes
+
+def minutes_to_time(minutes):
+    """Convert minutes since midnight to time string like '2:00 PM'"""
+    hours = minutes // 60
+    mins = minutes % 60
+    
+    if hours == 0:
+        return f"12:{mins:02d} AM"
+    elif hours < 12:
+        return f"{hours}:{mins:02d} AM"
+    elif hours == 12:
+        return f"12:{mins:02d} PM"
+    else:
+        return f"{hours-12}:{mins:02d} PM"
+
+def occupied_minutes(start_time, duration_hours):
+    """(minutes on its own date, minutes after midnight) a booking occupies.
+
+    Splits at midnight the way booking_day_masks does, so a late session
+    credits its overnight hours to the next day.
+    """
+    start_minutes = time_to_minutes(start_time)
+    end_minutes = start_minutes + duration_to_minutes(duration_hours)
+    return max(0, min(end_minutes, 24 * 60) - start_minutes), max(0, end_minutes - 24 * 60)
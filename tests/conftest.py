@@ -0,0 +1,62 @@
+"""Shared fixtures: an in-memory SQLite app with the given blueprints mounted under /api"""
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+from flask import Flask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# Email delivery is configured per deployment and src/utils/email_sender.py
+# isn't part of every checkout; record notifications instead of sending them
+if importlib.util.find_spec('src.utils.email_sender') is None:
+    email_sender = types.ModuleType('src.utils.email_sender')
+    email_sender.sent = []
+    email_sender.send_booking_notification = lambda booking_data, service_type: email_sender.sent.append((booking_data, service_type))
+    sys.modules['src.utils.email_sender'] = email_sender
+
+from src.models.user import db
+from src.models import analytics, archive, booking, client, idempotency, job, resource  # noqa: F401 (create_all)
+from src.models.schema import upgrade_schema
+import src.utils.clients as clients
+import src.utils.occupancy as occupancy
+import src.utils.ratelimit as ratelimit
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """Build an app around fresh tables; ``admin=True`` signs its test client in"""
+    monkeypatch.setattr(ratelimit, 'RATE_LIMIT_ENABLED', False)
+    monkeypatch.setattr(occupancy, '_default_resource_id', None)
+    monkeypatch.setattr(clients, '_clients', type(clients._clients)())
+    apps = []
+
+    def make(*blueprints):
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SECRET_KEY'] = 'test'
+        app.config['TESTING'] = True
+        db.init_app(app)
+        for blueprint in blueprints:
+            app.register_blueprint(blueprint, url_prefix='/api')
+        with app.app_context():
+            db.create_all()
+            upgrade_schema()
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+def admin_client(app):
+    """Test client with an authenticated admin session"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['admin_authenticated'] = True
+    return client
@@ -0,0 +1,71 @@
+"""Statement and commit budget for POST /api/bookings (see benchmarks/booking_statements.py)"""
+import pytest
+
+from booking_statements import measure
+from src.models.user import db
+from src.models.client import Client
+from src.models.idempotency import IdempotencyKey
+from src.routes.booking import booking_bp
+import src.utils.clients as clients
+
+BOOKING = {'service_type': 'studio-access', 'date': '2031-01-01', 'duration': '2',
+           'name': 'Statements', 'email': 'statements@example.com'}
+
+@pytest.fixture
+def app(make_app):
+    return make_app(booking_bp)
+
+def test_new_client_booking_is_five_statements_and_one_commit(app):
+    statements, commits = measure(app, dict(BOOKING, time='10:00 AM'))
+    # Default resource (cached after the first request), bookings and blocks
+    # for the conflict check, client upsert, booking insert
+    assert len(statements) == 5
+    assert commits == 1
+
+def test_returning_client_booking_is_four_statements_and_one_commit(app):
+    measure(app, dict(BOOKING, time='10:00 AM'))
+    # As seen by a worker that hasn't cached the client: conflict check (two
+    # queries), client upsert, booking insert
+    clients.forget_client(BOOKING['email'])
+    statements, commits = measure(app, dict(BOOKING, time='2:00 PM', email=BOOKING['email'].upper()))
+    assert len(statements) == 4
+    assert commits == 1
+    with app.app_context():
+        assert Client.query.count() == 1
+
+def test_cached_returning_client_skips_the_upsert(app):
+    measure(app, dict(BOOKING, time='10:00 AM'))
+    # Still awaiting verification: nothing to write for the client
+    statements, commits = measure(app, dict(BOOKING, time='2:00 PM'))
+    assert len(statements) == 3
+    assert commits == 1
+
+    with app.app_context():
+        client = Client.query.one()
+        client.is_verified = True
+        client.verification_status = 'verified'
+        db.session.commit()
+    assert clients.get_cached_client(BOOKING['email']) is None
+
+    measure(app, dict(BOOKING, time='6:00 PM'))
+    # Verified: the booking is counted with an UPDATE by id
+    statements, commits = measure(app, dict(BOOKING, date='2031-01-02', time='10:00 AM'))
+    assert [statement.split()[0] for statement in statements][-2:] == ['UPDATE', 'INSERT']
+    assert commits == 1
+    with app.app_context():
+        assert Client.query.one().total_bookings == 2
+
+def test_idempotency_key_adds_only_the_claim_commit(app):
+    # The key's claim commits on its own so a concurrent retry sees it; the
+    # stored response is written in the booking's transaction
+    statements, commits = measure(app, dict(BOOKING, time='10:00 AM'), headers={'Idempotency-Key': 'statements-1'})
+    assert commits == 2
+    with app.app_context():
+        stored = IdempotencyKey.query.filter_by(key='statements-1').one()
+        assert stored.status_code == 201
+        assert '"booking"' in stored.response_body
+
+    replay = app.test_client().post('/api/bookings', json=dict(BOOKING, time='10:00 AM'),
+                                    headers={'Idempotency-Key': 'statements-1'})
+    assert replay.status_code == 201
+    assert replay.headers['Idempotent-Replayed'] == 'true'
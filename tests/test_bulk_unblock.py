@@ -0,0 +1,53 @@
+from datetime import date
+
+import pytest
+
+from conftest import admin_client
+from src.models.user import db
+from src.models.booking import BlockedSlot
+from src.routes.admin import admin_bp
+
+# 2031-01-05 is a Sunday, 2031-01-06 a Monday
+SUNDAY, MONDAY = date(2031, 1, 5), date(2031, 1, 6)
+RANGE = {'start_date': '2031-01-05', 'end_date': '2031-01-06'}
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(admin_bp)
+    with app.app_context():
+        db.session.add_all([BlockedSlot(date=day, time=time) for day in (SUNDAY, MONDAY)
+                            for time in ('10:00 AM', '10:00 PM')])
+        db.session.commit()
+    return app
+
+def remaining(app):
+    with app.app_context():
+        return sorted((slot.date, slot.time) for slot in BlockedSlot.query)
+
+def test_unblocks_selected_days_and_times(app):
+    response = admin_client(app).post('/api/admin/bulk-unblock', json=dict(RANGE, days=[1], times=['22:00']))
+    assert response.status_code == 200
+    assert response.get_json()['unblocked_count'] == 1
+    assert (MONDAY, '10:00 PM') not in remaining(app)
+    assert len(remaining(app)) == 3
+
+def test_every_day_and_time_must_be_explicit(app):
+    client = admin_client(app)
+    assert client.post('/api/admin/bulk-unblock', json=dict(RANGE, days=[], all_times=True)).status_code == 400
+    assert client.post('/api/admin/bulk-unblock', json=dict(RANGE, days=[0], times=[])).status_code == 400
+    assert len(remaining(app)) == 4
+
+    response = client.post('/api/admin/bulk-unblock', json=dict(RANGE, all_days=True, all_times=True))
+    assert response.get_json()['unblocked_count'] == 4
+
+def test_invalid_time_is_rejected_not_read_as_midnight(app):
+    with app.app_context():
+        db.session.add(BlockedSlot(date=SUNDAY, time='12:00 AM'))
+        db.session.commit()
+    response = admin_client(app).post('/api/admin/bulk-unblock', json=dict(RANGE, all_days=True, times=['25:99']))
+    assert response.status_code == 400
+    assert len(remaining(app)) == 5
+
+def test_requires_an_admin_session(app):
+    response = app.test_client().post('/api/admin/bulk-unblock', json=dict(RANGE, all_days=True, all_times=True))
+    assert response.status_code == 401
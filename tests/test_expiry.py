@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.models.user import db
+from src.models.booking import Booking
+from src.utils.expiry import expire_pending_bookings
+
+NOW = datetime(2031, 1, 10, 12, 0)
+
+def booking(name, age_hours, status='pending', unverified=False):
+    return Booking(service_type='studio-access', date=date(2031, 2, 1), time='10:00 AM', duration='4',
+                   name=name, email=f'{name}@example.com', status=status,
+                   requires_verification=unverified, created_at=NOW - timedelta(hours=age_hours))
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        db.session.add_all([
+            booking('unverified-stale', 49, unverified=True),
+            booking('unverified-fresh', 47, unverified=True),
+            booking('unconfirmed-stale', 8 * 24),
+            booking('unconfirmed-fresh', 49),
+            booking('confirmed-old', 30 * 24, status='confirmed'),
+        ])
+        db.session.commit()
+    return app
+
+def statuses():
+    return {b.name: b.status for b in Booking.query}
+
+def test_each_policy_expires_its_stale_holds(app):
+    with app.app_context():
+        assert expire_pending_bookings(now=NOW) == {'unverified': 1, 'unconfirmed': 1}
+        assert statuses() == {
+            'unverified-stale': 'expired',
+            'unverified-fresh': 'pending',
+            'unconfirmed-stale': 'expired',
+            'unconfirmed-fresh': 'pending',
+            'confirmed-old': 'confirmed',
+        }
+
+def test_runs_in_batches_and_is_repeatable(app):
+    with app.app_context():
+        later = NOW + timedelta(days=30)
+        assert expire_pending_bookings(now=later, batch_size=1) == {'unverified': 2, 'unconfirmed': 2}
+        assert expire_pending_bookings(now=later) == {'unverified': 0, 'unconfirmed': 0}
+        assert statuses()['confirmed-old'] == 'confirmed'
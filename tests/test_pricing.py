@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from src.utils.pricing import calculate_booking_amount, load_rate_table
+
+@pytest.fixture
+def rate_table(tmp_path, monkeypatch):
+    """Point PRICING_TABLE_PATH at the given table for one test"""
+    def use(table):
+        path = tmp_path / 'rates.json'
+        path.write_text(json.dumps(table))
+        monkeypatch.setenv('PRICING_TABLE_PATH', str(path))
+        load_rate_table.cache_clear()
+    yield use
+    load_rate_table.cache_clear()
+
+def test_packages_use_the_published_prices():
+    assert calculate_booking_amount('studio-access', '4', '10:00 AM') == 100
+    assert calculate_booking_amount('studio-access', 24, '10:00 PM') == 400
+
+def test_unpriced_bookings_have_no_amount():
+    assert calculate_booking_amount('studio-access', '5') is None
+    assert calculate_booking_amount('studio-access', None) is None
+    assert calculate_booking_amount('studio-access', 'soon') is None
+    assert calculate_booking_amount('engineer', '4') is None
+
+def test_hourly_rate_and_night_multiplier(rate_table):
+    rate_table({'studio-access': {
+        'packages': {'4': 100},
+        'hourly': 30,
+        'multipliers': [{'name': 'night', 'start_hour': 22, 'end_hour': 6, 'multiplier': 1.5}],
+    }})
+    assert calculate_booking_amount('studio-access', '2', '2:00 PM') == 60
+    # Two of the four package hours fall in the night window
+    assert calculate_booking_amount('studio-access', '4', '20:00') == 125
+    assert calculate_booking_amount('studio-access', '1.5', '11:00 PM') == 67.5
@@ -0,0 +1,18 @@
+import pytest
+
+from src.models.user import db
+from src.models.booking import Booking
+from src.routes.booking import booking_bp
+
+@pytest.fixture
+def app(make_app):
+    return make_app(booking_bp)
+
+@pytest.mark.parametrize('path', ['/api/engineer-request', '/api/mixing-request'])
+def test_requests_store_the_normalized_email(app, path):
+    response = app.test_client().post(path, json={'name': 'Requester', 'email': '  Mixed.Case@Example.COM ',
+                                                  'message': 'Hello'})
+    assert response.status_code == 201
+    assert response.get_json()['request']['email'] == 'mixed.case@example.com'
+    with app.app_context():
+        assert db.session.query(Booking.email).scalar() == 'mixed.case@example.com'
@@ -0,0 +1,42 @@
+import pytest
+
+from src.models.user import db
+from src.models.booking import Booking
+from src.models.resource import Resource
+from src.routes.booking import booking_bp
+
+BOOKING = {'service_type': 'studio-access', 'date': '2031-01-01', 'time': '10:00 AM', 'duration': '2',
+           'name': 'Rooms', 'email': 'rooms@example.com'}
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(booking_bp)
+    with app.app_context():
+        db.session.add_all([Resource(slug='booth-b', name='Booth B', kind='booth'),
+                            Resource(slug='old-room', name='Old Room', is_active=False)])
+        db.session.commit()
+    return app
+
+def test_the_same_slot_can_be_booked_in_another_room(app):
+    client = app.test_client()
+    assert client.post('/api/bookings', json=BOOKING).status_code == 201
+    assert client.post('/api/bookings', json=dict(BOOKING, resource='booth-b')).status_code == 201
+
+def test_overlapping_booking_in_the_same_room_conflicts(app):
+    client = app.test_client()
+    client.post('/api/bookings', json=dict(BOOKING, resource='booth-b'))
+    with app.app_context():
+        # Only confirmed bookings hold the slot
+        Booking.query.one().status = 'confirmed'
+        db.session.commit()
+    response = client.post('/api/bookings', json=dict(BOOKING, resource='booth-b', time='11:00 AM'))
+    assert response.status_code == 400
+    assert 'conflicts' in response.get_json()['error']
+
+def test_inactive_room_is_not_bookable(app):
+    client = app.test_client()
+    response = client.post('/api/bookings', json=dict(BOOKING, resource='old-room'))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'This studio resource is not available for booking'
+    assert client.get('/api/availability?date=2031-01-01&resource=old-room').status_code == 400
+    assert client.get('/api/availability?date=2031-01-01&resource=nowhere').status_code == 404
@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import admin_client
+from src.models.user import db
+from src.models.analytics import DailyRollup, MonthlyRollup
+from src.models.booking import Booking, BlockedSlot
+from src.models.resource import Resource
+from src.routes.analytics import analytics_bp
+from src.utils.rollups import refresh_rollups
+
+DAY = date(2031, 1, 1)
+
+def booking(time, duration, status='confirmed', day=DAY, amount=100):
+    return Booking(service_type='studio-access', date=day, time=time, duration=duration, name='Rollup',
+                   email='rollup@example.com', status=status, payment_amount=amount)
+
+@pytest.fixture
+def app(make_app):
+    return make_app(analytics_bp)
+
+def test_daily_totals_count_revenue_and_blocks(app):
+    with app.app_context():
+        db.session.add_all([
+            booking('10:00 AM', '4'),
+            booking('3:00 PM', '2', status='pending'),
+            booking('6:00 PM', '2', status='cancelled'),
+            BlockedSlot(date=DAY, time='9:00 PM', duration_minutes=90),
+        ])
+        db.session.commit()
+        refresh_rollups(DAY, DAY)
+
+        rollup = DailyRollup.query.filter_by(date=DAY).one()
+        assert (rollup.booking_count, rollup.confirmed_count, rollup.revenue) == (2, 1, 100.0)
+        assert rollup.occupied_hours == 4.0
+        assert rollup.blocked_hours == 1.5
+        assert MonthlyRollup.query.filter_by(month='2031-01').one().occupied_hours == 4.0
+
+def test_overnight_hours_count_on_the_next_day(app):
+    with app.app_context():
+        db.session.add_all([booking('10:00 PM', '4'), booking('11:00 PM', '2', day=DAY - timedelta(days=1))])
+        db.session.commit()
+        refresh_rollups(DAY, DAY + timedelta(days=1))
+
+        # Two hours of its own plus one spilling over from the day before
+        assert DailyRollup.query.filter_by(date=DAY).one().occupied_hours == 3.0
+        assert DailyRollup.query.filter_by(date=DAY + timedelta(days=1)).one().occupied_hours == 2.0
+
+def test_capacity_follows_each_days_room_count(app):
+    with app.app_context():
+        db.session.add(booking('10:00 AM', '12'))
+        db.session.commit()
+        refresh_rollups(DAY, DAY)
+        # A second room opens after that day was rolled up
+        db.session.add(Resource(slug='booth-b', name='Booth B', kind='booth'))
+        db.session.commit()
+
+    response = admin_client(app).get(f'/api/analytics/summary?start={DAY}&end={DAY + timedelta(days=1)}')
+    summary = response.get_json()
+    # One room on the rolled-up day, two on the day without a row
+    assert summary['resource_days'] == 3
+    assert summary['utilization'] == round(12 / 72, 4)
+
+def test_analytics_require_an_admin_session(app):
+    client = app.test_client()
+    for path in ('/api/analytics/daily', '/api/analytics/monthly', '/api/analytics/summary'):
+        assert client.get(path).status_code == 401
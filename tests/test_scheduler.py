@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+
+import src.scheduler as scheduler
+from src.models.job import ScheduledJob
+from src.scheduler import Job
+
+@pytest.fixture
+def runs(make_app, monkeypatch):
+    """Swap in two recording jobs; yields the (name, due) pairs they ran for"""
+    app = make_app()
+    ran = []
+    monkeypatch.setattr(scheduler, 'JOBS', [
+        Job('every_five', '*/5 * * * *', lambda: ran.append('every_five')),
+        Job('ten_oclock', '0 10 * * *', lambda: ran.append('ten_oclock')),
+    ])
+    with app.app_context():
+        scheduler.ensure_job_rows()
+        yield ran
+
+def scheduled_for(name):
+    return ScheduledJob.query.filter_by(name=name).one().last_scheduled_for
+
+def test_on_time_tick_runs_only_the_current_minute(runs):
+    scheduler.run_due_jobs(datetime(2031, 1, 1, 10, 1, 30), since=datetime(2031, 1, 1, 10, 0, 2))
+    assert runs == []
+    scheduler.run_due_jobs(datetime(2031, 1, 1, 10, 5, 1), since=datetime(2031, 1, 1, 10, 4, 0))
+    assert runs == ['every_five']
+
+def test_late_tick_catches_up_once_per_job(runs, capsys):
+    # The previous tick started at 9:52 and a long job held it until 10:12
+    scheduler.run_due_jobs(datetime(2031, 1, 1, 10, 12), since=datetime(2031, 1, 1, 9, 52))
+    assert sorted(runs) == ['every_five', 'ten_oclock']
+    assert scheduled_for('every_five') == datetime(2031, 1, 1, 10, 10)
+    assert scheduled_for('ten_oclock') == datetime(2031, 1, 1, 10, 0)
+    assert 'every_five missed 3 run(s)' in capsys.readouterr().out
+
+def test_claimed_run_is_not_repeated(runs):
+    scheduler.run_due_jobs(datetime(2031, 1, 1, 10, 0))
+    scheduler.run_due_jobs(datetime(2031, 1, 1, 10, 3), since=datetime(2031, 1, 1, 9, 58))
+    assert runs == ['every_five', 'ten_oclock']